@@ -1,14 +1,140 @@
 # Copyright (c) 2024 Emma Keogh
-# 
+#
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
-from lib.tetris_lib import TetrisLib
+import time
 
-def main():
-    tetris = TetrisLib() 
-    
-    tetris.event.run()
+STARTED = time.perf_counter()
+
+import argparse
+import os
+import sys
+from typing import List
+
+# Seconds the bot may think about each piece while the game keeps running
+DEFAULT_BOT_TIME_BUDGET = 0.1
+
+# Subcommands that hand their remaining arguments to another module's `main`
+DELEGATED_COMMANDS = {
+    'simulate': 'lib.tournament.tournament',
+    'bench': 'lib.bench.bench',
+}
+
+def report_startup(enabled: bool, modules_before: int):
+    """
+    Prints how long the process took to get ready and how many modules it imported.
+
+    Args:
+        enabled (bool): Whether to print anything.
+        modules_before (int): The number of modules loaded before the subcommand imported its backends.
+    """
+    if enabled:
+        print(
+            f"startup: {(time.perf_counter() - STARTED) * 1000:.1f} ms, "
+            f"{len(sys.modules) - modules_before} modules imported for this command",
+            file=sys.stderr
+        )
+
+def play(args: argparse.Namespace, modules_before: int) -> int:
+    """
+    Plays an interactive game in the terminal or a window.
+    """
+    from lib.tetris_lib import TetrisLib
+    bot = None
+    if args.bot:
+        from lib.bot.bot import Bot
+        workers = args.workers
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1) if args.depth > 1 else 0
+        bot = Bot(depth=args.depth, workers=workers, time_budget=args.time_budget)
+    tetris = TetrisLib(profile=bool(args.profile), replay_path=args.record, bot=bot, window=args.window,
+                       spectator_port=args.spectate, seed=args.seed, randomizer=args.randomizer,
+                       columns=args.columns, rows=args.rows, shared_board=args.share)
+    report_startup(args.startup_time, modules_before)
+
+    try:
+        tetris.event.run()
+    finally:
+        tetris.close()
+        if bot is not None:
+            bot.close()
+        if args.profile:
+            tetris.profiler.save(args.profile)
+    return 0
+
+def replay(args: argparse.Namespace, modules_before: int) -> int:
+    """
+    Plays a recorded game back headless and checks it reproduces the recorded score.
+    """
+    from lib.replay.replay import Replay, ReplayPlayer
+    recorded = Replay.load(args.path)
+    report_startup(args.startup_time, modules_before)
+
+    start = time.perf_counter()
+    app = ReplayPlayer(recorded).run(args.until)
+    elapsed = time.perf_counter() - start
+    print(
+        f"tick {app.timing['ticks']}: score {app.game_state['score']}, level {app.game_state['level']}, "
+        f"lines {app.game_state['lines']} ({elapsed * 1000:.1f} ms)"
+    )
+    if args.until is None and app.game_state['score'] != recorded.score:
+        print(f"score does not match the recorded {recorded.score}", file=sys.stderr)
+        return 1
+    return 0
+
+def main(argv: List[str] = None) -> int:
+    """
+    Runs the command line.
+
+    Args:
+        argv (List[str]): Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The exit code.
+    """
+    modules_before = len(sys.modules)
+    parser = argparse.ArgumentParser(prog="tetris", description="tetris written in tetris")
+    parser.add_argument('--startup-time', action='store_true', help="report import and startup time")
+    commands = parser.add_subparsers(dest='command')
+
+    play_parser = commands.add_parser('play', help="play a game (the default)")
+    play_parser.add_argument('--seed', type=int, help="seed for the piece order")
+    play_parser.add_argument('--randomizer', help="piece randomizer: 7-bag, 14-bag, random or history")
+    play_parser.add_argument('--columns', type=int, help="board width (default 10)")
+    play_parser.add_argument('--rows', type=int, help="board height (default 22)")
+    play_parser.add_argument('--window', action='store_true', help="play in a pygame window")
+    play_parser.add_argument('--bot', action='store_true', help="let the bot play")
+    play_parser.add_argument('--depth', type=int, default=1, help="bot lookahead depth (default 1)")
+    play_parser.add_argument('--workers', type=int,
+                             help="bot lookahead processes (default up to 4 when looking ahead, else none)")
+    play_parser.add_argument('--time-budget', type=float, default=DEFAULT_BOT_TIME_BUDGET,
+                             help=f"seconds the bot may think per piece (default {DEFAULT_BOT_TIME_BUDGET})")
+    play_parser.add_argument('--record', metavar='PATH', help="record a replay to this file")
+    play_parser.add_argument('--spectate', metavar='PORT', type=int, help="serve spectators on this port")
+    play_parser.add_argument('--share', metavar='NAME', help="publish the board to this shared memory block")
+    play_parser.add_argument('--profile', metavar='PATH', help="write a profile of the game loop to this file")
+
+    replay_parser = commands.add_parser('replay', help="play a recorded game back headless")
+    replay_parser.add_argument('path', help="the replay file")
+    replay_parser.add_argument('--until', type=int, help="stop at this tick")
+
+    for command, module in DELEGATED_COMMANDS.items():
+        commands.add_parser(command, add_help=False, help=f"run {module.rsplit('.', 1)[-1]}, see '{command} --help'")
+
+    args, rest = parser.parse_known_args(argv)
+    if args.command in DELEGATED_COMMANDS:
+        import importlib
+        module = importlib.import_module(DELEGATED_COMMANDS[args.command])
+        report_startup(args.startup_time, modules_before)
+        return module.main(rest)
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    if args.command == 'replay':
+        return replay(args, modules_before)
+    if args.command is None:
+        args = parser.parse_args(['play'], namespace=args)
+    return play(args, modules_before)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -3,45 +3,61 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
-from typing import List
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
 import random
-import os
-from ..tetromino.tetromino import TETROMINO_SHAPES
+from ..tetromino.tetromino import TETROMINO_BY_NAME, TETROMINO_SHAPES, Tetromino
+from ..playfield.playfield import COLUMNS, HIDDEN_ROWS, ROWS, Playfield, PlayFieldCell, make_playfield
+from ..randomizer.randomizer import Randomizer, make_randomizer
+from ..scores.scores import DEFAULT_MODE, ScoreStore
+from ..snapshot.snapshot import Snapshot
 
-class PlayFieldCell:
-    """
-    Represents a cell in the playfield grid.
+# Random number generator shared by clones that do not copy the original's generator
+SCRATCH_RANDOM = random.Random()
 
-    Attributes:
-        falling (bool): Indicates if the cell is currently falling.
-        landed (bool): Indicates if the cell has landed.
+# Actions a player (or a headless driver) can perform on the falling tetromino
+ACTIONS = ('noop', 'left', 'right', 'soft_drop', 'hard_drop', 'swap', 'rotate_cw', 'rotate_ccw', 'rotate_180')
+
+# Tetrominoes kept dealt ahead of the falling one
+QUEUE_LENGTH = 7
+
+@lru_cache(maxsize=4096)
+def row_string(landed: int, falling: int, ghost: int, columns: int) -> str:
     """
-    def __init__(self, falling: bool = False, landed: bool = False):
-        self.falling = falling
-        self.landed = landed
+    Renders one playfield row. Rows are cached by content, so a frame only builds strings
+    for rows that never appeared before and the rest are dictionary lookups.
 
-    def __repr__(self):
-        return f"PlayFieldCell(falling={self.falling}, landed={self.landed})"
+    Args:
+        landed (int): Bitmask of landed cells, bit 0 being the leftmost column drawn.
+        falling (int): Bitmask of falling cells, in the same columns.
+        ghost (int): Bitmask of cells where the falling tetromino would land, in the same columns.
+        columns (int): The number of columns to draw.
 
-class Tetromino:
+    Returns:
+        str: The row, ending with a newline.
     """
-    Represents a tetromino and its possible rotations.
+    return "".join(
+        "██" if landed >> x & 1 else "▒▒" if falling >> x & 1 else "░░" if ghost >> x & 1 else "  "
+        for x in range(columns)
+    ) + '\n'
 
-    Attributes:
-        rotations (List[List[List[bool]]]): List of 2D grids representing the different rotations of the tetromino.
+@lru_cache(maxsize=None)
+def rotation_string(tetromino: Tetromino, rotation: int) -> str:
+    """
+    Renders the preview of a tetromino rotation, cached per shape and rotation.
+
+    Args:
+        tetromino (Tetromino): The tetromino to render.
+        rotation (int): The rotation to render.
+
+    Returns:
+        str: The tetromino as a string.
     """
-    def __init__(self, rotations: List[List[List[bool]]] = None):
-        if rotations is None:
-            rotations = [[
-                [False, False, False, False],
-                [False, False, False, False],
-                [False, False, False, False],
-                [False, False, False, False],
-            ] for _ in range(4)]
-        self.rotations = rotations
-
-    def __repr__(self):
-        return f"Tetromino(rotations={self.rotations})"
+    return "".join(
+        "".join("██" if cell else "  " for cell in row[1:3]) + '\n' for row in tetromino.rotations[rotation]
+    )
 
 class App:
     """
@@ -49,38 +65,67 @@ class App:
 
     Attributes:
         game_state (dict): Contains general game state such as running status, score, level, and pause status.
-        playfield (List[List[PlayFieldCell]]): 2D grid representing the playfield.
+        playfield (Playfield): Bitboard representing the playfield.
         tetromino_manager (dict): Manages current, swap, and queue of tetrominos.
         timing (dict): Handles timing-related information.
         ui (dict): Manages UI elements like buttons.
+        random (random.Random): The random number generator driving this game.
+        seed (int): The seed the game was started with, None for unseeded games.
+        random_seed (int): The seed actually used for `random`, generated when `seed` is None so
+            that every game can be replayed.
+        score_store (ScoreStore): Where finished games are recorded, None to keep scores in memory only.
+        profiler (Profiler): Optional instrumentation, None when profiling is disabled.
+        recorder (ReplayRecorder): Records every performed action, None when not recording.
+        randomizer (Randomizer): Decides the order of tetrominoes, drawing from `random`.
     """
-    def __init__(self, tetromino_shapes: List[Tetromino]):
+    def __init__(self, tetromino_shapes: List[Tetromino], seed: int = None, score_store: ScoreStore = None,
+                 mode: str = DEFAULT_MODE, randomizer: Randomizer = None, columns: int = COLUMNS, rows: int = ROWS,
+                 hidden_rows: int = HIDDEN_ROWS):
+        self.seed = seed
+        self.random_seed = seed if seed is not None else random.randrange(1 << 63)
+        self.random = random.Random(self.random_seed)
+        self.randomizer = randomizer if randomizer is not None else make_randomizer()
+        self.score_store = score_store
         self.game_state = {
             'running': True,
             'paused': False,
             'score': 0,
             'high_score': 0,
-            'level': 1
+            'level': 1,
+            'lines': 0,
+            'pieces': 0,
+            'mode': mode
         }
-        self.playfield = [[PlayFieldCell() for _ in range(18)] for _ in range(26)]
+        self.playfield = make_playfield(columns, rows, hidden_rows)
         self.tetromino_manager = {
-            'current_tetromino': random.choice(tetromino_shapes),
+            'current_tetromino': tetromino_shapes[self.randomizer.first(self.random)],
             'swap_tetromino': Tetromino(),
-            'tetromino_queue': [],
+            'tetromino_queue': deque(),
             'current_rotation': 0,
-            'start_x': 7,
-            'start_y': 4,
-            'x': 7,
-            'y': 4
         }
+        self.set_spawn_position()
         self.timing = {
+            'ticks': 0,
             'tick_count': 0,
             'tick_count_target': 15,
             'default_tick_count_target': 15,
             'grace_period': False
         }
         self.ui = {'buttons': []}
-        self.check_for_highscore()
+        self.profiler = None
+        self.recorder = None
+        self.populate_tetromino_queue()
+
+    def set_spawn_position(self):
+        """
+        Places the spawn position in the middle of the playfield, on the first visible row,
+        and moves the falling tetromino there.
+        """
+        playfield = self.playfield
+        self.tetromino_manager['start_x'] = playfield.left_wall + (playfield.columns - 4) // 2
+        self.tetromino_manager['start_y'] = playfield.hidden_rows
+        self.tetromino_manager['x'] = self.tetromino_manager['start_x']
+        self.tetromino_manager['y'] = self.tetromino_manager['start_y']
 
     def new(self) -> 'App':
         """
@@ -91,20 +136,137 @@ class App:
         """
         return App([])  # Pass appropriate tetromino shapes here
 
+    def snapshot(self) -> Snapshot:
+        """
+        Captures the full state of the game.
+
+        Returns:
+            Snapshot: An immutable copy of the board, tetrominoes, timers, score and random state.
+        """
+        manager = self.tetromino_manager
+        return Snapshot(
+            landed=tuple(self.playfield.landed),
+            tetromino=manager['current_tetromino'].name,
+            rotation=manager['current_rotation'],
+            x=manager['x'],
+            y=manager['y'],
+            swap=manager['swap_tetromino'].name,
+            queue=tuple(tetromino.name for tetromino in manager['tetromino_queue']),
+            ticks=self.timing['ticks'],
+            tick_count=self.timing['tick_count'],
+            tick_count_target=self.timing['tick_count_target'],
+            default_tick_count_target=self.timing['default_tick_count_target'],
+            grace_period=self.timing['grace_period'],
+            score=self.game_state['score'],
+            high_score=self.game_state['high_score'],
+            level=self.game_state['level'],
+            lines=self.game_state['lines'],
+            pieces=self.game_state['pieces'],
+            running=self.game_state['running'],
+            paused=self.game_state['paused'],
+            mode=self.game_state['mode'],
+            seed=self.seed,
+            random_seed=self.random_seed,
+            random_state=self.random.getstate(),
+            randomizer=self.randomizer.name,
+            randomizer_state=self.randomizer.state(),
+            columns=self.playfield.columns,
+            hidden_rows=self.playfield.hidden_rows
+        )
+
+    def restore(self, snapshot: Snapshot):
+        """
+        Puts the game back into a captured state.
+
+        Args:
+            snapshot (Snapshot): The state to restore.
+        """
+        manager = self.tetromino_manager
+        playfield = self.playfield
+        if (snapshot.columns, len(snapshot.landed), snapshot.hidden_rows) != (playfield.columns, playfield.height,
+                                                                              playfield.hidden_rows):
+            self.playfield = make_playfield(snapshot.columns, len(snapshot.landed) - snapshot.hidden_rows,
+                                            snapshot.hidden_rows)
+            self.set_spawn_position()
+        self.playfield.replace(snapshot.landed)
+        manager['current_tetromino'] = TETROMINO_BY_NAME.get(snapshot.tetromino) or Tetromino()
+        manager['current_rotation'] = snapshot.rotation
+        manager['x'] = snapshot.x
+        manager['y'] = snapshot.y
+        manager['swap_tetromino'] = TETROMINO_BY_NAME.get(snapshot.swap) or Tetromino()
+        manager['tetromino_queue'] = deque(TETROMINO_BY_NAME[name] for name in snapshot.queue)
+        self.timing['ticks'] = snapshot.ticks
+        self.timing['tick_count'] = snapshot.tick_count
+        self.timing['tick_count_target'] = snapshot.tick_count_target
+        self.timing['default_tick_count_target'] = snapshot.default_tick_count_target
+        self.timing['grace_period'] = snapshot.grace_period
+        self.game_state['score'] = snapshot.score
+        self.game_state['high_score'] = snapshot.high_score
+        self.game_state['level'] = snapshot.level
+        self.game_state['lines'] = snapshot.lines
+        self.game_state['pieces'] = snapshot.pieces
+        self.game_state['running'] = snapshot.running
+        self.game_state['paused'] = snapshot.paused
+        self.game_state['mode'] = snapshot.mode
+        self.seed = snapshot.seed
+        self.random_seed = snapshot.random_seed
+        self.random.setstate(snapshot.random_state)
+        self.randomizer = make_randomizer(snapshot.randomizer)
+        self.randomizer.set_state(snapshot.randomizer_state)
+
+    def clone(self, copy_random: bool = True) -> 'App':
+        """
+        Creates an independent copy of the game for lookahead. The copy shares no mutable
+        state with the original and is detached from its score store, recorder and profiler.
+
+        Args:
+            copy_random (bool): Whether to copy the random number generator state, which is most of
+                the cost of a clone. Without it the copy draws pieces from a scratch generator shared
+                by every such copy once its queue runs low, and the original is never affected.
+
+        Returns:
+            App: The copy.
+        """
+        app = App.__new__(App)
+        app.__dict__.update(self.__dict__)
+        app.game_state = self.game_state.copy()
+        app.playfield = self.playfield.copy()
+        app.tetromino_manager = self.tetromino_manager.copy()
+        app.tetromino_manager['tetromino_queue'] = self.tetromino_manager['tetromino_queue'].copy()
+        app.timing = self.timing.copy()
+        app.randomizer = self.randomizer.copy()
+        if copy_random:
+            app.random = random.Random.__new__(random.Random)
+            app.random.setstate(self.random.getstate())
+        else:
+            app.random = SCRATCH_RANDOM
+        app.score_store = None
+        app.recorder = None
+        app.profiler = None
+        return app
+
     def tick(self):
         """
         Handles the tick event of the terminal. Updates game state and tetromino position based on timing and user actions.
+        A finished game is left as it is.
         """
+        if not self.game_state['running']:
+            return
+        self.timing['ticks'] += 1
         if self.game_state['paused']:
             return
 
-        if len(self.tetromino_manager['tetromino_queue']) < 7:
-            self.populate_tetromino_queue()
-
         self.timing['tick_count'] += 1
         if self.timing['tick_count'] > self.timing['tick_count_target']:
-            lines_cleared = self.check_for_line_clear()
+            if self.profiler is not None:
+                start = self.profiler.now()
+                lines_cleared = self.check_for_line_clear()
+                self.profiler.record('line_clear', start, self.profiler.now())
+                self.profiler.count('lines_cleared', lines_cleared)
+            else:
+                lines_cleared = self.check_for_line_clear()
             self.game_state['score'] += lines_cleared ** 2 * 100 * self.game_state['level']
+            self.game_state['lines'] += lines_cleared
             self.check_for_next_level()
 
             if self.has_landed_cells_at_offset(0, 1):
@@ -120,15 +282,124 @@ class App:
 
         self.timing['tick_count_target'] = self.timing['default_tick_count_target']
 
+    def perform(self, action: str) -> bool:
+        """
+        Performs a player action on the falling tetromino.
+
+        Args:
+            action (str): One of `ACTIONS`, or 'pause' / 'quit'.
+
+        Returns:
+            bool: True if the action changed the game, False otherwise.
+        """
+        if self.recorder is not None:
+            self.recorder.record(self.timing['ticks'], action)
+        if action == 'quit':
+            self.quit()
+            return True
+        if action == 'pause':
+            self.game_state['paused'] = not self.game_state['paused']
+            return True
+        if self.game_state['paused'] or not self.game_state['running']:
+            return False
+
+        if action == 'left':
+            return self.try_move(-1, 0)
+        if action == 'right':
+            return self.try_move(1, 0)
+        if action == 'soft_drop':
+            return self.try_move(0, 1)
+        if action == 'hard_drop':
+            self.drop_tetromino()
+            return True
+        if action == 'swap':
+            self.swap_tetromino()
+            return True
+        if action == 'rotate_cw':
+            return self.rotate_tetromino(1)
+        if action == 'rotate_ccw':
+            return self.rotate_tetromino(-1)
+        if action == 'rotate_180':
+            return self.rotate_tetromino(2)
+        if action == 'noop':
+            return False
+        raise ValueError(f"Unknown action: {action}")
+
+    def rotation_kick(self, direction: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Finds where the falling tetromino ends up when rotated, trying its precomputed SRS wall
+        kicks in order until one fits.
+
+        Args:
+            direction (int): 1 to rotate clockwise, -1 counter-clockwise, 2 for a half turn.
+
+        Returns:
+            Tuple[int, int, int]: The new rotation and the `(dx, dy)` kick applied, or None if
+            no kick fits.
+        """
+        manager = self.tetromino_manager
+        tetromino = manager['current_tetromino']
+        if not tetromino.compiled:
+            return None
+        rotation = manager['current_rotation']
+        target = (rotation + direction) % len(tetromino.compiled)
+        x = manager['x']
+        y = manager['y']
+        candidates = tetromino.kicks.get((rotation, target)) or ((0, 0, tetromino.compiled[target].row_masks),)
+        collides = self.playfield.collides
+        for dx, dy, row_masks in candidates:
+            if not collides(row_masks, x + dx, y + dy):
+                return target, dx, dy
+        return None
+
+    def rotate_tetromino(self, direction: int) -> bool:
+        """
+        Rotates the falling tetromino, applying the first SRS wall kick that fits.
+
+        Args:
+            direction (int): 1 to rotate clockwise, -1 counter-clockwise, 2 for a half turn.
+
+        Returns:
+            bool: True if the tetromino rotated, False otherwise.
+        """
+        kick = self.rotation_kick(direction)
+        if kick is None:
+            return False
+        rotation, dx, dy = kick
+        self.tetromino_manager['current_rotation'] = rotation
+        self.tetromino_manager['x'] += dx
+        self.tetromino_manager['y'] += dy
+        return True
+
+    def try_move(self, move_x: int, move_y: int) -> bool:
+        """
+        Moves the falling tetromino by the specified offsets if nothing is in the way.
+
+        Args:
+            move_x (int): The offset to move in the X direction.
+            move_y (int): The offset to move in the Y direction.
+
+        Returns:
+            bool: True if the tetromino moved, False otherwise.
+        """
+        if self.has_landed_cells_at_offset(move_x, move_y):
+            return False
+        self.move_tetromino(move_x, move_y, self.tetromino_manager['current_tetromino'])
+        return True
+
     def quit(self):
         """
-        Sets the running state to false to quit the application.
+        Sets the running state to false to quit the application, recording the score the
+        first time the game ends.
         """
+        if self.game_state['running'] and self.score_store is not None:
+            self.score_store.submit(self.game_state['score'], self.game_state['level'], self.seed, self.game_state['mode'])
         self.game_state['running'] = False
 
     def spawn_tetromino(self, start_x: int, start_y: int, tetromino: Tetromino) -> Tetromino:
         """
-        Randomly spawns a tetromino at the specified position on the playfield.
+        Randomly spawns a tetromino at the specified position on the playfield. The falling
+        tetromino is only tracked in `tetromino_manager` and is composited at draw time.
 
         Args:
             start_x (int): The X position to spawn the tetromino.
@@ -138,46 +409,70 @@ class App:
         Returns:
             Tetromino: The spawned tetromino.
         """
-        self.check_for_game_over()
+        if self.check_for_game_over():
+            self.quit()
 
-        for y in range(len(tetromino.rotations[self.tetromino_manager['current_rotation']])):
-            for x in range(len(tetromino.rotations[self.tetromino_manager['current_rotation']][y])):
-                if tetromino.rotations[self.tetromino_manager['current_rotation']][y][x]:
-                    self.playfield[start_y + y][start_x + x].falling = True
         return tetromino
 
-    def populate_tetromino_queue(self):
+    def populate_tetromino_queue(self, length: int = QUEUE_LENGTH):
+        """
+        Deals tetrominoes from the randomizer until the queue holds at least `length` of them.
+
+        Args:
+            length (int): The number of tetrominoes the queue should hold.
+        """
+        queue = self.tetromino_manager['tetromino_queue']
+        while len(queue) < length:
+            queue.extend(TETROMINO_SHAPES[index] for index in self.randomizer.draw(self.random))
+
+    def next_tetromino(self) -> Tetromino:
+        """
+        Takes the next tetromino off the queue. The loops driving the app top the queue up
+        between ticks with `populate_tetromino_queue`, so nothing is dealt here unless the
+        queue has run dry.
+
+        Returns:
+            Tetromino: The next tetromino.
         """
-        Fills the tetromino queue with a random order of tetrominoes.
+        queue = self.tetromino_manager['tetromino_queue']
+        if not queue:
+            self.populate_tetromino_queue(1)
+        return queue.popleft()
+
+    def preview(self, depth: int) -> List[Tetromino]:
         """
-        tetromino_order = list(range(7))
-        random.shuffle(tetromino_order)
+        Looks ahead at the upcoming tetrominoes, dealing more if the queue is shorter than `depth`.
+
+        Args:
+            depth (int): How many tetrominoes to look at.
 
-        for tetromino in tetromino_order:
-            self.tetromino_manager['tetromino_queue'].append(TETROMINO_SHAPES[tetromino])
+        Returns:
+            List[Tetromino]: The next `depth` tetrominoes, in order.
+        """
+        self.populate_tetromino_queue(depth)
+        return list(islice(self.tetromino_manager['tetromino_queue'], depth))
 
     def reset_tetromino(self):
         """
         Prepares for the next tetromino by landing the current one and resetting its position.
         """
         self.land_tetromino()
-        self.clear_falling()
+        self.game_state['pieces'] += 1
         self.tetromino_manager['x'] = self.tetromino_manager['start_x']
         self.tetromino_manager['y'] = self.tetromino_manager['start_y']
         self.tetromino_manager['current_rotation'] = 0
         self.tetromino_manager['current_tetromino'] = self.spawn_tetromino(
-            self.tetromino_manager['x'], self.tetromino_manager['y'], self.tetromino_manager['tetromino_queue'][0]
+            self.tetromino_manager['x'], self.tetromino_manager['y'], self.next_tetromino()
         )
-        self.tetromino_manager['tetromino_queue'].pop(0)
 
     def land_tetromino(self):
         """
         Places the current tetromino on the playfield by marking its cells as landed.
         """
-        for y, row in enumerate(self.tetromino_manager['current_tetromino'].rotations[self.tetromino_manager['current_rotation']]):
-            for x, cell in enumerate(row):
-                if cell:
-                    self.playfield[self.tetromino_manager['y'] + y][self.tetromino_manager['x'] + x].landed = True
+        self.playfield.land(
+            self.row_masks(self.tetromino_manager['current_tetromino']),
+            self.tetromino_manager['x'], self.tetromino_manager['y']
+        )
 
     def move_tetromino(self, move_x: int, move_y: int, tetromino: Tetromino):
         """
@@ -188,38 +483,27 @@ class App:
             move_y (int): The offset to move in the Y direction.
             tetromino (Tetromino): The tetromino to move.
         """
-        self.clear_falling()
-        new_x = self.tetromino_manager['x'] + move_x
-        new_y = self.tetromino_manager['y'] + move_y
+        self.tetromino_manager['x'] += move_x
+        self.tetromino_manager['y'] += move_y
 
-        for y in range(4):
-            for x in range(4):
-                if tetromino.rotations[self.tetromino_manager['current_rotation']][y][x]:
-                    if new_y + y < len(self.playfield) and new_x + x < len(self.playfield[0]):
-                        self.playfield[new_y + y][new_x + x].falling = True
+    def drop_distance(self) -> int:
+        """
+        Looks up how far the falling tetromino falls on a hard drop, from the column surfaces
+        kept by the playfield.
 
-        self.tetromino_manager['x'] = new_x
-        self.tetromino_manager['y'] = new_y
+        Returns:
+            int: The number of rows the tetromino falls.
+        """
+        compiled = self.tetromino_manager['current_tetromino'].compiled[self.tetromino_manager['current_rotation']]
+        return self.playfield.drop_distance(
+            compiled.bottom, compiled.row_masks, self.tetromino_manager['x'], self.tetromino_manager['y']
+        )
 
     def drop_tetromino(self):
         """
         Instantly moves the tetromino as far down as possible.
         """
-        min_drops = 20
-        for y in range(4):
-            for x in range(4):
-                if self.tetromino_manager['current_tetromino'].rotations[self.tetromino_manager['current_rotation']][y][x]:
-                    drops = 0
-                    y_temp = y
-                    while (self.tetromino_manager['y'] + y_temp < len(self.playfield) and
-                           self.tetromino_manager['x'] + x < len(self.playfield[0]) and
-                           not self.playfield[self.tetromino_manager['y'] + y_temp][self.tetromino_manager['x'] + x].landed):
-                        y_temp += 1
-                        drops += 1
-                    if drops < min_drops:
-                        min_drops = drops
-
-        self.move_tetromino(0, min_drops - 1, self.tetromino_manager['current_tetromino'])
+        self.move_tetromino(0, self.drop_distance(), self.tetromino_manager['current_tetromino'])
         self.reset_tetromino()
 
     def swap_tetromino(self):
@@ -230,15 +514,13 @@ class App:
             self.tetromino_manager['swap_tetromino'],
             self.tetromino_manager['current_tetromino']
         )
-        self.clear_falling()
         self.tetromino_manager['x'] = self.tetromino_manager['start_x']
         self.tetromino_manager['y'] = self.tetromino_manager['start_y']
         self.tetromino_manager['current_rotation'] = 0
-        if not any(cell for row in self.tetromino_manager['current_tetromino'].rotations[self.tetromino_manager['current_rotation']] for cell in row):
+        if not self.tetromino_manager['current_tetromino'].compiled[self.tetromino_manager['current_rotation']].cells:
             self.tetromino_manager['current_tetromino'] = self.spawn_tetromino(
-                self.tetromino_manager['x'], self.tetromino_manager['y'], self.tetromino_manager['tetromino_queue'][0]
+                self.tetromino_manager['x'], self.tetromino_manager['y'], self.next_tetromino()
             )
-            self.tetromino_manager['tetromino_queue'].pop(0)
 
     def has_landed_cells_at_offset(self, x_offset: int, y_offset: int) -> bool:
         """
@@ -251,40 +533,36 @@ class App:
         Returns:
             bool: True if there are landed cells at the offset, False otherwise.
         """
-        for y in range(4):
-            for x in range(4):
-                if self.tetromino_manager['current_tetromino'].rotations[self.tetromino_manager['current_rotation']][y][x]:
-                    check_y = self.tetromino_manager['y'] + y + y_offset
-                    check_x = self.tetromino_manager['x'] + x + x_offset
+        return self.playfield.collides(
+            self.row_masks(self.tetromino_manager['current_tetromino']),
+            self.tetromino_manager['x'] + x_offset,
+            self.tetromino_manager['y'] + y_offset
+        )
 
-                    out_of_bounds = (check_y >= len(self.playfield) or check_y < 0 or
-                                     check_x < 4 or check_x >= 14)
+    def row_masks(self, tetromino: Tetromino) -> Tuple[Tuple[int, int], ...]:
+        """
+        Looks up the precompiled `(dy, mask)` rows of the current rotation of a tetromino.
 
-                    if out_of_bounds or self.playfield[check_y][check_x].landed:
-                        return True
+        Args:
+            tetromino (Tetromino): The tetromino to convert.
 
-        return False
+        Returns:
+            Tuple[Tuple[int, int], ...]: One `(dy, mask)` pair per occupied row of the rotation.
+        """
+        return tetromino.compiled[self.tetromino_manager['current_rotation']].row_masks
 
     def check_for_line_clear(self) -> int:
         """
-        Checks for any lines that are completely filled and clears them.
+        Checks the rows touched by tetrominoes landed since the last check for any that are
+        completely filled, and clears them.
 
         Returns:
             int: The number of lines cleared.
         """
-        lines_cleared = 0
-        lines_to_be_cleared = []
-
-        for y in range(len(self.playfield)):
-            if all(self.playfield[y][x].landed for x in range(4, 14)):
-                lines_to_be_cleared.append(y)
-                lines_cleared += 1
+        lines_to_be_cleared = self.playfield.take_full_rows()
+        self.playfield.clear_rows(lines_to_be_cleared)
 
-        for row in lines_to_be_cleared:
-            self.playfield.pop(row)
-            self.playfield.insert(0, [PlayFieldCell() for _ in range(18)])
-
-        return lines_cleared
+        return len(lines_to_be_cleared)
 
     def check_for_game_over(self) -> bool:
         """
@@ -293,26 +571,18 @@ class App:
         Returns:
             bool: True if the game is over, False otherwise.
         """
-        if self.playfield[self.tetromino_manager['start_y'] + 1][self.tetromino_manager['start_x'] + 1].landed:
+        if self.playfield.is_landed(self.tetromino_manager['start_x'] + 1, self.tetromino_manager['start_y'] + 1):
             return True
         return False
 
     def check_for_highscore(self):
         """
-        Checks and updates the high score from the high score file.
+        Checks and updates the high score from the score store. Nothing is read at construction,
+        so callers that want the high score displayed call this once the game is set up.
         """
-        home_dir = os.path.expanduser("~")
-        path = os.path.join(home_dir, ".tetrs_highscore")
-
-        try:
-            with open(path, 'r') as file:
-                high_score = int(file.read().strip())
-        except (FileNotFoundError, ValueError):
-            high_score = 0
-            with open(path, 'w') as file:
-                file.write("0")
-
-        self.game_state['high_score'] = high_score
+        if self.score_store is None:
+            return
+        self.game_state['high_score'] = self.score_store.high_score(self.game_state['mode'], self.seed)
 
     def check_for_next_level(self):
         """
@@ -322,14 +592,27 @@ class App:
             self.game_state['level'] += 1
             self.timing['default_tick_count_target'] -= 1
 
-    def clear_falling(self):
+    def falling_rows(self) -> Dict[int, int]:
         """
-        Clears the falling cells from the playfield by setting their falling status to False.
+        Computes the cells covered by the falling tetromino.
+
+        Returns:
+            Dict[int, int]: A bitmask of falling cells for each row the tetromino covers.
+        """
+        x = self.tetromino_manager['x']
+        y = self.tetromino_manager['y']
+        return {y + dy: mask << x for dy, mask in self.row_masks(self.tetromino_manager['current_tetromino'])}
+
+    def ghost_rows(self) -> Dict[int, int]:
+        """
+        Computes the cells the falling tetromino would cover after a hard drop.
+
+        Returns:
+            Dict[int, int]: A bitmask of ghost cells for each row the landing position covers.
         """
-        for row in self.playfield:
-            for cell in row:
-                if cell.falling:
-                    cell.falling = False
+        x = self.tetromino_manager['x']
+        y = self.tetromino_manager['y'] + self.drop_distance()
+        return {y + dy: mask << x for dy, mask in self.row_masks(self.tetromino_manager['current_tetromino'])}
 
     def playfield_string(self) -> str:
         """
@@ -338,17 +621,17 @@ class App:
         Returns:
             str: The playfield as a string.
         """
-        result = ""
-        for row in self.playfield[4:]:
-            for cell in row[4:]:
-                if cell.landed:
-                    result += "██"
-                elif cell.falling:
-                    result += "▒▒"
-                else:
-                    result += "  "
-            result += '\n'
-        return result
+        falling_rows = self.falling_rows()
+        ghost_rows = self.ghost_rows()
+        playfield = self.playfield
+        landed = playfield.landed
+        left_wall = playfield.left_wall
+        columns = playfield.width - left_wall
+        return "".join([
+            row_string(landed[y] >> left_wall, falling_rows.get(y, 0) >> left_wall, ghost_rows.get(y, 0) >> left_wall,
+                       columns)
+            for y in range(playfield.hidden_rows, playfield.height)
+        ])
 
     def tetromino_string(self, tetromino: Tetromino) -> str:
         """
@@ -360,12 +643,7 @@ class App:
         Returns:
             str: The tetromino as a string.
         """
-        result = ""
-        for row in tetromino.rotations[1]:
-            for cell in row[1:3]:
-                result += "██" if cell else "  "
-            result += '\n'
-        return result
+        return rotation_string(tetromino, 1)
 
     def tetromino_queue_string(self) -> str:
         """
@@ -374,8 +652,4 @@ class App:
         Returns:
             str: The tetromino queue as a string.
         """
-        result = ""
-        for tetromino in self.tetromino_manager['tetromino_queue']:
-            result += self.tetromino_string(tetromino)
-            result += '\n'
-        return result
+        return "".join([self.tetromino_string(tetromino) + '\n' for tetromino in self.tetromino_manager['tetromino_queue']])
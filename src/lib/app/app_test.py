@@ -3,3 +3,92 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+from .app import App, row_string
+from ..tetromino.tetromino import TETROMINO_SHAPES
+
+def make_app(tetromino_index: int = 3) -> App:
+    app = App(TETROMINO_SHAPES)
+    app.tetromino_manager['current_tetromino'] = TETROMINO_SHAPES[tetromino_index]
+    return app
+
+def test_moving_the_falling_tetromino_leaves_the_playfield_untouched():
+    app = make_app()
+
+    app.move_tetromino(1, 2, app.tetromino_manager['current_tetromino'])
+
+    assert (app.tetromino_manager['x'], app.tetromino_manager['y']) == (8, 6)
+    assert not any(app.playfield.landed)
+    assert app.falling_rows() == {6: 0b110 << 8, 7: 0b110 << 8}
+
+def test_playfield_string_composites_the_falling_tetromino():
+    app = make_app()
+
+    rows = app.playfield_string().splitlines()
+
+    assert rows[0] == " " * 8 + "▒▒▒▒" + " " * 16
+    assert rows[1] == rows[0]
+    assert rows[2].strip() == ""
+
+def test_repeated_rows_are_rendered_once():
+    app = make_app()
+    app.playfield.landed[25] = app.playfield.full_row
+    app.playfield_string()
+    misses = row_string.cache_info().misses
+
+    rows = app.playfield_string().splitlines()
+
+    assert row_string.cache_info().misses == misses
+    assert rows[-1] == "██" * 10 + " " * 8
+    assert app.tetromino_queue_string().count("\n") == 5 * len(app.tetromino_manager['tetromino_queue'])
+
+def test_ghost_marks_the_hard_drop_landing_position():
+    app = make_app()
+    ghost_rows = app.ghost_rows()
+    rows = app.playfield_string().splitlines()
+
+    app.perform('hard_drop')
+
+    assert ghost_rows == {y: app.playfield.landed[y] for y in ghost_rows}
+    assert rows[min(ghost_rows) - 4] == " " * 8 + "░░░░" + " " * 16
+
+def test_hard_drop_reaches_the_floor():
+    app = make_app(0)
+    app.perform('hard_drop')
+
+    assert app.playfield.landed[-1] == 0b1111 << 7
+
+def test_board_size_is_configurable():
+    app = App(TETROMINO_SHAPES, seed=1, columns=64, rows=30, hidden_rows=2)
+    playfield = app.playfield
+
+    assert (app.tetromino_manager['x'], app.tetromino_manager['y']) == (playfield.left_wall + 30, 2)
+    rows = app.playfield_string().splitlines()
+    assert len(rows) == 30 and all(len(row) == 2 * (64 + 4) for row in rows)
+
+    app.perform('hard_drop')
+    assert max(y for y, row in enumerate(playfield.landed) if row) == playfield.height - 1
+
+def test_rotations_kick_off_the_wall():
+    app = make_app(1)
+    manager = app.tetromino_manager
+    app.perform('rotate_cw')
+    while app.perform('left'):
+        pass
+    x = manager['x']
+
+    assert app.rotation_kick(1) == (2, 1, 0)
+    assert app.perform('rotate_cw')
+    assert (manager['current_rotation'], manager['x']) == (2, x + 1)
+
+def test_half_turns_and_the_o_piece():
+    app = make_app(1)
+    manager = app.tetromino_manager
+    position = (manager['x'], manager['y'])
+
+    assert app.perform('rotate_180')
+    assert (manager['current_rotation'], manager['x'], manager['y']) == (2, *position)
+
+    app = make_app(3)
+    for action in ('rotate_cw', 'rotate_180', 'rotate_ccw'):
+        assert app.perform(action)
+    assert (app.tetromino_manager['x'], app.tetromino_manager['y']) == position
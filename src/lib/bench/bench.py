@@ -0,0 +1,266 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+from ..app.app import App
+from ..engine.engine import Engine
+from ..playfield.playfield import COLUMNS
+from ..tetromino.tetromino import TETROMINO_SHAPES
+
+# Playable columns of the board used by the wide board benchmarks
+WIDE_COLUMNS = 128
+
+# Actions cycled through by the scripted player used in full game runs
+SCRIPTED_ACTIONS = ('left', 'left', 'hard_drop', 'right', 'noop', 'hard_drop', 'right', 'right', 'right', 'hard_drop')
+
+def seeded_app(seed: int = 0, columns: int = COLUMNS) -> App:
+    """
+    Builds a seeded game.
+
+    Args:
+        seed (int): Seed for the game's random number generator.
+        columns (int): The number of playable columns.
+
+    Returns:
+        App: The game.
+    """
+    return App(TETROMINO_SHAPES, seed=seed, columns=columns)
+
+def stacked_app(seed: int = 0, columns: int = COLUMNS) -> App:
+    """
+    Builds a game whose bottom rows are filled except for one column.
+
+    Args:
+        seed (int): Seed for the game's random number generator.
+        columns (int): The number of playable columns.
+
+    Returns:
+        App: The game.
+    """
+    app = seeded_app(seed, columns)
+    playfield = app.playfield
+    rows = playfield.landed.copy()
+    for y in range(playfield.height - 8, playfield.height):
+        rows[y] = playfield.full_row & ~(1 << (playfield.left_wall + y % columns))
+    playfield.replace(rows)
+    return app
+
+def play_game(seed: int, max_steps: int = 5000) -> int:
+    """
+    Plays a full seeded game with a scripted player.
+
+    Args:
+        seed (int): Seed for the game.
+        max_steps (int): Steps after which the game is cut short.
+
+    Returns:
+        int: The number of steps played.
+    """
+    engine = Engine(seed)
+    steps = 0
+    while not engine.done and steps < max_steps:
+        engine.step(SCRIPTED_ACTIONS[steps % len(SCRIPTED_ACTIONS)])
+        steps += 1
+    return steps
+
+def bench_tick() -> Callable[[], None]:
+    app = seeded_app()
+
+    def run():
+        nonlocal app
+        app.tick()
+        if not app.game_state['running']:
+            app = seeded_app()
+    return run
+
+def bench_move_tetromino() -> Callable[[], None]:
+    app = seeded_app()
+    moves = [(-1, 0), (1, 0)]
+    step = 0
+
+    def run():
+        nonlocal step
+        move_x, move_y = moves[step & 1]
+        app.move_tetromino(move_x, move_y, app.tetromino_manager['current_tetromino'])
+        step += 1
+    return run
+
+def bench_drop_tetromino(columns: int = COLUMNS) -> Callable[[], None]:
+    app = seeded_app(columns=columns)
+
+    def run():
+        nonlocal app
+        app.drop_tetromino()
+        app.check_for_line_clear()
+        if not app.game_state['running']:
+            app = seeded_app(columns=columns)
+    return run
+
+def bench_wide_drop_tetromino() -> Callable[[], None]:
+    return bench_drop_tetromino(WIDE_COLUMNS)
+
+def bench_wide_check_for_line_clear() -> Callable[[], None]:
+    return bench_check_for_line_clear(WIDE_COLUMNS)
+
+def bench_wide_playfield_string() -> Callable[[], None]:
+    return stacked_app(columns=WIDE_COLUMNS).playfield_string
+
+def bench_check_for_line_clear(columns: int = COLUMNS) -> Callable[[], None]:
+    app = stacked_app(columns=columns)
+    playfield = app.playfield
+    # Leave a well down the first column of the bottom four rows, for a vertical I piece
+    bottom = playfield.height - 4
+    rows = playfield.landed.copy()
+    rows[bottom:] = [playfield.full_row & ~(1 << playfield.left_wall)] * 4
+    playfield.replace(rows)
+    surface = playfield.surface.copy()
+    i_piece = [(dy, 1) for dy in range(4)]
+
+    def run():
+        playfield.landed[:] = rows
+        playfield.surface[:] = surface
+        playfield.land(i_piece, playfield.left_wall, bottom)
+        app.check_for_line_clear()
+    return run
+
+def bench_playfield_string() -> Callable[[], None]:
+    return stacked_app().playfield_string
+
+def bench_full_game() -> Callable[[], None]:
+    seed = 0
+
+    def run():
+        nonlocal seed
+        play_game(seed)
+        seed += 1
+    return run
+
+# Benchmark name mapped to (setup returning the operation to time, operations per repeat)
+BENCHMARKS: Dict[str, Tuple[Callable[[], Callable[[], None]], int]] = {
+    'app_tick': (bench_tick, 20000),
+    'move_tetromino': (bench_move_tetromino, 20000),
+    'drop_tetromino': (bench_drop_tetromino, 2000),
+    'check_for_line_clear': (bench_check_for_line_clear, 20000),
+    'playfield_string': (bench_playfield_string, 2000),
+    'full_game': (bench_full_game, 5),
+    'wide_drop_tetromino': (bench_wide_drop_tetromino, 2000),
+    'wide_check_for_line_clear': (bench_wide_check_for_line_clear, 20000),
+    'wide_playfield_string': (bench_wide_playfield_string, 2000),
+}
+
+def time_benchmark(setup: Callable[[], Callable[[], None]], number: int, repeat: int) -> float:
+    """
+    Times a benchmark, keeping the fastest of several repeats to filter out noise.
+
+    Args:
+        setup (Callable[[], Callable[[], None]]): Builds the operation to time.
+        number (int): Operations per repeat.
+        repeat (int): How many times to repeat the measurement.
+
+    Returns:
+        float: The fastest time per operation, in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        operation = setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+def run_benchmarks(names: List[str] = None, repeat: int = 5, scale: float = 1.0) -> dict:
+    """
+    Runs the benchmark suite.
+
+    Args:
+        names (List[str]): Benchmarks to run. Defaults to all of them.
+        repeat (int): How many times to repeat each measurement.
+        scale (float): Multiplier applied to the number of operations per repeat.
+
+    Returns:
+        dict: Machine-readable results, with seconds per operation for each benchmark.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        setup, number = BENCHMARKS[name]
+        per_op = time_benchmark(setup, max(1, int(number * scale)), repeat)
+        results[name] = {'seconds_per_op': per_op, 'ops_per_second': 1 / per_op if per_op else float('inf')}
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'benchmarks': results,
+    }
+
+def compare(results: dict, baseline: dict, threshold: float = 0.25) -> List[str]:
+    """
+    Compares results against a baseline.
+
+    Args:
+        results (dict): Results from `run_benchmarks`.
+        baseline (dict): Earlier results from `run_benchmarks`.
+        threshold (float): The allowed slowdown, as a fraction of the baseline time.
+
+    Returns:
+        List[str]: A description of every benchmark that regressed past the threshold.
+    """
+    regressions = []
+    for name, result in results['benchmarks'].items():
+        if name not in baseline['benchmarks']:
+            continue
+        before = baseline['benchmarks'][name]['seconds_per_op']
+        after = result['seconds_per_op']
+        if after > before * (1 + threshold):
+            regressions.append(f"{name}: {before * 1e6:.2f}us -> {after * 1e6:.2f}us ({after / before - 1:+.0%})")
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    """
+    Runs the benchmark suite from the command line.
+
+    Args:
+        argv (List[str]): Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The exit code, 1 if any benchmark regressed.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the tetris engine.")
+    parser.add_argument('names', nargs='*', help=f"benchmarks to run, out of: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    parser.add_argument('--baseline', help="compare against results saved in this file")
+    parser.add_argument('--save-baseline', help="save the results as the new baseline in this file")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown before failing (default 0.25)")
+    parser.add_argument('--repeat', type=int, default=5, help="repeats per benchmark (default 5)")
+    parser.add_argument('--quick', action='store_true', help="run a tenth of the operations")
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+
+    results = run_benchmarks(args.names, args.repeat, 0.1 if args.quick else 1.0)
+    for name, result in results['benchmarks'].items():
+        print(f"{name:24} {result['seconds_per_op'] * 1e6:12.2f} us/op {result['ops_per_second']:14.0f} ops/s")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as file:
+                json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import json
+from .bench import BENCHMARKS, compare, main, run_benchmarks
+
+def results(**timings) -> dict:
+    return {'benchmarks': {name: {'seconds_per_op': seconds} for name, seconds in timings.items()}}
+
+def test_compare_flags_only_slowdowns_past_the_threshold():
+    baseline = results(app_tick=1.0, playfield_string=1.0, full_game=1.0)
+    current = results(app_tick=1.2, playfield_string=1.5, full_game=0.5, new_benchmark=9.0)
+
+    regressions = compare(current, baseline, threshold=0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("playfield_string")
+
+def test_every_benchmark_runs():
+    measured = run_benchmarks(repeat=1, scale=0.001)
+
+    assert set(measured['benchmarks']) == set(BENCHMARKS)
+    assert all(result['seconds_per_op'] > 0 for result in measured['benchmarks'].values())
+
+def test_main_fails_on_regressions(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(results(move_tetromino=1e-12)))
+
+    assert main(['move_tetromino', '--quick', '--repeat', '1', '--baseline', str(baseline)]) == 1
+    assert "REGRESSION move_tetromino" in capsys.readouterr().err
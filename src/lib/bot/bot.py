@@ -0,0 +1,344 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Tuple
+from ..app.app import App
+from ..handler.handler import Handler, InputSource
+from ..playfield.playfield import Playfield
+from ..snapshot.snapshot import Snapshot
+from ..tetromino.tetromino import TETROMINO_SHAPES
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+# Heuristic weights for the board features, tuned for line-clearing play
+DEFAULT_WEIGHTS = {
+    'lines': 0.76,
+    'height': -0.51,
+    'holes': -0.36,
+    'bumpiness': -0.18,
+}
+
+# Rotation actions that bring a freshly spawned tetromino into each rotation
+ROTATION_ACTIONS = ([], ['rotate_cw'], ['rotate_180'], ['rotate_ccw'])
+
+class Placement(NamedTuple):
+    """
+    A reachable final position of the falling tetromino.
+
+    Attributes:
+        actions (Tuple[str, ...]): The actions that reach the placement, ending with a hard drop.
+        app (App): A clone of the game just after the tetromino landed and lines were cleared.
+        lines (int): The number of lines the placement clears.
+    """
+    actions: Tuple[str, ...]
+    app: App
+    lines: int
+
+def board_features(playfield: Playfield) -> Dict[str, int]:
+    """
+    Computes the heuristic features of a board. Column heights come from the surface the
+    playfield maintains, and every empty cell below a column's surface is a hole.
+
+    Args:
+        playfield (Playfield): The board.
+
+    Returns:
+        Dict[str, int]: The aggregate column height, number of holes and bumpiness.
+    """
+    full_row = playfield.full_row
+    heights = [playfield.height - top for top in playfield.surface]
+    filled = sum((row & full_row).bit_count() for row in playfield.landed)
+
+    columns = heights[playfield.left_wall:playfield.right_wall]
+    height = sum(columns)
+    return {
+        'height': height,
+        'holes': height - filled,
+        'bumpiness': sum(abs(left - right) for left, right in zip(columns, columns[1:])),
+    }
+
+def evaluate(app: App, lines: int, weights: Dict[str, float]) -> float:
+    """
+    Scores a board with the heuristic.
+
+    Args:
+        app (App): The game after a placement.
+        lines (int): The number of lines the placement cleared.
+        weights (Dict[str, float]): The weight of each feature.
+
+    Returns:
+        float: The score, higher is better. Lost games score negative infinity.
+    """
+    if not app.game_state['running']:
+        return float('-inf')
+    features = board_features(app.playfield)
+    return (
+        weights['lines'] * lines +
+        weights['height'] * features['height'] +
+        weights['holes'] * features['holes'] +
+        weights['bumpiness'] * features['bumpiness']
+    )
+
+def placements(app: App, allow_swap: bool = True) -> List[Placement]:
+    """
+    Enumerates every reachable final placement of the falling tetromino, for every rotation
+    and column. Placements are found by performing the same actions a player would on clones
+    of the game, so they follow exactly the rules of `perform`, `has_landed_cells_at_offset`
+    and `drop_tetromino`.
+
+    Args:
+        app (App): The game.
+        allow_swap (bool): Whether to also place the tetromino swapped in by `swap`.
+
+    Returns:
+        List[Placement]: One placement per distinct resulting board.
+    """
+    results = []
+    seen = set()
+    starts = [((), app)]
+    if allow_swap:
+        swapped = app.clone(copy_random=False)
+        swapped.perform('swap')
+        starts.append((('swap',), swapped))
+
+    for prefix, start in starts:
+        for rotation_actions in ROTATION_ACTIONS:
+            rotated = start.clone(copy_random=False)
+            if not all(rotated.perform(action) for action in rotation_actions):
+                continue
+            prefix_actions = prefix + tuple(rotation_actions)
+            for direction in ('left', 'right'):
+                shifted = rotated
+                shifts = 0
+                while True:
+                    if direction == 'left' or shifts > 0:
+                        placed = shifted.clone(copy_random=False)
+                        placed.perform('hard_drop')
+                        lines = placed.check_for_line_clear()
+                        board = tuple(placed.playfield.landed)
+                        if board not in seen:
+                            seen.add(board)
+                            actions = prefix_actions + (direction,) * shifts + ('hard_drop',)
+                            results.append(Placement(actions, placed, lines))
+                    shifted = shifted.clone(copy_random=False)
+                    if not shifted.perform(direction):
+                        break
+                    shifts += 1
+    return results
+
+def search(app: App, depth: int, weights: Dict[str, float], allow_swap: bool = True,
+           deadline: float = None) -> float:
+    """
+    Finds the value of the best sequence of placements up to the given depth. Lookahead goes
+    through the pieces in `tetromino_queue`.
+
+    Args:
+        app (App): The game.
+        depth (int): How many pieces to place.
+        weights (Dict[str, float]): The weight of each feature.
+        allow_swap (bool): Whether to consider swapping.
+        deadline (float): The `time.time()` to give up at, None for no limit. Wall-clock
+            time is shared by worker processes, unlike `time.perf_counter()`.
+
+    Returns:
+        float: The value of the best line of play, only partly searched if the deadline passed.
+    """
+    best = float('-inf')
+    for placement in placements(app, allow_swap):
+        if deadline is not None and time.time() > deadline:
+            break
+        value = evaluate(placement.app, placement.lines, weights)
+        if depth > 1 and value != float('-inf'):
+            value = weights['lines'] * placement.lines + search(placement.app, depth - 1, weights, allow_swap, deadline)
+        best = max(best, value)
+    return best
+
+def search_snapshot(snapshot: Snapshot, depth: int, weights: Dict[str, float], allow_swap: bool,
+                    deadline: float = None) -> float:
+    """
+    Runs `search` on a game rebuilt from a snapshot. Used by worker processes, which cannot
+    share `App` instances with the parent.
+
+    Args:
+        snapshot (Snapshot): The game to search from.
+        depth (int): How many pieces to place.
+        weights (Dict[str, float]): The weight of each feature.
+        allow_swap (bool): Whether to consider swapping.
+        deadline (float): The `time.time()` to give up at, None for no limit.
+
+    Returns:
+        float: The value of the best line of play.
+    """
+    app = App(TETROMINO_SHAPES)
+    app.restore(snapshot)
+    return search(app, depth, weights, allow_swap, deadline)
+
+class Bot:
+    """
+    Placement-search AI. Every reachable placement of the falling tetromino (and of the swap
+    option) is scored with a configurable heuristic, looking ahead through the queue.
+
+    With `workers` above one, the lookahead below each candidate placement runs in a process
+    pool so deeper searches fit in the time budget. Candidates whose lookahead has not
+    finished when the budget runs out keep their one-piece score. Workers stop searching at
+    the deadline by themselves, since a started pool task cannot be cancelled, and the next
+    decision waits for any such stragglers before submitting its own work.
+
+    `plan_async` plans in a background thread instead, for real-time play.
+
+    Attributes:
+        weights (Dict[str, float]): The weight of each board feature.
+        depth (int): How many pieces to look ahead, including the current one.
+        workers (int): Worker processes for the lookahead, 0 or 1 to search in process.
+        time_budget (float): Seconds allowed per decision, None for no limit.
+        allow_swap (bool): Whether to consider swapping.
+        stragglers (list): Lookahead futures still running past the previous deadline.
+    """
+    def __init__(self, weights: Dict[str, float] = None, depth: int = 1, workers: int = 0,
+                 time_budget: float = None, allow_swap: bool = True):
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.depth = depth
+        self.workers = workers
+        self.time_budget = time_budget
+        self.allow_swap = allow_swap
+        self.pool = None
+        self.planner = None
+        self.stragglers = []
+
+    def plan(self, app: App, time_budget: float = None) -> List[str]:
+        """
+        Picks the best placement for the falling tetromino.
+
+        Args:
+            app (App): The game.
+            time_budget (float): Seconds allowed for this decision. Defaults to `time_budget`.
+
+        Returns:
+            List[str]: The actions reaching the best placement, ending with a hard drop.
+        """
+        if time_budget is None:
+            time_budget = self.time_budget
+        deadline = time.time() + time_budget if time_budget is not None else None
+        candidates = placements(app, self.allow_swap)
+        if not candidates:
+            return ['hard_drop']
+
+        values = [evaluate(candidate.app, candidate.lines, self.weights) for candidate in candidates]
+        if self.depth > 1:
+            self.look_ahead(candidates, values, deadline)
+
+        best = max(range(len(candidates)), key=values.__getitem__)
+        return list(candidates[best].actions)
+
+    def plan_async(self, app: App, time_budget: float = None) -> 'Future':
+        """
+        Starts planning for the falling tetromino in a background thread, so a game loop can
+        keep ticking meanwhile. The plan is made on a clone, taken now, so the game may go on
+        changing. Without worker processes the search shares the interpreter lock with the
+        loop, which slows both down but stalls neither.
+
+        Args:
+            app (App): The game.
+            time_budget (float): Seconds allowed for this decision. Defaults to `time_budget`.
+
+        Returns:
+            Future: Resolves to the actions reaching the best placement.
+        """
+        if self.planner is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.planner = ThreadPoolExecutor(1)
+        return self.planner.submit(self.plan, app.clone(copy_random=False), time_budget)
+
+    def look_ahead(self, candidates: List[Placement], values: List[float], deadline: float):
+        """
+        Replaces the one-piece values of the candidates with their lookahead values.
+
+        Args:
+            candidates (List[Placement]): The candidate placements.
+            values (List[float]): The one-piece value of each candidate, updated in place.
+            deadline (float): The `time.time()` to stop searching at, None for no limit.
+        """
+        live = [index for index, value in enumerate(values) if value != float('-inf')]
+        line_values = {index: self.weights['lines'] * candidates[index].lines for index in live}
+
+        if self.workers > 1:
+            from concurrent.futures import ProcessPoolExecutor, wait
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(self.workers)
+            # Stragglers are past their deadline, so they finish within a placement or so
+            wait(self.stragglers)
+            futures = {
+                self.pool.submit(search_snapshot, candidates[index].app.snapshot(), self.depth - 1,
+                                 self.weights, self.allow_swap, deadline): index
+                for index in live
+            }
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            done, not_done = wait(futures, timeout)
+            self.stragglers = [future for future in not_done if not future.cancel()]
+            for future in done:
+                index = futures[future]
+                values[index] = line_values[index] + future.result()
+            return
+
+        for index in live:
+            value = search(candidates[index].app, self.depth - 1, self.weights, self.allow_swap, deadline)
+            if deadline is not None and time.time() > deadline:
+                # Cut short, so the value only covers part of the search
+                return
+            values[index] = line_values[index] + value
+
+    def close(self):
+        """
+        Shuts down the planning thread and the worker processes, if any were started.
+        """
+        if self.planner is not None:
+            self.planner.shutdown(cancel_futures=True)
+            self.planner = None
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+        self.stragglers = []
+
+class BotPlayer(InputSource):
+    """
+    Plays a game through a `Handler`, the same input path a human uses. Whenever the plan
+    for the previous tetromino has been sent, the bot starts planning the next one with
+    `Bot.plan_async`, so the game loop keeps running while it thinks. Every drain checks
+    whether the plan is ready, then pushes `actions_per_poll` actions. A plan that finishes
+    after its tetromino has already landed is thrown away.
+
+    Attributes:
+        app (App): The game being played.
+        bot (Bot): The bot picking placements.
+        actions_per_poll (int): How many actions to send per drain.
+        time_budget (float): Seconds allowed per plan when the bot has no budget of its own.
+        pending (deque): Planned actions not yet sent.
+        planning (Tuple[Future, int]): The plan being made and the piece count it was started at, if any.
+    """
+    def __init__(self, app: App, bot: Bot = None, actions_per_poll: int = 1, time_budget: float = 0.2):
+        self.app = app
+        self.bot = bot if bot is not None else Bot()
+        self.actions_per_poll = actions_per_poll
+        self.time_budget = time_budget
+        self.pending = deque()
+        self.planning = None
+
+    def poll(self, handler: Handler, now: float):
+        if not self.app.game_state['running'] or self.app.game_state['paused']:
+            return
+        pieces = self.app.game_state['pieces']
+        if not self.pending and self.planning is not None and self.planning[0].done():
+            future, planned_at = self.planning
+            self.planning = None
+            if planned_at == pieces:
+                self.pending.extend(future.result())
+        if not self.pending and self.planning is None:
+            budget = self.bot.time_budget if self.bot.time_budget is not None else self.time_budget
+            self.planning = (self.bot.plan_async(self.app, budget), pieces)
+        for _ in range(min(self.actions_per_poll, len(self.pending))):
+            handler.push(self.pending.popleft(), now)
@@ -0,0 +1,120 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import threading
+import time
+from .bot import DEFAULT_WEIGHTS, Bot, BotPlayer, placements, search
+from ..app.app import App
+from ..engine.engine import Engine
+from ..handler.handler import Handler
+from ..tetromino.tetromino import TETROMINO_BY_NAME, TETROMINO_SHAPES
+
+def test_placements_cover_every_column_and_rotation():
+    app = App(TETROMINO_SHAPES, seed=0)
+    app.tetromino_manager['current_tetromino'] = TETROMINO_BY_NAME['O']
+    assert len(placements(app, allow_swap=False)) == 9
+
+    app.tetromino_manager['current_tetromino'] = TETROMINO_BY_NAME['T']
+    assert len(placements(app, allow_swap=False)) == 8 + 9 + 8 + 9
+
+def test_bot_plays_a_long_game_and_scores():
+    engine = Engine(3)
+    bot = Bot()
+    for _ in range(60):
+        for action in bot.plan(engine.app):
+            engine.step(action)
+        for _ in range(16):
+            engine.step('noop')
+
+    assert not engine.done
+    assert engine.app.game_state['score'] > 0
+
+def test_parallel_lookahead_matches_the_in_process_search():
+    engine = Engine(4)
+    for action in Bot().plan(engine.app):
+        engine.step(action)
+
+    parallel = Bot(depth=2, workers=2)
+    try:
+        assert parallel.plan(engine.app) == Bot(depth=2).plan(engine.app)
+    finally:
+        parallel.close()
+
+def drain_until_planned(handler: Handler, timeout: float = 10.0) -> list:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        actions = [event.action for event in handler.drain(0.0)]
+        if actions:
+            return actions
+        time.sleep(0.005)
+    return []
+
+class RecordingBot(Bot):
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.budgets = []
+
+    def plan(self, app, time_budget=None):
+        self.budgets.append(time_budget)
+        return super().plan(app, time_budget)
+
+class GatedBot(Bot):
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def plan(self, app, time_budget=None):
+        self.gate.wait(10.0)
+        return super().plan(app, time_budget)
+
+def test_bot_player_feeds_the_handler_queue():
+    app = App(TETROMINO_SHAPES, seed=5)
+    handler = Handler()
+    bot = Bot()
+    handler.add_source(BotPlayer(app, bot, actions_per_poll=10))
+    try:
+        actions = drain_until_planned(handler)
+    finally:
+        bot.close()
+
+    assert actions and actions[-1] == 'hard_drop'
+
+def test_bot_player_plans_in_the_background_within_a_budget():
+    app = App(TETROMINO_SHAPES, seed=5)
+    handler = Handler()
+    bot = RecordingBot(depth=2)
+    handler.add_source(BotPlayer(app, bot, actions_per_poll=10, time_budget=0.05))
+    try:
+        # The drain returns at once while the plan is being made
+        assert handler.drain(0.0) == []
+        assert drain_until_planned(handler)[-1] == 'hard_drop'
+    finally:
+        bot.close()
+
+    assert bot.budgets == [0.05]
+
+def test_bot_player_drops_plans_for_tetrominoes_that_already_landed():
+    app = App(TETROMINO_SHAPES, seed=5)
+    handler = Handler()
+    bot = GatedBot()
+    player = BotPlayer(app, bot)
+    handler.add_source(player)
+    try:
+        assert handler.drain(0.0) == []
+        future, _ = player.planning
+        app.perform('hard_drop')
+        bot.gate.set()
+        future.result()
+
+        # The finished plan is for the landed tetromino, so planning starts over
+        assert handler.drain(0.0) == []
+        assert player.planning is not None and player.planning[0] is not future
+    finally:
+        bot.close()
+
+def test_searches_stop_at_their_deadline():
+    app = App(TETROMINO_SHAPES, seed=2)
+
+    assert search(app, 3, DEFAULT_WEIGHTS, deadline=time.time()) == float('-inf')
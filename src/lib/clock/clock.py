@@ -0,0 +1,98 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import time
+from typing import Awaitable, Callable
+
+class JitterStats:
+    """
+    Running statistics of how late scheduled events ran compared to their deadlines.
+
+    Attributes:
+        count (int): The number of events measured.
+        total (float): The summed lateness in seconds.
+        max (float): The worst lateness in seconds.
+        last (float): The lateness of the most recent event in seconds.
+    """
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, lateness: float):
+        """
+        Records the lateness of one event.
+
+        Args:
+            lateness (float): How long after its deadline the event ran, in seconds.
+        """
+        self.count += 1
+        self.total += lateness
+        self.last = lateness
+        if lateness > self.max:
+            self.max = lateness
+
+    @property
+    def mean(self) -> float:
+        """
+        The average lateness in seconds.
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> dict:
+        """
+        Returns the statistics as a dictionary.
+
+        Returns:
+            dict: The count, mean, max and last lateness.
+        """
+        return {'count': self.count, 'mean': self.mean, 'max': self.max, 'last': self.last}
+
+class Clock:
+    """
+    Monotonic clock with precise sleeping. Waits hand most of the time to the event loop and
+    spin on the clock for the last `spin_threshold` seconds only, since OS sleeps tend to
+    overshoot.
+
+    Attributes:
+        time_source (Callable[[], float]): Returns the current monotonic time in seconds.
+        spin_threshold (float): How long before a deadline to stop sleeping and spin instead.
+        async_sleep (Callable[[float], Awaitable[None]]): Sleeps for the given number of seconds inside an event
+            loop. Defaults to `asyncio.sleep`, imported only when needed so headless tools skip asyncio.
+    """
+    def __init__(self, time_source: Callable[[], float] = time.perf_counter, spin_threshold: float = 0.002,
+                 async_sleep: Callable[[float], Awaitable[None]] = None):
+        self.time_source = time_source
+        self.spin_threshold = spin_threshold
+        self.async_sleep = async_sleep
+
+    def now(self) -> float:
+        """
+        Returns the current time.
+
+        Returns:
+            float: The current monotonic time in seconds.
+        """
+        return self.time_source()
+
+    async def wait_until(self, deadline: float):
+        """
+        Waits until the given time without blocking the event loop, so callbacks such as
+        input readers keep running while the game loop is idle. The wait sleeps until
+        `spin_threshold` before the deadline, sleeping again if it woke early, and only
+        spins for what is left.
+
+        Args:
+            deadline (float): The monotonic time to wake up at.
+        """
+        import asyncio
+        async_sleep = self.async_sleep or asyncio.sleep
+        remaining = deadline - self.time_source()
+        while remaining > self.spin_threshold:
+            await async_sleep(remaining - self.spin_threshold)
+            remaining = deadline - self.time_source()
+        while self.time_source() < deadline:
+            await asyncio.sleep(0)
@@ -0,0 +1,35 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import asyncio
+from .clock import Clock
+
+# Sleeps wake halfway through, and time moves on a little every time it is read
+class EarlyWakingTime:
+    def __init__(self):
+        self.now = 0.0
+        self.reads = 0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        self.reads += 1
+        self.now += 0.00001
+        return self.now
+
+    async def async_sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds / 2
+
+def test_waits_sleep_again_after_waking_early_and_spin_only_at_the_end():
+    fake_time = EarlyWakingTime()
+    clock = Clock(fake_time, spin_threshold=0.002, async_sleep=fake_time.async_sleep)
+
+    asyncio.run(clock.wait_until(0.1))
+
+    assert fake_time.now >= 0.1
+    assert len(fake_time.sleeps) > 1
+    assert all(seconds > 0 for seconds in fake_time.sleeps)
+    # Spinning through the last 2 ms takes about 200 reads, the whole wait would take 10000
+    assert fake_time.reads < 300
@@ -0,0 +1,138 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from typing import List, Tuple
+from ..app.app import App, ACTIONS
+from ..playfield.playfield import COLUMNS, HIDDEN_ROWS, ROWS
+from ..randomizer.randomizer import DEFAULT_RANDOMIZER, make_randomizer
+from ..tetromino.tetromino import Tetromino, TETROMINO_SHAPES
+
+def shape_index(tetromino: Tetromino) -> int:
+    """
+    Finds the index of a tetromino in `TETROMINO_SHAPES`.
+
+    Args:
+        tetromino (Tetromino): The tetromino to look up.
+
+    Returns:
+        int: The index of the tetromino, or -1 for the empty swap tetromino.
+    """
+    for index, shape in enumerate(TETROMINO_SHAPES):
+        if shape is tetromino:
+            return index
+    return -1
+
+class Engine:
+    """
+    Headless driver for `App`. There is no renderer, no sleeping and no file I/O: every call
+    to `step` performs one action and advances the game by exactly one tick, so games run as
+    fast as the rules in `App` can be evaluated.
+
+    Attributes:
+        app (App): The game being driven.
+        steps (int): The number of steps taken since the last reset.
+        randomizer (str): The piece randomizer every game is started with.
+        columns (int): The number of playable columns of every board.
+        rows (int): The number of visible rows of every board.
+        hidden_rows (int): The number of rows above the visible board.
+    """
+    def __init__(self, seed: int = None, randomizer: str = DEFAULT_RANDOMIZER, columns: int = COLUMNS,
+                 rows: int = ROWS, hidden_rows: int = HIDDEN_ROWS):
+        self.randomizer = randomizer
+        self.columns = columns
+        self.rows = rows
+        self.hidden_rows = hidden_rows
+        self.app = None
+        self.steps = 0
+        self.reset(seed)
+
+    def reset(self, seed: int = None) -> dict:
+        """
+        Starts a new game.
+
+        Args:
+            seed (int): Seed for the game's random number generator.
+
+        Returns:
+            dict: The initial state of the game.
+        """
+        self.app = App(TETROMINO_SHAPES, seed=seed, randomizer=make_randomizer(self.randomizer),
+                       columns=self.columns, rows=self.rows, hidden_rows=self.hidden_rows)
+        self.steps = 0
+        return self.state()
+
+    def step(self, action: str) -> Tuple[dict, int, bool]:
+        """
+        Performs an action and advances the game by one tick.
+
+        Args:
+            action (str): One of `ACTIONS`.
+
+        Returns:
+            Tuple[dict, int, bool]: The new state, the score gained and whether the game is over.
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action: {action}")
+        if self.done:
+            return self.state(), 0, True
+
+        score = self.app.game_state['score']
+        if action != 'noop':
+            self.app.perform(action)
+        self.app.tick()
+        self.app.populate_tetromino_queue()
+        self.steps += 1
+        return self.state(), self.app.game_state['score'] - score, self.done
+
+    def legal_actions(self) -> List[str]:
+        """
+        Lists the actions that would change the game in its current state.
+
+        Returns:
+            List[str]: The legal actions, always including 'noop'.
+        """
+        if self.done:
+            return []
+
+        actions = ['noop']
+        if not self.app.has_landed_cells_at_offset(-1, 0):
+            actions.append('left')
+        if not self.app.has_landed_cells_at_offset(1, 0):
+            actions.append('right')
+        if not self.app.has_landed_cells_at_offset(0, 1):
+            actions.append('soft_drop')
+        actions.append('hard_drop')
+        actions.append('swap')
+        for action, direction in (('rotate_cw', 1), ('rotate_ccw', -1), ('rotate_180', 2)):
+            if self.app.rotation_kick(direction) is not None:
+                actions.append(action)
+        return actions
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the game is over.
+        """
+        return not self.app.game_state['running']
+
+    def state(self) -> dict:
+        """
+        Captures the observable state of the game.
+
+        Returns:
+            dict: The landed rows as bitmasks, the falling tetromino, the queue, score and level.
+        """
+        manager = self.app.tetromino_manager
+        return {
+            'playfield': tuple(self.app.playfield.landed),
+            'tetromino': shape_index(manager['current_tetromino']),
+            'rotation': manager['current_rotation'],
+            'x': manager['x'],
+            'y': manager['y'],
+            'swap': shape_index(manager['swap_tetromino']),
+            'queue': tuple(shape_index(tetromino) for tetromino in manager['tetromino_queue']),
+            'score': self.app.game_state['score'],
+            'level': self.app.game_state['level'],
+        }
@@ -0,0 +1,51 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import pytest
+from .engine import Engine
+from ..snapshot.snapshot import dumps
+
+def play(seed: int, steps: int = 2000) -> list:
+    engine = Engine(seed)
+    states = []
+    for step in range(steps):
+        action = 'hard_drop' if step % 20 == 0 else engine.legal_actions()[step % 3]
+        state, _, done = engine.step(action)
+        states.append(state)
+        if done:
+            break
+    return states
+
+def test_games_with_the_same_seed_are_identical():
+    assert play(42) == play(42)
+    assert play(42) != play(43)
+
+def test_game_ends_when_the_stack_reaches_the_spawn():
+    engine = Engine(1)
+    done = False
+    for _ in range(2000):
+        _, _, done = engine.step('hard_drop')
+        if done:
+            break
+
+    assert done
+    assert engine.legal_actions() == []
+
+def test_stepping_a_finished_game_leaves_it_unchanged():
+    engine = Engine(1)
+    while not engine.done:
+        engine.step('hard_drop')
+    state, steps, snapshot = engine.state(), engine.steps, dumps(engine.app.snapshot())
+
+    for action in ('left', 'hard_drop', 'noop'):
+        assert engine.step(action) == (state, 0, True)
+    engine.app.tick()
+
+    assert engine.steps == steps
+    assert dumps(engine.app.snapshot()) == snapshot
+
+def test_step_rejects_unknown_actions():
+    with pytest.raises(ValueError):
+        Engine(0).step('teleport')
@@ -1,14 +1,44 @@
 # Copyright (c) 2024 Emma Keogh
-# 
+#
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
-import time
+import asyncio
+from typing import List
 from ..app.app import App
+from ..clock.clock import Clock, JitterStats
+from ..handler.handler import Handler
+from ..profiler.profiler import Profiler
 from ..renderer.renderer import Renderer
 
+class Observer:
+    """
+    Base class for anything following the game from the event loop, such as a spectator
+    server. Observers are started once the loop is running and get the app after every tick.
+    """
+    async def start(self):
+        """
+        Called when the event loop starts.
+        """
+
+    def publish(self, app: App):
+        """
+        Called after every tick. Must not block, as it runs inside the game loop.
+
+        Args:
+            app (App): The game that just ticked.
+        """
+        raise NotImplementedError
+
+    async def stop(self):
+        """
+        Called when the event loop stops.
+        """
+
 class Event:
-    def __init__(self, app: App, renderer: Renderer, tick_rate: float = 1.0):
+    def __init__(self, app: App, renderer: Renderer, tick_rate: float = 1.0, frame_rate: float = None,
+                 max_catch_up: int = 5, clock: Clock = None, handler: Handler = None,
+                 profiler: Profiler = None):
         """
         Initializes the event loop with the given app and renderer.
 
@@ -16,28 +46,157 @@ class Event:
             app (App): The application instance.
             renderer (Renderer): The renderer instance.
             tick_rate (float): How often to update the app (in seconds).
+            frame_rate (float): Maximum frames rendered per second. Defaults to one frame per tick.
+            max_catch_up (int): Maximum ticks run back to back when the loop falls behind.
+            clock (Clock): The clock driving the loop.
+            handler (Handler): Input handler drained once per tick, if any.
+            profiler (Profiler): Instrumentation shared with the app and renderer, if any.
         """
         self.app = app
         self.renderer = renderer
         self.tick_rate = tick_rate
+        self.frame_interval = 1 / frame_rate if frame_rate else tick_rate
+        self.max_catch_up = max_catch_up
+        self.clock = clock if clock is not None else Clock()
+        self.tick_jitter = JitterStats()
+        self.frame_jitter = JitterStats()
+        self.skipped_frames = 0
+        self.handler = handler
+        self.observers: List[Observer] = []
+        self.profiler = profiler
+        if profiler is not None:
+            app.profiler = profiler
+            renderer.profiler = profiler
+
+    def add_observer(self, observer: Observer):
+        """
+        Adds an observer, which is started with the loop and published to after every tick.
+
+        Args:
+            observer (Observer): The observer to add.
+        """
+        self.observers.append(observer)
 
     def run(self):
         """
-        Starts the event loop.
+        Starts the event loop. The app is ticked at a fixed rate measured on a monotonic clock,
+        catching up on missed ticks, while frames are rendered at their own capped rate and
+        skipped when the loop falls behind.
+        """
+        asyncio.run(self.run_async())
+
+    async def run_async(self):
+        """
+        Runs the event loop inside an already running asyncio loop. Idle time is spent awaiting
+        the clock, so input and other callbacks on the loop are serviced between ticks.
         """
-        while self.app.game_state['running']:
+        loop = asyncio.get_running_loop()
+        if self.handler is not None:
+            self.handler.start(loop)
+        for observer in self.observers:
+            await observer.start()
+
+        now = self.clock.now()
+        next_tick = now
+        next_frame = now
+        try:
+            while self.app.game_state['running']:
+                if self.profiler is not None:
+                    start = self.profiler.now()
+                    next_tick = self.run_due_ticks(next_tick)
+                    self.profiler.record('logic', start, self.profiler.now())
+                else:
+                    next_tick = self.run_due_ticks(next_tick)
+
+                now = self.clock.now()
+                if now >= next_frame:
+                    self.frame_jitter.add(now - next_frame)
+                    self.render()
+                    next_frame += self.frame_interval
+                    if next_frame <= now:
+                        missed = int((now - next_frame) / self.frame_interval) + 1
+                        self.skipped_frames += missed
+                        next_frame += missed * self.frame_interval
+                        if self.profiler is not None:
+                            self.profiler.count('skipped_frames', missed)
+
+                # Deal upcoming tetrominoes while idle rather than when one spawns mid-tick
+                self.app.populate_tetromino_queue()
+
+                if self.profiler is not None:
+                    start = self.profiler.now()
+                    await self.clock.wait_until(min(next_tick, next_frame))
+                    self.profiler.record('sleep', start, self.profiler.now())
+                else:
+                    await self.clock.wait_until(min(next_tick, next_frame))
+        finally:
+            if self.handler is not None:
+                self.handler.stop(loop)
+            for observer in self.observers:
+                await observer.stop()
+            self.renderer.close()
+
+    def run_due_ticks(self, next_tick: float) -> float:
+        """
+        Runs every tick that is due, up to `max_catch_up` of them.
+
+        Args:
+            next_tick (float): The time the next tick is due.
+
+        Returns:
+            float: The time the following tick is due.
+        """
+        now = self.clock.now()
+        ticks = 0
+        while now >= next_tick and ticks < self.max_catch_up and self.app.game_state['running']:
+            self.tick_jitter.add(now - next_tick)
             self.tick()
-            self.render()
-            time.sleep(self.tick_rate)
+            next_tick += self.tick_rate
+            ticks += 1
+            now = self.clock.now()
+
+        if now >= next_tick + self.tick_rate:
+            # Too far behind to catch up, drop the backlog instead of spiralling
+            next_tick = now
+        return next_tick
 
     def tick(self):
         """
-        Updates the app state by calling the tick method on the app.
+        Applies pending input and updates the app state by calling the tick method on the app.
         """
+        if self.handler is not None:
+            for event in self.handler.drain(self.clock.now()):
+                self.app.perform(event.action)
+                self.handler.applied(event)
         self.app.tick()
+        for observer in self.observers:
+            observer.publish(self.app)
+        if self.profiler is not None:
+            self.profiler.count('ticks')
 
     def render(self):
         """
         Renders the current state of the app.
         """
         self.renderer.display()
+        if self.handler is not None:
+            self.handler.frame_presented(self.clock.now())
+        if self.profiler is not None:
+            self.profiler.end_frame(self.profiler.now())
+
+    def stats(self) -> dict:
+        """
+        Returns the measured tick and frame jitter.
+
+        Returns:
+            dict: Jitter statistics for ticks and frames, the number of skipped frames and,
+            with a handler attached, the key-to-screen latency.
+        """
+        stats = {
+            'tick_jitter': self.tick_jitter.as_dict(),
+            'frame_jitter': self.frame_jitter.as_dict(),
+            'skipped_frames': self.skipped_frames,
+        }
+        if self.handler is not None:
+            stats.update(self.handler.stats())
+        return stats
@@ -0,0 +1,80 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from .event import Event, Observer
+from ..app.app import App
+from ..clock.clock import Clock
+from ..renderer.renderer import Renderer
+from ..tetromino.tetromino import TETROMINO_SHAPES
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def async_sleep(self, seconds: float):
+        self.now += seconds
+
+class CountingRenderer(Renderer):
+    def __init__(self, app: App, frames: int, fake_time: FakeTime, frame_cost: float = 0.0):
+        super().__init__(app)
+        self.frames = frames
+        self.fake_time = fake_time
+        self.frame_cost = frame_cost
+        self.rendered = 0
+
+    def display(self):
+        self.rendered += 1
+        self.fake_time.now += self.frame_cost
+        if self.rendered >= self.frames:
+            self.app.quit()
+
+def make_event(frames: int, frame_cost: float = 0.0) -> Event:
+    fake_time = FakeTime()
+    app = App(TETROMINO_SHAPES)
+    renderer = CountingRenderer(app, frames, fake_time, frame_cost)
+    clock = Clock(fake_time, spin_threshold=0.0, async_sleep=fake_time.async_sleep)
+    return Event(app, renderer, 0.01, frame_rate=20, clock=clock)
+
+def test_ticks_and_frames_run_at_their_own_rates():
+    event = make_event(frames=10)
+    event.run()
+
+    # 10 frames at 20 fps span 0.45s, which is 45 or 46 ticks at 100 ticks per second
+    # depending on float rounding of the last deadline
+    assert event.tick_jitter.count in (45, 46)
+    assert event.frame_jitter.count == 10
+    assert event.skipped_frames == 0
+
+def test_slow_frames_are_skipped_while_ticks_catch_up():
+    event = make_event(frames=5, frame_cost=0.12)
+    event.run()
+
+    assert event.skipped_frames > 0
+    assert event.stats()['tick_jitter']['max'] > 0
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.calls = []
+
+    async def start(self):
+        self.calls.append('start')
+
+    def publish(self, app: App):
+        self.calls.append(app.timing['ticks'])
+
+    async def stop(self):
+        self.calls.append('stop')
+
+def test_observers_see_every_tick():
+    event = make_event(frames=3)
+    observer = RecordingObserver()
+    event.add_observer(observer)
+    event.run()
+
+    assert observer.calls[0] == 'start' and observer.calls[-1] == 'stop'
+    assert observer.calls[1:-1] == list(range(1, event.tick_jitter.count + 1))
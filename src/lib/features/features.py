@@ -0,0 +1,134 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from typing import Dict, Iterable, List, Sequence
+import numpy
+from ..playfield.playfield import COLUMNS, MARGIN, Playfield, PlayFieldCell
+
+def from_rows(boards: Iterable[Sequence[int]], left_wall: int = MARGIN, columns: int = COLUMNS) -> numpy.ndarray:
+    """
+    Unpacks bitboards into a stacked batch of cell arrays. Every row is serialised to bytes
+    and the whole batch is unpacked in one call, so boards of any width convert without
+    per-cell Python work.
+
+    Args:
+        boards (Iterable[Sequence[int]]): The boards, each a sequence of row bitmasks as kept
+            in `Playfield.landed`. Every board must have the same number of rows.
+        left_wall (int): The bit of the first playable column.
+        columns (int): The number of playable columns.
+
+    Returns:
+        numpy.ndarray: A `(N, H, W)` boolean array, True for landed cells, row 0 at the top.
+    """
+    boards = [tuple(board) for board in boards]
+    height = len(boards[0]) if boards else 0
+    row_bytes = (left_wall + columns + 7) // 8
+    data = b"".join(row.to_bytes(row_bytes, 'little') for board in boards for row in board)
+    packed = numpy.frombuffer(data, numpy.uint8).reshape(len(boards), height, row_bytes)
+    bits = numpy.unpackbits(packed, axis=2, bitorder='little')
+    return bits[:, :, left_wall:left_wall + columns].astype(bool)
+
+def from_playfields(playfields: Iterable[Playfield]) -> numpy.ndarray:
+    """
+    Stacks the landed cells of playfields sharing the same size.
+
+    Args:
+        playfields (Iterable[Playfield]): The boards, such as the placements found by the bot.
+
+    Returns:
+        numpy.ndarray: A `(N, H, W)` boolean array of the playable columns.
+    """
+    playfields = list(playfields)
+    if not playfields:
+        return numpy.zeros((0, 0, 0), bool)
+    first = playfields[0]
+    return from_rows((playfield.landed for playfield in playfields), first.left_wall, first.columns)
+
+def from_cells(cells: List[List[PlayFieldCell]], left_wall: int = MARGIN, columns: int = COLUMNS) -> numpy.ndarray:
+    """
+    Converts a `PlayFieldCell` grid, as built by `Playfield.cells`, into a cell array.
+
+    Args:
+        cells (List[List[PlayFieldCell]]): The grid, one list of cells per row.
+        left_wall (int): The first playable column of the grid.
+        columns (int): The number of playable columns.
+
+    Returns:
+        numpy.ndarray: A `(H, W)` boolean array, True for landed cells.
+    """
+    return numpy.array(
+        [[cell.landed for cell in row[left_wall:left_wall + columns]] for row in cells], bool
+    ).reshape(len(cells), columns)
+
+def board_features(boards: numpy.ndarray) -> Dict[str, numpy.ndarray]:
+    """
+    Computes the heuristic features of a batch of boards in vectorised form.
+
+    Args:
+        boards (numpy.ndarray): A `(N, H, W)` boolean array, or a single `(H, W)` board.
+
+    Returns:
+        Dict[str, numpy.ndarray]: Per board values, each of shape `(N,)` except `heights`:
+            heights: the height of every column, `(N, W)`.
+            height: the aggregate column height.
+            max_height: the height of the tallest column.
+            holes: empty cells below the top of their column.
+            bumpiness: the summed height difference of neighbouring columns.
+            row_transitions: filled and empty neighbours along rows, the walls counting as filled.
+            column_transitions: filled and empty neighbours down columns, the floor counting as filled.
+            wells: the summed depth of columns lower than both neighbours, the walls counting as full height.
+            lines: complete rows.
+    """
+    boards = numpy.asarray(boards, bool)
+    if boards.ndim == 2:
+        boards = boards[numpy.newaxis]
+    count, height, width = boards.shape
+
+    occupied = boards.any(axis=1)
+    heights = numpy.where(occupied, height - boards.argmax(axis=1), 0)
+    aggregate = heights.sum(axis=1)
+    filled = boards.sum(axis=(1, 2))
+
+    walls = numpy.ones((count, height, 1), bool)
+    rows = numpy.concatenate((walls, boards, walls), axis=2)
+    floor = numpy.ones((count, 1, width), bool)
+    columns = numpy.concatenate((boards, floor), axis=1)
+
+    sides = numpy.full((count, 1), height)
+    padded = numpy.concatenate((sides, heights, sides), axis=1)
+    wells = numpy.minimum(padded[:, :-2], padded[:, 2:]) - heights
+
+    return {
+        'heights': heights,
+        'height': aggregate,
+        'max_height': heights.max(axis=1, initial=0),
+        'holes': aggregate - filled,
+        'bumpiness': numpy.abs(numpy.diff(heights, axis=1)).sum(axis=1),
+        'row_transitions': (rows[:, :, 1:] != rows[:, :, :-1]).sum(axis=(1, 2)),
+        'column_transitions': (columns[:, 1:] != columns[:, :-1]).sum(axis=(1, 2)),
+        'wells': numpy.clip(wells, 0, None).sum(axis=1),
+        'lines': boards.all(axis=2).sum(axis=1),
+    }
+
+def score(features: Dict[str, numpy.ndarray], weights: Dict[str, float], lines: numpy.ndarray = None) -> numpy.ndarray:
+    """
+    Weighs the features of a batch of boards into one score per board.
+
+    Args:
+        features (Dict[str, numpy.ndarray]): Features from `board_features`.
+        weights (Dict[str, float]): The weight of each scalar feature, such as the bot's `DEFAULT_WEIGHTS`.
+        lines (numpy.ndarray): Lines cleared reaching each board, weighted as 'lines' in place of
+            the complete rows still on the boards.
+
+    Returns:
+        numpy.ndarray: The scores, higher is better.
+    """
+    total = numpy.zeros(len(features['height']))
+    for name, weight in weights.items():
+        if name == 'lines' and lines is not None:
+            total += weight * numpy.asarray(lines)
+        elif name in features:
+            total += weight * features[name]
+    return total
@@ -0,0 +1,72 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from .features import board_features, from_cells, from_playfields, from_rows, score
+from ..bot.bot import DEFAULT_WEIGHTS, board_features as bot_features
+from ..engine.engine import Engine
+from ..playfield.playfield import make_playfield
+
+def played_playfields(games: int = 6, steps: int = 400):
+    playfields = []
+    for seed in range(games):
+        engine = Engine(seed)
+        for step in range(steps):
+            engine.step(('left', 'hard_drop', 'right', 'right', 'hard_drop', 'rotate_cw', 'noop')[step % 7])
+        playfields.append(engine.app.playfield)
+    return playfields
+
+def test_features_match_the_bot_heuristic():
+    playfields = played_playfields()
+
+    features = board_features(from_playfields(playfields))
+
+    for index, playfield in enumerate(playfields):
+        expected = bot_features(playfield)
+        assert features['height'][index] == expected['height']
+        assert features['holes'][index] == expected['holes']
+        assert features['bumpiness'][index] == expected['bumpiness']
+
+def test_converters_agree():
+    playfield = played_playfields(1)[0]
+
+    boards = from_playfields([playfield])
+
+    assert boards.shape == (1, playfield.height, playfield.columns)
+    assert (from_cells(playfield.cells(), playfield.left_wall, playfield.columns) == boards[0]).all()
+
+def test_wide_boards_convert():
+    playfield = make_playfield(columns=100, rows=10)
+    playfield.land([(0, 1), (1, 0b11)], playfield.left_wall + 97, 8)
+
+    board = from_rows([playfield.landed], playfield.left_wall, 100)[0]
+
+    assert board.sum() == 3 and board[8, 97] and board[9, 98]
+
+def test_transitions_wells_and_lines():
+    board = numpy.zeros((4, 4), bool)
+    board[3] = True
+    board[2, [0, 2]] = True
+
+    features = board_features(board)
+
+    assert features['heights'].tolist() == [[2, 1, 2, 1]]
+    assert features['lines'].tolist() == [1]
+    assert features['wells'].tolist() == [2]
+    assert features['row_transitions'].tolist() == [2 + 2 + 4 + 0]
+    assert features['column_transitions'].tolist() == [4]
+    assert score(features, {'lines': 1.0, 'holes': -1.0}, lines=[3]).tolist() == [3.0]
+
+def test_scores_follow_the_bot_weights():
+    features = board_features(from_playfields(played_playfields(3)))
+
+    scores = score(features, DEFAULT_WEIGHTS, lines=numpy.zeros(3))
+
+    expected = (DEFAULT_WEIGHTS['height'] * features['height'] + DEFAULT_WEIGHTS['holes'] * features['holes'] +
+                DEFAULT_WEIGHTS['bumpiness'] * features['bumpiness'])
+    assert numpy.allclose(scores, expected)
@@ -1,10 +1,276 @@
 # Copyright (c) 2024 Emma Keogh
-# 
+#
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
 # src/lib/handler.py
 
+import os
+import sys
+from collections import deque
+from typing import TYPE_CHECKING, Dict, List, NamedTuple
+from ..clock.clock import Clock, JitterStats
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Raw stdin byte sequences and the App action each one triggers
+KEY_BINDINGS = {
+    b'\x1b[D': 'left',
+    b'\x1b[C': 'right',
+    b'\x1b[B': 'soft_drop',
+    b'\x1b[A': 'rotate_cw',
+    b'a': 'left',
+    b'd': 'right',
+    b's': 'soft_drop',
+    b'w': 'rotate_cw',
+    b'x': 'rotate_cw',
+    b'z': 'rotate_ccw',
+    b'e': 'rotate_180',
+    b' ': 'hard_drop',
+    b'c': 'swap',
+    b'p': 'pause',
+    b'q': 'quit',
+}
+
+# Actions that auto-repeat while their key is held
+REPEATABLE_ACTIONS = {'left', 'right', 'soft_drop'}
+
+class InputEvent(NamedTuple):
+    """
+    An action waiting to be applied to the app.
+
+    Attributes:
+        timestamp (float): When the key press was read, on the handler's clock.
+        action (str): The App action to perform.
+    """
+    timestamp: float
+    action: str
+
+class InputSource:
+    """
+    Base class for programmatic players that drive the game through a `Handler`.
+    """
+    def poll(self, handler: 'Handler', now: float):
+        """
+        Called at the start of every drain. Implementations `push` the actions they want to perform.
+
+        Args:
+            handler (Handler): The handler being drained.
+            now (float): The current time.
+        """
+        raise NotImplementedError
+
 class Handler:
-    def __init__(self):
-        self
\ No newline at end of file
+    """
+    Non-blocking keyboard input. Raw stdin is read from an asyncio reader callback into a
+    timestamped queue, which the game loop drains once per logic tick.
+
+    Terminals only report key presses: auto-repeat arrives as a stream of repeated presses
+    from the OS, starting after the OS repeat delay of typically 250 to 600 ms. Every press
+    queues a move until the key is known to be held, which is once a press arrives within
+    `release_timeout` seconds of the previous one, the spacing of OS repeats rather than of
+    taps. From then on OS repeats are swallowed while they keep arriving that close
+    together, and once `das` seconds (delayed auto shift) have passed since the first of a
+    run of presses, each within `repeat_delay` of the last, the handler repeats the action
+    itself every `arr` seconds (auto repeat rate). A held key cannot be told apart from taps
+    before its OS repeats arrive, so repeating never starts earlier.
+
+    Attributes:
+        clock (Clock): The clock used to timestamp input.
+        das (float): How long a key must be held before it starts repeating, in seconds.
+        arr (float): The interval between repeats of a held key, in seconds.
+        release_timeout (float): How long after its last OS repeat a held key counts as released, in seconds.
+        repeat_delay (float): The longest OS delay before a held key's first repeat, in seconds. Presses this
+            close together count towards DAS as one hold.
+        queue (deque): Pending input events, oldest first.
+        held (Dict[str, list]): Repeatable actions mapped to `[pressed, last_seen, next_repeat, confirmed]`, where
+            `confirmed` is set once presses arrive at OS repeat spacing.
+        latency (JitterStats): Time from reading a key to the first frame displaying its effect.
+        sources (List[InputSource]): Programmatic players polled for input on every drain.
+    """
+    def __init__(self, clock: Clock = None, das: float = 0.167, arr: float = 0.033,
+                 release_timeout: float = 0.1, repeat_delay: float = 0.6):
+        self.clock = clock if clock is not None else Clock()
+        self.das = das
+        self.arr = arr
+        self.release_timeout = release_timeout
+        self.repeat_delay = repeat_delay
+        self.queue = deque()
+        self.held: Dict[str, list] = {}
+        self.latency = JitterStats()
+        self.awaiting_frame: List[float] = []
+        self.sources: List[InputSource] = []
+        self.fd = None
+        self.terminal_attributes = None
+
+    def start(self, loop: 'asyncio.AbstractEventLoop', fd: int = None):
+        """
+        Switches the terminal to cbreak mode and starts reading input on the event loop. The
+        descriptor is left in blocking mode, since a terminal usually shares it with stdout and
+        the reader only runs once input is ready.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The loop to register the reader on.
+            fd (int): The file descriptor to read from. Defaults to stdin.
+        """
+        self.fd = sys.stdin.fileno() if fd is None else fd
+        if os.isatty(self.fd):
+            import termios
+            import tty
+            self.terminal_attributes = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)
+        loop.add_reader(self.fd, self.read)
+
+    def stop(self, loop: 'asyncio.AbstractEventLoop'):
+        """
+        Stops reading input and restores the terminal.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The loop the reader was registered on.
+        """
+        if self.fd is None:
+            return
+        loop.remove_reader(self.fd)
+        if self.terminal_attributes is not None:
+            import termios
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.terminal_attributes)
+            self.terminal_attributes = None
+        self.fd = None
+
+    def read(self):
+        """
+        Reads the input that is ready and queues it. Called by the event loop only once the
+        descriptor is readable, so the read does not block.
+        """
+        self.feed(os.read(self.fd, 1024), self.clock.now())
+
+    def feed(self, data: bytes, timestamp: float):
+        """
+        Parses raw input bytes and queues the actions they trigger.
+
+        Args:
+            data (bytes): The bytes read from the terminal.
+            timestamp (float): When the bytes were read.
+        """
+        index = 0
+        while index < len(data):
+            for sequence, action in KEY_BINDINGS.items():
+                if data.startswith(sequence, index):
+                    self.press(action, timestamp)
+                    index += len(sequence)
+                    break
+            else:
+                index += 1
+
+    def press(self, action: str, timestamp: float = None):
+        """
+        Registers a key press for an action.
+
+        Args:
+            action (str): The App action to perform.
+            timestamp (float): When the key was pressed. Defaults to now.
+        """
+        if timestamp is None:
+            timestamp = self.clock.now()
+
+        state = self.held.get(action)
+        if state is not None and state[3] and timestamp - state[1] <= self.release_timeout:
+            # An OS repeat of a held key, the handler repeats at its own rate instead
+            state[1] = timestamp
+            return
+
+        self.queue.append(InputEvent(timestamp, action))
+        if action not in REPEATABLE_ACTIONS:
+            return
+        if state is None or timestamp - state[1] > self.repeat_delay:
+            self.held[action] = [timestamp, timestamp, timestamp + self.das, False]
+        elif timestamp - state[1] <= self.release_timeout:
+            # Presses at OS repeat spacing: the key is held, repeating once DAS has passed
+            state[1] = timestamp
+            state[2] = max(state[2], timestamp + self.arr)
+            state[3] = True
+        else:
+            state[1] = timestamp
+
+    def push(self, action: str, timestamp: float = None):
+        """
+        Queues an action without any key repeat handling. This is the entry point for
+        programmatic players, which drive the game through the same queue as the keyboard.
+
+        Args:
+            action (str): The App action to perform.
+            timestamp (float): When the action was decided. Defaults to now.
+        """
+        self.queue.append(InputEvent(self.clock.now() if timestamp is None else timestamp, action))
+
+    def add_source(self, source: InputSource):
+        """
+        Adds a programmatic player. Its `poll(handler, now)` method is called at the start of
+        every drain and may `push` actions.
+
+        Args:
+            source (InputSource): The player to poll.
+        """
+        self.sources.append(source)
+
+    def drain(self, now: float = None) -> List[InputEvent]:
+        """
+        Takes every queued input event, adding auto-repeats for held keys and input from
+        programmatic players.
+
+        Args:
+            now (float): The current time. Defaults to now.
+
+        Returns:
+            List[InputEvent]: The events to apply this tick, oldest first.
+        """
+        if now is None:
+            now = self.clock.now()
+
+        for source in self.sources:
+            source.poll(self, now)
+        for action, state in list(self.held.items()):
+            if now - state[1] > (self.release_timeout if state[3] else self.repeat_delay):
+                del self.held[action]
+                continue
+            while state[3] and state[2] <= now:
+                self.queue.append(InputEvent(state[2], action))
+                state[2] += self.arr
+
+        events = list(self.queue)
+        self.queue.clear()
+        return events
+
+    def applied(self, event: InputEvent):
+        """
+        Marks an input event as applied so its latency is measured at the next frame.
+
+        Args:
+            event (InputEvent): The event that was applied.
+        """
+        self.awaiting_frame.append(event.timestamp)
+
+    def frame_presented(self, now: float = None):
+        """
+        Records the key-to-screen latency of every event applied since the previous frame.
+
+        Args:
+            now (float): When the frame finished displaying. Defaults to now.
+        """
+        if not self.awaiting_frame:
+            return
+        if now is None:
+            now = self.clock.now()
+        for timestamp in self.awaiting_frame:
+            self.latency.add(now - timestamp)
+        self.awaiting_frame.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the measured key-to-screen latency.
+
+        Returns:
+            dict: Latency statistics in seconds.
+        """
+        return {'input_latency': self.latency.as_dict()}
@@ -0,0 +1,107 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import asyncio
+import os
+from .handler import Handler
+
+def actions(events) -> list:
+    return [event.action for event in events]
+
+def test_feed_parses_arrow_keys_and_letters():
+    handler = Handler()
+    handler.feed(b'\x1b[Dk \x1b[Cc\x1b[A', 0.0)
+
+    assert actions(handler.drain(0.0)) == ['left', 'hard_drop', 'right', 'swap', 'rotate_cw']
+
+def test_tapped_keys_do_not_repeat():
+    handler = Handler(das=0.2, arr=0.05, release_timeout=0.1)
+    handler.press('left', 0.0)
+
+    assert actions(handler.drain(0.0)) == ['left']
+    assert actions(handler.drain(0.5)) == []
+    assert actions(handler.drain(1.0)) == []
+    handler.press('left', 1.0)
+    assert actions(handler.drain(1.0)) == ['left']
+
+def test_held_keys_repeat_after_das_at_arr():
+    handler = Handler(das=0.2, arr=0.05, release_timeout=0.1)
+    for step in range(8):
+        handler.press('right', step * 0.04)
+
+    # The second press, 40ms after the first, shows the key is held. Later OS repeats are
+    # swallowed and the handler repeats at 0.2, 0.25 and 0.3 instead
+    assert actions(handler.drain(0.3)) == ['right'] * 5
+
+def test_held_keys_repeat_after_a_realistic_os_delay():
+    handler = Handler(das=0.167, arr=0.05)
+    handler.press('left', 0.0)
+    assert actions(handler.drain(0.25)) == ['left']
+
+    # The OS starts repeating at 300ms, every 33ms
+    for step in range(10):
+        handler.press('left', 0.3 + step * 0.033)
+
+    # The first OS repeat looks like a tap and the second confirms the hold, both moving,
+    # then the handler's own repeats run at 0.383 .. 0.583
+    events = handler.drain(0.6)
+    assert actions(events) == ['left'] * 7
+    assert [round(event.timestamp, 3) for event in events[:3]] == [0.3, 0.333, 0.383]
+
+    # Released: repeats stop once the OS repeats do
+    assert actions(handler.drain(1.0)) == []
+    assert 'left' not in handler.held
+
+def drained_every_10ms(handler: Handler, presses: list, until: float) -> list:
+    events = []
+    for step in range(int(until * 100) + 1):
+        now = step / 100
+        while presses and presses[0] <= now:
+            handler.press('left', presses.pop(0))
+        events.extend(handler.drain(now))
+    return actions(events)
+
+def test_double_taps_move_twice_before_and_after_das():
+    assert drained_every_10ms(Handler(), [0.0, 0.15], 1.0) == ['left', 'left']
+    assert drained_every_10ms(Handler(), [0.0, 0.3], 1.0) == ['left', 'left']
+
+def test_keys_typed_in_one_read_all_move():
+    handler = Handler()
+    handler.feed(b'aa', 0.0)
+
+    assert actions(handler.drain(0.0)) == ['left', 'left']
+    assert drained_every_10ms(handler, [], 1.0) == []
+
+def test_key_to_screen_latency_is_measured_at_the_next_frame():
+    handler = Handler()
+    handler.press('swap', 1.0)
+    for event in handler.drain(1.01):
+        handler.applied(event)
+    handler.frame_presented(1.03)
+
+    assert handler.latency.count == 1
+    assert abs(handler.latency.last - 0.03) < 1e-9
+
+def test_reader_queues_input_from_the_event_loop():
+    read_fd, write_fd = os.pipe()
+    handler = Handler()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        handler.start(loop, read_fd)
+        blocking.append(os.get_blocking(read_fd))
+        os.write(write_fd, b'q')
+        await asyncio.sleep(0.01)
+        handler.stop(loop)
+
+    blocking = []
+    asyncio.run(run())
+    blocking.append(os.get_blocking(read_fd))
+    os.close(read_fd)
+    os.close(write_fd)
+
+    assert actions(handler.drain()) == ['quit']
+    # The descriptor may be shared with stdout, so its blocking mode is never changed
+    assert blocking == [True, True]
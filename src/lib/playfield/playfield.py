@@ -0,0 +1,325 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Playable columns and visible rows of a standard board
+COLUMNS = 10
+ROWS = 22
+
+# Rows above the visible board that tetrominoes spawn into
+HIDDEN_ROWS = 4
+
+# Empty columns kept on either side of the playable area, wide enough for a tetromino's 4x4 grid
+MARGIN = 4
+
+class PlayFieldCell:
+    """
+    Represents a cell in the playfield grid.
+
+    Attributes:
+        falling (bool): Indicates if the cell is currently falling.
+        landed (bool): Indicates if the cell has landed.
+    """
+    def __init__(self, falling: bool = False, landed: bool = False):
+        self.falling = falling
+        self.landed = landed
+
+    def __repr__(self):
+        return f"PlayFieldCell(falling={self.falling}, landed={self.landed})"
+
+class Playfield:
+    """
+    Bitboard backed playfield. Every row is stored as an integer in which bit `x` is set
+    when column `x` is occupied, so collision, landing and full-row checks are a handful of
+    integer operations per row instead of a walk over cell objects.
+
+    Shapes are passed around as row masks: an iterable of `(dy, mask)` pairs where `mask`
+    has bit `dx` set for every occupied cell `dx` columns right of the shape origin.
+
+    A row can only become full when something lands on it, so `land` remembers the rows it
+    touched and `take_full_rows` checks just those instead of scanning the whole buffer.
+
+    The row of the topmost landed cell of every column is kept up to date on landing and
+    clearing, which turns hard-drop distances into a lookup per column of the shape.
+
+    Attributes:
+        width (int): Number of columns in the buffer, including the wall padding.
+        height (int): Number of rows in the buffer, including the hidden spawn rows.
+        left_wall (int): The first playable column.
+        right_wall (int): The first column past the playable area.
+        hidden_rows (int): Number of rows above the visible board.
+        full_row (int): Mask with every playable column set.
+        walls (int): Mask with every column outside the playable area set.
+        landed (List[int]): Landed cells, one bitmask per row.
+        pending (Set[int]): Rows touched by `land` since they were last checked for clears.
+        surface (List[int]): The row of the topmost landed cell of each column, `height` for empty columns.
+    """
+    def __init__(self, width: int = COLUMNS + 2 * MARGIN, height: int = ROWS + HIDDEN_ROWS,
+                 left_wall: int = MARGIN, right_wall: int = MARGIN + COLUMNS, hidden_rows: int = HIDDEN_ROWS):
+        self.width = width
+        self.height = height
+        self.left_wall = left_wall
+        self.right_wall = right_wall
+        self.hidden_rows = hidden_rows
+        self.full_row = ((1 << right_wall) - 1) ^ ((1 << left_wall) - 1)
+        self.walls = ~self.full_row
+        self.landed = [0] * height
+        self.pending: Set[int] = set()
+        self.surface = [height] * width
+
+    @property
+    def columns(self) -> int:
+        """
+        The number of playable columns.
+        """
+        return self.right_wall - self.left_wall
+
+    @property
+    def rows(self) -> int:
+        """
+        The number of visible rows, below the hidden spawn rows.
+        """
+        return self.height - self.hidden_rows
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __repr__(self):
+        return f"Playfield(columns={self.columns}, rows={self.rows}, hidden_rows={self.hidden_rows})"
+
+    def copy(self) -> 'Playfield':
+        """
+        Creates an independent copy of the playfield.
+
+        Returns:
+            Playfield: The copy.
+        """
+        playfield = Playfield.__new__(Playfield)
+        playfield.__dict__.update(self.__dict__)
+        playfield.landed = self.landed.copy()
+        playfield.pending = self.pending.copy()
+        playfield.surface = self.surface.copy()
+        return playfield
+
+    def replace(self, rows: Iterable[int]):
+        """
+        Replaces every landed row, for example when restoring a saved game. Full rows in the
+        new contents are left pending so the next check still clears them.
+
+        Args:
+            rows (Iterable[int]): The landed cells, one bitmask per row.
+        """
+        self.landed = list(rows)
+        self.pending = set(self.full_rows())
+        self.update_surface()
+
+    def update_surface(self):
+        """
+        Recomputes the topmost landed cell of every column from the rows. Needed after rows
+        are removed or written directly rather than through `land`.
+        """
+        surface = [self.height] * self.width
+        seen = 0
+        for y, row in enumerate(self.landed):
+            new = row & ~seen
+            while new:
+                lowest = new & -new
+                surface[lowest.bit_length() - 1] = y
+                new ^= lowest
+            seen |= row
+        self.surface = surface
+
+    def is_landed(self, x: int, y: int) -> bool:
+        """
+        Checks if the cell at the given position has landed.
+
+        Args:
+            x (int): The column of the cell.
+            y (int): The row of the cell.
+
+        Returns:
+            bool: True if the cell has landed, False otherwise.
+        """
+        return bool(self.landed[y] >> x & 1)
+
+    def collides(self, row_masks: Iterable[Tuple[int, int]], x: int, y: int) -> bool:
+        """
+        Checks if a shape placed at the given position overlaps landed cells, the walls or
+        leaves the buffer.
+
+        Args:
+            row_masks (Iterable[Tuple[int, int]]): The `(dy, mask)` rows of the shape.
+            x (int): The X position of the shape origin.
+            y (int): The Y position of the shape origin.
+
+        Returns:
+            bool: True if the shape collides, False otherwise.
+        """
+        for dy, mask in row_masks:
+            check_y = y + dy
+            if check_y < 0 or check_y >= self.height:
+                return True
+            if x < 0:
+                if mask & ((1 << -x) - 1):
+                    return True
+                shifted = mask >> -x
+            else:
+                shifted = mask << x
+            if (self.landed[check_y] | self.walls) & shifted:
+                return True
+        return False
+
+    def land(self, row_masks: Iterable[Tuple[int, int]], x: int, y: int):
+        """
+        Marks the cells of a shape at the given position as landed.
+
+        Args:
+            row_masks (Iterable[Tuple[int, int]]): The `(dy, mask)` rows of the shape.
+            x (int): The X position of the shape origin.
+            y (int): The Y position of the shape origin.
+        """
+        for dy, mask in row_masks:
+            if 0 <= y + dy < self.height and x >= 0:
+                self.landed[y + dy] |= mask << x
+                self.pending.add(y + dy)
+                for dx in range(mask.bit_length()):
+                    if mask >> dx & 1 and y + dy < self.surface[x + dx]:
+                        self.surface[x + dx] = y + dy
+
+    def drop_distance(self, bottom: Iterable[Tuple[int, int]], row_masks: Iterable[Tuple[int, int]],
+                      x: int, y: int) -> int:
+        """
+        Computes how many rows a shape can fall before it lands. The distance comes from
+        comparing the lowest cell of each column of the shape with the column surface. A
+        shape tucked under an overhang sits below the surface of some column, and falls back
+        to stepping down one row at a time.
+
+        Args:
+            bottom (Iterable[Tuple[int, int]]): The `(dx, dy)` lowest cell of each column of the shape.
+            row_masks (Iterable[Tuple[int, int]]): The `(dy, mask)` rows of the shape.
+            x (int): The X position of the shape origin.
+            y (int): The Y position of the shape origin.
+
+        Returns:
+            int: The number of rows the shape can fall.
+        """
+        distance = self.height
+        surface = self.surface
+        for dx, dy in bottom:
+            gap = surface[x + dx] - y - dy - 1
+            if gap < 0:
+                distance = 0
+                while not self.collides(row_masks, x, y + distance + 1):
+                    distance += 1
+                return distance
+            if gap < distance:
+                distance = gap
+        return distance
+
+    def full_rows(self) -> List[int]:
+        """
+        Finds the rows whose playable columns have all landed.
+
+        Returns:
+            List[int]: The indices of the full rows, top to bottom.
+        """
+        full_row = self.full_row
+        return [y for y, row in enumerate(self.landed) if row & full_row == full_row]
+
+    def take_full_rows(self) -> List[int]:
+        """
+        Finds the full rows among those touched by `land` since the last call, and marks
+        them as checked.
+
+        Returns:
+            List[int]: The indices of the full rows, top to bottom.
+        """
+        if not self.pending:
+            return []
+        full_row = self.full_row
+        landed = self.landed
+        rows = sorted(y for y in self.pending if landed[y] & full_row == full_row)
+        self.pending.clear()
+        return rows
+
+    def clear_rows(self, rows: Iterable[int]):
+        """
+        Removes the given rows and shifts everything above them down. The rows are deleted
+        bottom up and the empty rows inserted at the top in one go, so the rows above move
+        once whether one line or four are cleared. Columns whose top is above every cleared
+        row drop by the number of rows cleared, and only the rest are searched for their new top.
+
+        Args:
+            rows (Iterable[int]): The indices of the rows to clear, top to bottom.
+        """
+        cleared = set(rows)
+        if not cleared:
+            return
+        landed = self.landed
+        for y in sorted(cleared, reverse=True):
+            del landed[y]
+        count = len(cleared)
+        landed[:0] = [0] * count
+
+        top = min(cleared)
+        height = self.height
+        surface = self.surface
+        rescan = 0
+        for x, y in enumerate(surface):
+            if y < top:
+                surface[x] = y + count
+            elif y < height:
+                rescan |= 1 << x
+        for y in range(top, height):
+            if not rescan:
+                break
+            found = landed[y] & rescan
+            rescan ^= found
+            while found:
+                lowest = found & -found
+                surface[lowest.bit_length() - 1] = y
+                found ^= lowest
+        while rescan:
+            lowest = rescan & -rescan
+            surface[lowest.bit_length() - 1] = height
+            rescan ^= lowest
+        if self.pending:
+            self.pending = {
+                y + sum(1 for row in cleared if row > y) for y in self.pending if y not in cleared
+            }
+
+    def cells(self, falling: Dict[int, int] = None) -> List[List[PlayFieldCell]]:
+        """
+        Builds a `PlayFieldCell` grid mirroring the current state of the playfield.
+
+        Args:
+            falling (Dict[int, int]): Optional falling cells to composite, as a bitmask per row index.
+
+        Returns:
+            List[List[PlayFieldCell]]: A snapshot of the playfield as cell objects.
+        """
+        if falling is None:
+            falling = {}
+        return [
+            [PlayFieldCell(bool(falling.get(y, 0) >> x & 1), bool(landed >> x & 1)) for x in range(self.width)]
+            for y, landed in enumerate(self.landed)
+        ]
+
+def make_playfield(columns: int = COLUMNS, rows: int = ROWS, hidden_rows: int = HIDDEN_ROWS) -> Playfield:
+    """
+    Builds an empty playfield of the given size, padded with `MARGIN` columns on either side.
+
+    Args:
+        columns (int): The number of playable columns.
+        rows (int): The number of visible rows.
+        hidden_rows (int): The number of rows above the visible board.
+
+    Returns:
+        Playfield: The playfield.
+    """
+    if columns < 4 or rows < 4 or hidden_rows < 0:
+        raise ValueError(f"Board too small: {columns}x{rows} with {hidden_rows} hidden rows")
+    return Playfield(columns + 2 * MARGIN, rows + hidden_rows, MARGIN, MARGIN + columns, hidden_rows)
@@ -0,0 +1,127 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import random
+from .playfield import MARGIN, Playfield, make_playfield
+
+# An O piece: two rows with the two left columns set
+O_PIECE = [(0, 0b11), (1, 0b11)]
+
+def test_collides_with_walls_and_floor():
+    playfield = Playfield()
+
+    assert not playfield.collides(O_PIECE, 4, 0)
+    assert playfield.collides(O_PIECE, 3, 0)
+    assert playfield.collides(O_PIECE, 13, 0)
+    assert not playfield.collides(O_PIECE, 12, 24)
+    assert playfield.collides(O_PIECE, 12, 25)
+    assert playfield.collides(O_PIECE, -1, 0)
+
+def test_land_and_collide_with_landed_cells():
+    playfield = Playfield()
+    playfield.land(O_PIECE, 6, 24)
+
+    assert playfield.is_landed(6, 24) and playfield.is_landed(7, 25)
+    assert not playfield.is_landed(8, 25)
+    assert playfield.collides(O_PIECE, 5, 23)
+    assert not playfield.collides(O_PIECE, 8, 24)
+
+def test_full_rows_are_cleared_and_shifted_down():
+    playfield = Playfield()
+    for x in range(4, 14, 2):
+        playfield.land(O_PIECE, x, 24)
+    playfield.land([(0, 1)], 4, 23)
+
+    assert playfield.full_rows() == [24, 25]
+
+    playfield.clear_rows(playfield.full_rows())
+
+    assert playfield.full_rows() == []
+    assert playfield.is_landed(4, 25)
+    assert playfield.landed[24] == 0
+
+def test_cells_mirror_the_bitboard():
+    playfield = Playfield()
+    playfield.land(O_PIECE, 4, 24)
+
+    cells = playfield.cells({5: 0b11 << 8})
+
+    assert len(cells) == 26 and len(cells[0]) == 18
+    assert cells[24][4].landed and not cells[24][4].falling
+    assert cells[5][9].falling and not cells[5][9].landed
+    assert not playfield.cells()[5][9].falling
+
+def test_only_rows_touched_by_landing_are_checked():
+    playfield = Playfield()
+    playfield.landed[25] = playfield.full_row
+    playfield.land([(0, 1)], 4, 20)
+
+    assert playfield.take_full_rows() == []
+
+    playfield.landed[21] = playfield.full_row & ~(1 << 4)
+    playfield.land([(0, 1), (1, 1)], 4, 20)
+
+    assert playfield.take_full_rows() == [21]
+    assert playfield.take_full_rows() == []
+
+def test_clearing_separate_rows_compacts_in_one_pass():
+    playfield = Playfield()
+    for y in range(20, 26):
+        playfield.landed[y] = 1 << (4 + y - 20)
+    playfield.landed[21] = playfield.landed[24] = playfield.full_row
+    playfield.land([(0, 1 << 9)], 4, 19)
+
+    playfield.clear_rows([21, 24])
+
+    assert playfield.landed[20:] == [0, 1 << 13, 1 << 4, 1 << 6, 1 << 7, 1 << 9]
+    assert playfield.pending == {21}
+
+def test_surface_follows_landing_and_clearing():
+    playfield = Playfield()
+    playfield.land(O_PIECE, 4, 24)
+    playfield.land([(0, 1)], 5, 20)
+
+    assert playfield.surface[4:7] == [24, 20, 26]
+
+    playfield.landed[25] = playfield.full_row
+    playfield.clear_rows([25])
+
+    assert playfield.surface[4:7] == [25, 21, 26]
+
+def test_clearing_keeps_the_surface_of_every_column():
+    rng = random.Random(7)
+    for _ in range(200):
+        playfield = Playfield()
+        for y in range(rng.randrange(playfield.height)):
+            playfield.landed[-1 - y] = rng.getrandbits(playfield.columns) << playfield.left_wall
+        playfield.update_surface()
+
+        playfield.clear_rows(rng.sample(range(playfield.height), rng.randint(1, 4)))
+
+        expected = playfield.surface
+        playfield.update_surface()
+        assert expected == playfield.surface
+
+def test_drop_distance_uses_the_surface_and_handles_overhangs():
+    playfield = Playfield()
+    playfield.land(O_PIECE, 4, 24)
+    bottom = [(0, 1), (1, 1)]
+
+    assert playfield.drop_distance(bottom, O_PIECE, 4, 0) == 22
+    assert playfield.drop_distance(bottom, O_PIECE, 5, 0) == 22
+    assert playfield.drop_distance(bottom, O_PIECE, 6, 0) == 24
+
+    playfield.land([(0, 0b1111)], 4, 10)
+
+    assert playfield.drop_distance(bottom, O_PIECE, 6, 11) == 13
+
+def test_made_playfields_have_the_requested_size():
+    playfield = make_playfield(columns=64, rows=40, hidden_rows=2)
+
+    assert (playfield.columns, playfield.rows, playfield.hidden_rows) == (64, 40, 2)
+    assert playfield.width == 64 + 2 * MARGIN and playfield.height == 42
+    assert not playfield.collides(O_PIECE, MARGIN + 62, 40)
+    assert playfield.collides(O_PIECE, MARGIN + 63, 0)
+    assert playfield.drop_distance([(0, 1), (1, 1)], O_PIECE, MARGIN + 30, 2) == 38
@@ -0,0 +1,228 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import json
+import os
+import time
+from collections import deque
+from typing import Dict, List
+
+class Histogram:
+    """
+    Latency histogram with power-of-two microsecond buckets.
+
+    Attributes:
+        buckets (Dict[int, int]): Bucket index mapped to sample count. Bucket `i` holds samples
+            below `2 ** i` microseconds and at or above the previous bucket's bound.
+        count (int): The number of samples.
+        total (float): The summed samples in seconds.
+        min (float): The smallest sample in seconds.
+        max (float): The largest sample in seconds.
+    """
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        """
+        Records one sample.
+
+        Args:
+            seconds (float): The measured duration.
+        """
+        bucket = int(seconds * 1e6).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Estimates a percentile from the bucket bounds.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.99.
+
+        Returns:
+            float: The upper bound of the bucket holding the percentile, in seconds.
+        """
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min((1 << bucket) / 1e6, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        """
+        Returns the histogram as a dictionary.
+
+        Returns:
+            dict: Summary statistics in seconds and the raw buckets keyed by their upper bound in microseconds.
+        """
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            'buckets_us': {str(1 << bucket): count for bucket, count in sorted(self.buckets.items())},
+        }
+
+class Profiler:
+    """
+    Opt-in instrumentation for the game loop. Instrumented code holds an optional profiler
+    and only calls into it when one is attached, so a disabled profiler costs a single
+    `is not None` check per hook.
+
+    Phases recorded by the loop are 'logic', 'line_clear', 'render', 'write' and 'sleep'.
+
+    Attributes:
+        phases (Dict[str, Histogram]): Latency histogram of every recorded phase.
+        counters (Dict[str, int]): Call and event counters.
+        slow_frame_threshold (float): Frames taking longer than this are logged, in seconds.
+        slow_frames (deque): The most recent slow frames.
+        trace_events (deque): The most recent phases as Chrome trace events.
+    """
+    def __init__(self, slow_frame_threshold: float = 1 / 60, slow_frame_log_size: int = 100,
+                 trace_limit: int = 100000):
+        self.phases: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.slow_frame_threshold = slow_frame_threshold
+        self.slow_frames = deque(maxlen=slow_frame_log_size)
+        self.trace_events = deque(maxlen=trace_limit)
+        self.frame_phases: Dict[str, float] = {}
+        self.frame_start = None
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+
+    def now(self) -> float:
+        """
+        Returns the current time.
+
+        Returns:
+            float: The current monotonic time in seconds.
+        """
+        return time.perf_counter()
+
+    def record(self, phase: str, start: float, end: float):
+        """
+        Records one run of a phase.
+
+        Args:
+            phase (str): The name of the phase.
+            start (float): When the phase started, from `now`.
+            end (float): When the phase ended, from `now`.
+        """
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = Histogram()
+        duration = end - start
+        histogram.add(duration)
+        self.frame_phases[phase] = self.frame_phases.get(phase, 0.0) + duration
+        self.trace_events.append((phase, start, duration))
+
+    def count(self, counter: str, amount: int = 1):
+        """
+        Increments a counter.
+
+        Args:
+            counter (str): The name of the counter.
+            amount (int): How much to add.
+        """
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def end_frame(self, now: float):
+        """
+        Closes the current frame, logging it if it was slow, and starts the next one.
+
+        Args:
+            now (float): When the frame was presented, from `now`.
+        """
+        if self.frame_start is not None:
+            duration = now - self.frame_start
+            if duration > self.slow_frame_threshold:
+                self.slow_frames.append({
+                    'time': self.frame_start - self.origin,
+                    'duration': duration,
+                    'phases': self.frame_phases,
+                })
+        self.count('frames')
+        self.frame_start = now
+        self.frame_phases = {}
+
+    def to_dict(self) -> dict:
+        """
+        Returns everything recorded so far.
+
+        Returns:
+            dict: Phase histograms, counters and the slow-frame log.
+        """
+        return {
+            'phases': {phase: histogram.as_dict() for phase, histogram in self.phases.items()},
+            'counters': dict(self.counters),
+            'slow_frames': list(self.slow_frames),
+        }
+
+    def to_json(self) -> str:
+        """
+        Returns everything recorded so far as JSON.
+
+        Returns:
+            str: The JSON document.
+        """
+        return json.dumps(self.to_dict(), indent=2)
+
+    def chrome_trace(self) -> dict:
+        """
+        Converts the recorded phases to the Chrome trace-event format, which can be loaded in
+        chrome://tracing or Perfetto.
+
+        Returns:
+            dict: The trace document.
+        """
+        events: List[dict] = [
+            {
+                'name': phase,
+                'ph': 'X',
+                'ts': (start - self.origin) * 1e6,
+                'dur': duration * 1e6,
+                'pid': self.pid,
+                'tid': 0,
+            }
+            for phase, start, duration in self.trace_events
+        ]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save(self, path: str):
+        """
+        Writes everything recorded so far as JSON.
+
+        Args:
+            path (str): The file to write.
+        """
+        with open(path, 'w') as file:
+            file.write(self.to_json())
+
+    def save_chrome_trace(self, path: str):
+        """
+        Writes the recorded phases as a Chrome trace.
+
+        Args:
+            path (str): The file to write.
+        """
+        with open(path, 'w') as file:
+            json.dump(self.chrome_trace(), file)
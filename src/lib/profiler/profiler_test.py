@@ -0,0 +1,55 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import json
+from io import StringIO
+from .profiler import Histogram, Profiler
+from ..app.app import App
+from ..event.event import Event
+from ..renderer.terminal_renderer import TerminalRenderer
+from ..tetromino.tetromino import TETROMINO_SHAPES
+
+def test_histogram_buckets_and_percentiles():
+    histogram = Histogram()
+    for microseconds in (3, 5, 6, 7, 900):
+        histogram.add(microseconds / 1e6)
+
+    assert histogram.count == 5
+    assert histogram.buckets == {2: 1, 3: 3, 10: 1}
+    assert histogram.percentile(0.5) == 8 / 1e6
+    assert histogram.percentile(1.0) == 900 / 1e6
+
+def test_slow_frames_are_logged_with_their_phases():
+    profiler = Profiler(slow_frame_threshold=0.5)
+    profiler.end_frame(0.0)
+    profiler.record('logic', 0.0, 0.2)
+    profiler.end_frame(0.3)
+    profiler.record('render', 0.3, 1.0)
+    profiler.end_frame(1.1)
+
+    assert len(profiler.slow_frames) == 1
+    assert profiler.slow_frames[0]['phases'] == {'render': 0.7}
+    assert profiler.counters['frames'] == 3
+
+def test_event_loop_exports_json_and_chrome_traces():
+    app = App(TETROMINO_SHAPES)
+    renderer = TerminalRenderer(app, StringIO())
+    profiler = Profiler()
+    event = Event(app, renderer, 0.001, profiler=profiler)
+    original_tick = app.tick
+
+    def tick():
+        original_tick()
+        if profiler.counters.get('ticks', 0) >= 20:
+            app.quit()
+    app.tick = tick
+    event.run()
+
+    exported = json.loads(profiler.to_json())
+    assert {'logic', 'render', 'write', 'sleep'} <= set(exported['phases'])
+    assert exported['counters']['frames'] > 0
+
+    trace = profiler.chrome_trace()['traceEvents']
+    assert trace and all(event['ph'] == 'X' for event in trace)
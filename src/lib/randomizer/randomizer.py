@@ -0,0 +1,181 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import random
+from typing import List, Tuple
+
+DEFAULT_RANDOMIZER = '7-bag'
+
+# Number of distinct tetrominoes, indexed as in `TETROMINO_SHAPES`
+PIECES = 7
+
+class Randomizer:
+    """
+    Base class for piece randomizers. A randomizer decides the order of tetrominoes, as
+    indices into `TETROMINO_SHAPES`, drawing from the random number generator of the game it
+    belongs to so every game has its own reproducible stream.
+
+    Randomizers produce pieces in batches, which the game appends to its queue whenever the
+    queue runs low, so peeking any distance ahead only costs the pieces actually drawn.
+
+    Attributes:
+        name (str): The name the randomizer is registered under in `RANDOMIZERS`.
+    """
+    name = ''
+
+    def first(self, generator: random.Random) -> int:
+        """
+        Draws the first tetromino of a game.
+
+        Args:
+            generator (random.Random): The game's random number generator.
+
+        Returns:
+            int: The index of the tetromino.
+        """
+        return generator.randrange(PIECES)
+
+    def draw(self, generator: random.Random) -> List[int]:
+        """
+        Draws the next batch of tetrominoes.
+
+        Args:
+            generator (random.Random): The game's random number generator.
+
+        Returns:
+            List[int]: The indices of the tetrominoes, in order.
+        """
+        raise NotImplementedError
+
+    def copy(self) -> 'Randomizer':
+        """
+        Creates an independent copy, for cloned games. Stateless randomizers are shared.
+
+        Returns:
+            Randomizer: The copy.
+        """
+        return self
+
+    def state(self) -> Tuple[int, ...]:
+        """
+        Captures the randomizer's own state, beyond the game's random number generator.
+
+        Returns:
+            Tuple[int, ...]: The state, empty for stateless randomizers.
+        """
+        return ()
+
+    def set_state(self, state: Tuple[int, ...]):
+        """
+        Restores state captured by `state`.
+
+        Args:
+            state (Tuple[int, ...]): The state to restore.
+        """
+
+class BagRandomizer(Randomizer):
+    """
+    Deals shuffled bags holding every tetromino `bags` times, so droughts are bounded.
+
+    Attributes:
+        bags (int): How many copies of each tetromino go in a bag.
+    """
+    def __init__(self, bags: int = 1):
+        self.bags = bags
+        self.name = f'{PIECES * bags}-bag'
+
+    def draw(self, generator: random.Random) -> List[int]:
+        order = list(range(PIECES)) * self.bags
+        generator.shuffle(order)
+        return order
+
+class PureRandomizer(Randomizer):
+    """
+    Draws every tetromino independently and uniformly.
+    """
+    name = 'random'
+
+    def draw(self, generator: random.Random) -> List[int]:
+        return [generator.randrange(PIECES)]
+
+class HistoryRandomizer(Randomizer):
+    """
+    Rerolls tetrominoes found in the last few dealt, up to `rolls` times, in the style of
+    the arcade randomizers. Games never start with an S, Z or O.
+
+    Attributes:
+        size (int): How many recent tetrominoes are remembered.
+        rolls (int): How many draws are made before accepting a repeat.
+        history (List[int]): The most recent tetrominoes, oldest first.
+    """
+    name = 'history'
+
+    # Z, Z, S, S: the history a game starts with
+    INITIAL_HISTORY = (6, 6, 4, 4)
+
+    # I, J, L, T: the tetrominoes a game may start with
+    FIRST_PIECES = (0, 1, 2, 5)
+
+    def __init__(self, size: int = 4, rolls: int = 4):
+        self.size = size
+        self.rolls = rolls
+        self.history = list(self.INITIAL_HISTORY[:size])
+
+    def first(self, generator: random.Random) -> int:
+        piece = generator.choice(self.FIRST_PIECES)
+        self.remember(piece)
+        return piece
+
+    def draw(self, generator: random.Random) -> List[int]:
+        for _ in range(self.rolls):
+            piece = generator.randrange(PIECES)
+            if piece not in self.history:
+                break
+        self.remember(piece)
+        return [piece]
+
+    def remember(self, piece: int):
+        """
+        Adds a dealt tetromino to the history, forgetting the oldest.
+
+        Args:
+            piece (int): The index of the tetromino.
+        """
+        self.history.append(piece)
+        del self.history[:-self.size]
+
+    def copy(self) -> 'HistoryRandomizer':
+        randomizer = HistoryRandomizer.__new__(HistoryRandomizer)
+        randomizer.__dict__.update(self.__dict__)
+        randomizer.history = self.history.copy()
+        return randomizer
+
+    def state(self) -> Tuple[int, ...]:
+        return tuple(self.history)
+
+    def set_state(self, state: Tuple[int, ...]):
+        self.history = list(state)
+
+# Randomizer name mapped to a factory building a fresh randomizer
+RANDOMIZERS = {
+    '7-bag': lambda: BagRandomizer(1),
+    '14-bag': lambda: BagRandomizer(2),
+    'random': PureRandomizer,
+    'history': HistoryRandomizer,
+}
+
+def make_randomizer(name: str = DEFAULT_RANDOMIZER) -> Randomizer:
+    """
+    Builds a fresh randomizer by name.
+
+    Args:
+        name (str): One of `RANDOMIZERS`.
+
+    Returns:
+        Randomizer: The randomizer, with no pieces dealt yet.
+    """
+    if name not in RANDOMIZERS:
+        raise ValueError(f"Unknown randomizer: {name}")
+    return RANDOMIZERS[name]()
@@ -0,0 +1,76 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import random
+from collections import Counter
+from .randomizer import RANDOMIZERS, HistoryRandomizer, make_randomizer
+from ..app.app import App
+from ..engine.engine import Engine
+from ..snapshot.snapshot import dumps, loads
+from ..tetromino.tetromino import TETROMINO_SHAPES
+
+def deal(name: str, count: int, seed: int = 0) -> list:
+    randomizer = make_randomizer(name)
+    generator = random.Random(seed)
+    pieces = []
+    while len(pieces) < count:
+        pieces.extend(randomizer.draw(generator))
+    return pieces[:count]
+
+def test_bags_hold_every_tetromino():
+    assert all(Counter(deal('7-bag', 70)[start:start + 7]) == Counter(range(7)) for start in range(0, 70, 7))
+    assert Counter(deal('14-bag', 14)) == Counter(list(range(7)) * 2)
+
+def test_history_randomizer_avoids_recent_repeats():
+    pieces = deal('history', 2000)
+    repeats = sum(1 for previous, piece in zip(pieces, pieces[1:]) if previous == piece)
+
+    assert repeats < 100
+    assert HistoryRandomizer().first(random.Random(1)) in HistoryRandomizer.FIRST_PIECES
+
+def test_games_have_independent_reproducible_streams():
+    for name in RANDOMIZERS:
+        first = App(TETROMINO_SHAPES, seed=3, randomizer=make_randomizer(name))
+        random.seed(99)
+        second = App(TETROMINO_SHAPES, seed=3, randomizer=make_randomizer(name))
+
+        assert first.preview(50) == second.preview(50)
+
+def test_preview_and_snapshots_keep_the_stream():
+    app = App(TETROMINO_SHAPES, seed=8, randomizer=make_randomizer('history'))
+    app.perform('hard_drop')
+    snapshot = loads(dumps(app.snapshot()))
+    upcoming = app.preview(30)
+
+    restored = App(TETROMINO_SHAPES)
+    restored.restore(snapshot)
+    for tetromino in upcoming:
+        assert restored.next_tetromino() is tetromino
+    assert restored.randomizer.name == 'history'
+
+def test_the_queue_is_dealt_between_ticks():
+    engine = Engine(5)
+    app = engine.app
+    draw, tick = app.randomizer.draw, app.tick
+    ticking = False
+    dealt_while_ticking = []
+
+    def counted_draw(generator):
+        dealt_while_ticking.append(ticking)
+        return draw(generator)
+
+    def watched_tick():
+        nonlocal ticking
+        ticking = True
+        tick()
+        ticking = False
+
+    app.randomizer.draw, app.tick = counted_draw, watched_tick
+    for _ in range(3000):
+        if engine.step('noop')[2]:
+            break
+
+    assert app.game_state['pieces'] > 10
+    assert dealt_while_ticking and not any(dealt_while_ticking)
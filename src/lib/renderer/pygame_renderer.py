@@ -0,0 +1,237 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import os
+from typing import Dict, List, Tuple
+from ..app.app import App
+from ..handler.handler import KEY_BINDINGS, Handler, InputSource
+from .renderer import Renderer
+
+TILE_SIZE = 24
+
+# Tile kinds, in drawing priority order after empty
+EMPTY, LANDED, FALLING, GHOST = range(4)
+
+# Fill and border colour of every tile kind
+TILE_COLORS = {
+    EMPTY: ((16, 16, 24), (28, 28, 40)),
+    LANDED: ((200, 200, 210), (120, 120, 135)),
+    FALLING: ((90, 170, 250), (40, 100, 180)),
+    GHOST: ((16, 16, 24), (90, 170, 250)),
+}
+
+STATUS_COLOR = (230, 230, 230)
+
+# Terminal key sequences mapped to the pygame names of the same keys
+PYGAME_KEY_NAMES = {
+    b'\x1b[A': 'up',
+    b'\x1b[B': 'down',
+    b'\x1b[C': 'right',
+    b'\x1b[D': 'left',
+    b' ': 'space',
+}
+
+# Pygame key names mapped to the App action each one triggers, following `KEY_BINDINGS`
+PYGAME_KEY_BINDINGS = {
+    PYGAME_KEY_NAMES.get(sequence, sequence.decode()): action for sequence, action in KEY_BINDINGS.items()
+}
+
+class PygameRenderer(Renderer):
+    """
+    Renders into a pygame window. Every kind of tile is drawn once into its own surface when
+    the window opens, and each frame only blits the cells whose contents changed since the
+    previous frame, found by comparing row bitmasks. The screen is then updated with one
+    dirty rectangle per changed row instead of a full flip.
+
+    Pygame is imported when the window opens, so it is only needed when this renderer is used.
+
+    Attributes:
+        tile_size (int): The width and height of a cell, in pixels.
+        headless (bool): Whether to use SDL's dummy video driver, which needs no display.
+        first_row (int): The first playfield row shown, below the hidden spawn rows.
+        status_height (int): The height of the score line above the playfield, in pixels.
+        previous_rows (List[Tuple[int, int, int]]): The landed, falling and ghost bits of every row on screen.
+        dirty (List): The rectangles updated by the last frame.
+    """
+    def __init__(self, app: App, tile_size: int = TILE_SIZE, headless: bool = False):
+        super().__init__(app)
+        self.tile_size = tile_size
+        self.headless = headless
+        self.first_row = app.playfield.hidden_rows
+        self.status_height = tile_size * 2
+        self.pygame = None
+        self.screen = None
+        self.font = None
+        self.tiles: Dict[int, object] = {}
+        self.previous_rows: List[Tuple[int, int, int]] = None
+        self.previous_status = None
+        self.dirty = []
+
+    def open(self):
+        """
+        Imports pygame, opens the window and pre-renders the tiles.
+        """
+        if self.headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        import pygame
+        self.pygame = pygame
+        pygame.display.init()
+        pygame.font.init()
+
+        playfield = self.app.playfield
+        columns = playfield.columns
+        rows = playfield.height - self.first_row
+        self.screen = pygame.display.set_mode((columns * self.tile_size, rows * self.tile_size + self.status_height))
+        pygame.display.set_caption("tetris")
+        pygame.key.set_repeat(170, 35)
+        self.font = pygame.font.Font(None, self.tile_size)
+        self.tiles = {kind: self.render_tile(fill, border) for kind, (fill, border) in TILE_COLORS.items()}
+        self.previous_rows = None
+        self.previous_status = None
+
+    def render_tile(self, fill: Tuple[int, int, int], border: Tuple[int, int, int]):
+        """
+        Draws one tile into a surface in the screen's pixel format, so blitting it is a plain copy.
+
+        Args:
+            fill (Tuple[int, int, int]): The colour of the tile.
+            border (Tuple[int, int, int]): The colour of its outline.
+
+        Returns:
+            pygame.Surface: The tile.
+        """
+        tile = self.pygame.Surface((self.tile_size, self.tile_size)).convert()
+        tile.fill(fill)
+        self.pygame.draw.rect(tile, border, tile.get_rect(), 1)
+        return tile
+
+    def frame_rows(self) -> List[Tuple[int, int, int]]:
+        """
+        Collects the landed, falling and ghost bits of every visible row.
+
+        Returns:
+            List[Tuple[int, int, int]]: One `(landed, falling, ghost)` triple per row, top to bottom.
+        """
+        falling_rows = self.app.falling_rows()
+        ghost_rows = self.app.ghost_rows()
+        landed = self.app.playfield.landed
+        return [
+            (landed[y], falling_rows.get(y, 0), ghost_rows.get(y, 0))
+            for y in range(self.first_row, self.app.playfield.height)
+        ]
+
+    def draw(self) -> list:
+        """
+        Blits the cells and status line that changed since the previous frame.
+
+        Returns:
+            list: The dirty rectangles to update.
+        """
+        pygame = self.pygame
+        playfield = self.app.playfield
+        left_wall = playfield.left_wall
+        columns = playfield.columns
+        tile_size = self.tile_size
+        dirty = []
+
+        status = (
+            f"Score: {self.app.game_state['score']}  Level: {self.app.game_state['level']}  "
+            f"High: {self.app.game_state['high_score']}"
+        )
+        if status != self.previous_status:
+            area = pygame.Rect(0, 0, columns * tile_size, self.status_height)
+            self.screen.fill(TILE_COLORS[EMPTY][0], area)
+            text = self.font.render(status, True, STATUS_COLOR)
+            self.screen.blit(text, text.get_rect(midleft=(tile_size // 2, self.status_height // 2)))
+            dirty.append(area)
+            self.previous_status = status
+
+        rows = self.frame_rows()
+        previous_rows = self.previous_rows
+        all_columns = playfield.full_row
+        for row, (landed, falling, ghost) in enumerate(rows):
+            if previous_rows is None:
+                changed = all_columns
+            else:
+                previous_landed, previous_falling, previous_ghost = previous_rows[row]
+                changed = ((landed ^ previous_landed) | (falling ^ previous_falling) | (ghost ^ previous_ghost)) & all_columns
+            if not changed:
+                continue
+
+            top = self.status_height + row * tile_size
+            first = (changed & -changed).bit_length() - 1
+            last = changed.bit_length() - 1
+            while changed:
+                lowest = changed & -changed
+                x = lowest.bit_length() - 1
+                changed ^= lowest
+                if landed & lowest:
+                    kind = LANDED
+                elif falling & lowest:
+                    kind = FALLING
+                elif ghost & lowest:
+                    kind = GHOST
+                else:
+                    kind = EMPTY
+                self.screen.blit(self.tiles[kind], ((x - left_wall) * tile_size, top))
+            dirty.append(pygame.Rect((first - left_wall) * tile_size, top, (last - first + 1) * tile_size, tile_size))
+
+        self.previous_rows = rows
+        return dirty
+
+    def display(self):
+        """
+        Draws the changes since the previous frame and pushes them to the window.
+        """
+        if self.screen is None:
+            self.open()
+        self.pygame.event.pump()
+
+        if self.profiler is None:
+            self.dirty = self.draw()
+            if self.dirty:
+                self.pygame.display.update(self.dirty)
+            return
+
+        start = self.profiler.now()
+        self.dirty = self.draw()
+        rendered = self.profiler.now()
+        self.profiler.record('render', start, rendered)
+        if self.dirty:
+            self.pygame.display.update(self.dirty)
+            self.profiler.record('write', rendered, self.profiler.now())
+            self.profiler.count('dirty_rects', len(self.dirty))
+
+    def close(self):
+        """
+        Closes the window.
+        """
+        if self.pygame is not None:
+            self.pygame.display.quit()
+            self.screen = None
+
+class PygameInput(InputSource):
+    """
+    Reads key presses from the pygame window, so the game can be played with the window
+    focused. Held keys repeat through pygame's own key repeat.
+
+    Attributes:
+        renderer (PygameRenderer): The renderer owning the window.
+    """
+    def __init__(self, renderer: PygameRenderer):
+        self.renderer = renderer
+
+    def poll(self, handler: Handler, now: float):
+        pygame = self.renderer.pygame
+        if pygame is None or self.renderer.screen is None:
+            return
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                handler.push('quit', now)
+            if event.type != pygame.KEYDOWN:
+                continue
+            action = PYGAME_KEY_BINDINGS.get(pygame.key.name(event.key))
+            if action is not None:
+                handler.push(action, now)
@@ -0,0 +1,32 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import pytest
+from .pygame_renderer import PYGAME_KEY_BINDINGS, PygameRenderer
+from ..app.app import App
+from ..tetromino.tetromino import TETROMINO_SHAPES
+
+def test_key_bindings_follow_the_terminal_bindings():
+    assert PYGAME_KEY_BINDINGS['left'] == 'left'
+    assert PYGAME_KEY_BINDINGS['space'] == 'hard_drop'
+    assert PYGAME_KEY_BINDINGS['z'] == 'rotate_ccw'
+
+def test_frames_only_update_changed_rows():
+    pytest.importorskip('pygame')
+    app = App(TETROMINO_SHAPES, seed=1)
+    renderer = PygameRenderer(app, tile_size=8, headless=True)
+    try:
+        renderer.display()
+        assert len(renderer.dirty) == 1 + app.playfield.height - renderer.first_row
+
+        renderer.display()
+        assert renderer.dirty == []
+
+        app.perform('right')
+        renderer.display()
+        assert 0 < len(renderer.dirty) <= 8
+        assert all(rect.height == 8 for rect in renderer.dirty)
+    finally:
+        renderer.close()
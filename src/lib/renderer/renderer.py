@@ -9,6 +9,7 @@ from ..tetromino.tetromino import Tetromino
 class Renderer:
     def __init__(self, app: App):
         self.app = app
+        self.profiler = None
 
     def render_playfield(self) -> str:
         """
@@ -60,4 +61,18 @@ class Renderer:
         """
         Displays the current game state.
         """
-        print(self.render_game_state())
+        if self.profiler is None:
+            print(self.render_game_state())
+            return
+
+        start = self.profiler.now()
+        output = self.render_game_state()
+        rendered = self.profiler.now()
+        print(output)
+        self.profiler.record('render', start, rendered)
+        self.profiler.record('write', rendered, self.profiler.now())
+
+    def close(self):
+        """
+        Releases anything the renderer holds on to once the game loop stops.
+        """
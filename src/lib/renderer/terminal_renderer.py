@@ -0,0 +1,130 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import sys
+from typing import List, TextIO
+from ..app.app import App
+from .renderer import Renderer
+
+# Unchanged characters between two changed runs are rewritten rather than skipped
+# when the gap is shorter than a cursor-positioning escape sequence.
+MERGE_GAP = 8
+
+HIDE_CURSOR = "\x1b[?25l"
+SHOW_CURSOR = "\x1b[?25h"
+CLEAR_SCREEN = "\x1b[2J"
+CLEAR_LINE = "\x1b[K"
+
+def move_cursor(row: int, column: int) -> str:
+    """
+    Builds the escape sequence moving the cursor to a screen position.
+
+    Args:
+        row (int): The zero-based row.
+        column (int): The zero-based column.
+
+    Returns:
+        str: The ANSI escape sequence.
+    """
+    return f"\x1b[{row + 1};{column + 1}H"
+
+def diff_line(previous: str, current: str, row: int) -> List[str]:
+    """
+    Computes the cursor-positioned writes that turn one screen line into another.
+
+    Args:
+        previous (str): The line as it is on screen.
+        current (str): The line as it should be.
+        row (int): The zero-based screen row of the line.
+
+    Returns:
+        List[str]: The escape sequences and text to write, empty if the lines are equal.
+    """
+    updates = []
+    start = None
+    last_changed = -1
+    for column, char in enumerate(current):
+        if column < len(previous) and previous[column] == char:
+            continue
+        if start is not None and column - last_changed > MERGE_GAP:
+            updates.append(move_cursor(row, start) + current[start:last_changed + 1])
+            start = None
+        if start is None:
+            start = column
+        last_changed = column
+
+    if start is not None:
+        updates.append(move_cursor(row, start) + current[start:last_changed + 1])
+    if len(current) < len(previous):
+        updates.append(move_cursor(row, len(current)) + CLEAR_LINE)
+    return updates
+
+class TerminalRenderer(Renderer):
+    """
+    Renders to an ANSI terminal by diffing each frame against the previous one. Only changed
+    cells and status lines are rewritten, and each frame goes out in a single buffered write.
+
+    Attributes:
+        stream (TextIO): The stream frames are written to.
+        previous_frame (List[str]): The lines currently on screen.
+    """
+    def __init__(self, app: App, stream: TextIO = None):
+        super().__init__(app)
+        self.stream = stream if stream is not None else sys.stdout
+        self.previous_frame = None
+
+    def frame_updates(self) -> str:
+        """
+        Renders the current game state and diffs it against the previous frame.
+
+        Returns:
+            str: Everything that needs to be written to bring the screen up to date.
+        """
+        frame = self.render_game_state().split('\n')
+        updates = []
+        if self.previous_frame is None:
+            updates.append(HIDE_CURSOR + CLEAR_SCREEN)
+            previous_frame = []
+        else:
+            previous_frame = self.previous_frame
+
+        for row, line in enumerate(frame):
+            previous = previous_frame[row] if row < len(previous_frame) else ""
+            if line != previous:
+                updates.extend(diff_line(previous, line, row))
+        for row in range(len(frame), len(previous_frame)):
+            updates.append(move_cursor(row, 0) + CLEAR_LINE)
+
+        self.previous_frame = frame
+        return "".join(updates)
+
+    def display(self):
+        """
+        Writes the changes since the previous frame, if there are any.
+        """
+        if self.profiler is None:
+            updates = self.frame_updates()
+            if updates:
+                self.stream.write(updates)
+                self.stream.flush()
+            return
+
+        start = self.profiler.now()
+        updates = self.frame_updates()
+        rendered = self.profiler.now()
+        self.profiler.record('render', start, rendered)
+        if updates:
+            self.stream.write(updates)
+            self.stream.flush()
+            self.profiler.record('write', rendered, self.profiler.now())
+            self.profiler.count('bytes_written', len(updates))
+
+    def close(self):
+        """
+        Moves the cursor below the last frame and shows it again.
+        """
+        if self.previous_frame is not None:
+            self.stream.write(move_cursor(len(self.previous_frame), 0) + SHOW_CURSOR)
+            self.stream.flush()
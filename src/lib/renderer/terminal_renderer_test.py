@@ -0,0 +1,41 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from io import StringIO
+from .terminal_renderer import TerminalRenderer, diff_line
+from ..app.app import App
+from ..tetromino.tetromino import TETROMINO_SHAPES
+
+def test_diff_line_only_rewrites_changed_runs():
+    assert diff_line("abcdef", "abcdef", 0) == []
+    assert diff_line("abcdef", "abXdef", 2) == ["\x1b[3;3HX"]
+    assert diff_line("a" * 30, "X" + "a" * 28 + "Y", 0) == ["\x1b[1;1HX", "\x1b[1;30HY"]
+    assert diff_line("abcdef", "abc", 0) == ["\x1b[1;4H\x1b[K"]
+
+def test_unchanged_frames_write_nothing():
+    stream = StringIO()
+    renderer = TerminalRenderer(App(TETROMINO_SHAPES), stream)
+
+    renderer.display()
+    first_frame = stream.getvalue()
+    renderer.display()
+
+    assert first_frame.startswith("\x1b[?25l\x1b[2J")
+    assert stream.getvalue() == first_frame
+
+def test_moving_the_tetromino_only_rewrites_its_rows():
+    stream = StringIO()
+    app = App(TETROMINO_SHAPES)
+    renderer = TerminalRenderer(app, stream)
+    renderer.display()
+    stream.seek(0)
+    stream.truncate()
+
+    app.try_move(1, 0)
+    renderer.display()
+
+    updates = stream.getvalue()
+    assert 0 < len(updates) < 100
+    assert "Score" not in updates
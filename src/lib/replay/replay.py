@@ -0,0 +1,315 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import struct
+from typing import Dict, List, Tuple
+from ..app.app import App
+from ..playfield.playfield import COLUMNS, HIDDEN_ROWS, ROWS
+from ..randomizer.randomizer import DEFAULT_RANDOMIZER, make_randomizer
+from ..scores.scores import DEFAULT_MODE
+from ..snapshot.snapshot import Snapshot
+from ..tetromino.tetromino import TETROMINO_SHAPES
+
+MAGIC = b'TRPL'
+VERSION = 3
+
+# Every action a replay can hold, indexed by its one-byte code. New actions are only ever appended.
+ACTION_CODES = ('noop', 'left', 'right', 'soft_drop', 'hard_drop', 'swap', 'pause', 'quit', 'rotate_cw', 'rotate_ccw',
+                'rotate_180')
+
+# magic, version, flags, random seed, ticks, final score, event count
+HEADER = struct.Struct('<4sBBQIQI')
+
+# playable columns, visible rows, hidden rows; added in version 3
+GEOMETRY = struct.Struct('<HHH')
+
+FLAG_SEEDED = 1
+
+def write_varint(value: int, output: bytearray):
+    """
+    Appends an unsigned LEB128 varint.
+
+    Args:
+        value (int): The value to write.
+        output (bytearray): The buffer to append to.
+    """
+    while value >= 0x80:
+        output.append(value & 0x7f | 0x80)
+        value >>= 7
+    output.append(value)
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """
+    Reads an unsigned LEB128 varint.
+
+    Args:
+        data (bytes): The buffer to read from.
+        offset (int): Where the varint starts.
+
+    Returns:
+        Tuple[int, int]: The value and the offset just past it.
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+class Replay:
+    """
+    A recorded game: the seed it was played with and every action tagged with the number of
+    ticks that had run when it was performed.
+
+    The binary format is a fixed header followed by the mode and randomizer names, the board
+    size and one entry per action,
+    where each entry is the varint tick delta from the previous action and a one-byte action
+    code. Most entries take two bytes.
+
+    Attributes:
+        random_seed (int): The seed of the game's random number generator.
+        seeded (bool): Whether the game was explicitly seeded, for leaderboards.
+        mode (str): The game mode.
+        events (List[Tuple[int, str]]): Every action as `(tick, action)`, in the order performed.
+        ticks (int): The number of ticks the game ran for.
+        score (int): The final score, used to check re-scored games.
+        randomizer (str): The name of the piece randomizer.
+        columns (int): The number of playable columns.
+        rows (int): The number of visible rows.
+        hidden_rows (int): The number of rows above the visible board.
+    """
+    def __init__(self, random_seed: int, seeded: bool = True, mode: str = DEFAULT_MODE,
+                 events: List[Tuple[int, str]] = None, ticks: int = 0, score: int = 0,
+                 randomizer: str = DEFAULT_RANDOMIZER, columns: int = COLUMNS, rows: int = ROWS,
+                 hidden_rows: int = HIDDEN_ROWS):
+        self.random_seed = random_seed
+        self.seeded = seeded
+        self.mode = mode
+        self.events = events if events is not None else []
+        self.ticks = ticks
+        self.score = score
+        self.randomizer = randomizer
+        self.columns = columns
+        self.rows = rows
+        self.hidden_rows = hidden_rows
+
+    def __repr__(self):
+        return f"Replay(random_seed={self.random_seed}, events={len(self.events)}, ticks={self.ticks})"
+
+    def to_bytes(self) -> bytes:
+        """
+        Encodes the replay.
+
+        Returns:
+            bytes: The binary replay.
+        """
+        output = bytearray(HEADER.pack(
+            MAGIC, VERSION, FLAG_SEEDED if self.seeded else 0,
+            self.random_seed, self.ticks, self.score, len(self.events)
+        ))
+        for name in (self.mode, self.randomizer):
+            encoded = name.encode()
+            output.append(len(encoded))
+            output += encoded
+        output += GEOMETRY.pack(self.columns, self.rows, self.hidden_rows)
+
+        previous_tick = 0
+        for tick, action in self.events:
+            write_varint(tick - previous_tick, output)
+            output.append(ACTION_CODES.index(action))
+            previous_tick = tick
+        return bytes(output)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        """
+        Decodes a replay. Version 1 replays predate randomizer choice and use the 7-bag, and
+        replays older than version 3 use the standard board.
+
+        Args:
+            data (bytes): The binary replay.
+
+        Returns:
+            Replay: The decoded replay.
+        """
+        magic, version, flags, random_seed, ticks, score, event_count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a replay file")
+        if not 1 <= version <= VERSION:
+            raise ValueError(f"Unsupported replay version: {version}")
+
+        offset = HEADER.size
+        mode_length = data[offset]
+        mode = data[offset + 1:offset + 1 + mode_length].decode()
+        offset += 1 + mode_length
+        randomizer = DEFAULT_RANDOMIZER
+        if version >= 2:
+            randomizer_length = data[offset]
+            randomizer = data[offset + 1:offset + 1 + randomizer_length].decode()
+            offset += 1 + randomizer_length
+        columns, rows, hidden_rows = COLUMNS, ROWS, HIDDEN_ROWS
+        if version >= 3:
+            columns, rows, hidden_rows = GEOMETRY.unpack_from(data, offset)
+            offset += GEOMETRY.size
+
+        events = []
+        tick = 0
+        for _ in range(event_count):
+            delta, offset = read_varint(data, offset)
+            tick += delta
+            events.append((tick, ACTION_CODES[data[offset]]))
+            offset += 1
+        return cls(random_seed, bool(flags & FLAG_SEEDED), mode, events, ticks, score, randomizer,
+                   columns, rows, hidden_rows)
+
+    def save(self, path: str):
+        """
+        Writes the replay to a file.
+
+        Args:
+            path (str): The file to write.
+        """
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        """
+        Reads a replay from a file.
+
+        Args:
+            path (str): The file to read.
+
+        Returns:
+            Replay: The replay.
+        """
+        with open(path, 'rb') as file:
+            return cls.from_bytes(file.read())
+
+class ReplayRecorder:
+    """
+    Records every action performed on an app.
+
+    Attributes:
+        app (App): The game being recorded.
+        replay (Replay): The replay being built.
+    """
+    def __init__(self, app: App):
+        self.app = app
+        playfield = app.playfield
+        self.replay = Replay(app.random_seed, app.seed is not None, app.game_state['mode'],
+                             randomizer=app.randomizer.name, columns=playfield.columns, rows=playfield.rows,
+                             hidden_rows=playfield.hidden_rows)
+        app.recorder = self
+
+    def record(self, tick: int, action: str):
+        """
+        Records one action.
+
+        Args:
+            tick (int): The number of ticks run before the action.
+            action (str): The action performed.
+        """
+        self.replay.events.append((tick, action))
+
+    def finish(self) -> Replay:
+        """
+        Stops recording.
+
+        Returns:
+            Replay: The finished replay.
+        """
+        self.replay.ticks = self.app.timing['ticks']
+        self.replay.score = self.app.game_state['score']
+        self.app.recorder = None
+        return self.replay
+
+class ReplayPlayer:
+    """
+    Plays a replay back headless, as fast as the rules can be evaluated. While playing, a
+    snapshot of the game is kept every `keyframe_interval` ticks so that `seek` only has to
+    fast-forward from the nearest keyframe.
+
+    Attributes:
+        replay (Replay): The replay being played.
+        app (App): The game being replayed.
+        keyframe_interval (int): Ticks between keyframes.
+        keyframes (Dict[int, Tuple[Snapshot, int]]): Tick mapped to a snapshot of the game and the index of the next event.
+    """
+    def __init__(self, replay: Replay, keyframe_interval: int = 1000):
+        self.replay = replay
+        self.keyframe_interval = keyframe_interval
+        self.keyframes: Dict[int, Tuple[Snapshot, int]] = {}
+        self.app = App(TETROMINO_SHAPES, seed=replay.random_seed, mode=replay.mode,
+                       randomizer=make_randomizer(replay.randomizer), columns=replay.columns, rows=replay.rows,
+                       hidden_rows=replay.hidden_rows)
+        self.next_event = 0
+        self.store_keyframe()
+
+    @property
+    def tick(self) -> int:
+        """
+        The number of ticks replayed so far.
+        """
+        return self.app.timing['ticks']
+
+    def store_keyframe(self):
+        """
+        Keeps a snapshot of the game at the current tick.
+        """
+        self.keyframes[self.tick] = (self.app.snapshot(), self.next_event)
+
+    def step(self):
+        """
+        Performs the actions recorded for the current tick and runs the tick.
+        """
+        events = self.replay.events
+        while self.next_event < len(events) and events[self.next_event][0] == self.tick:
+            self.app.perform(events[self.next_event][1])
+            self.next_event += 1
+        self.app.tick()
+        self.app.populate_tetromino_queue()
+        if self.tick % self.keyframe_interval == 0 and self.tick not in self.keyframes:
+            self.store_keyframe()
+
+    def run(self, until: int = None) -> App:
+        """
+        Plays the replay forward.
+
+        Args:
+            until (int): The tick to stop at. Defaults to the end of the replay, including the
+                actions of its last tick, such as the one that ended the game.
+
+        Returns:
+            App: The game at the stopping tick, or where it ended.
+        """
+        to_end = until is None
+        if to_end:
+            until = self.replay.ticks
+        events = self.replay.events
+        while self.app.game_state['running'] and (
+                self.tick < until or to_end and self.next_event < len(events)):
+            self.step()
+        return self.app
+
+    def seek(self, tick: int) -> App:
+        """
+        Moves to any tick, restoring the nearest keyframe at or before it and fast-forwarding.
+
+        Args:
+            tick (int): The tick to move to.
+
+        Returns:
+            App: The game at that tick.
+        """
+        start = max(keyframe for keyframe in self.keyframes if keyframe <= tick)
+        if not start <= self.tick <= tick:
+            keyframe, next_event = self.keyframes[start]
+            self.app.restore(keyframe)
+            self.next_event = next_event
+        return self.run(tick)
@@ -0,0 +1,67 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from .replay import Replay, ReplayPlayer, ReplayRecorder
+from ..engine.engine import Engine
+
+def record_game(seed: int = 5, steps: int = 3000) -> Replay:
+    engine = Engine(seed)
+    recorder = ReplayRecorder(engine.app)
+    for step in range(steps):
+        if engine.done:
+            break
+        if step % 7 == 0:
+            action = ('left', 'right', 'hard_drop', 'swap', 'soft_drop')[step // 7 % 5]
+        else:
+            action = 'noop'
+        engine.step(action)
+    return recorder.finish()
+
+def test_replays_survive_a_binary_round_trip():
+    replay = record_game()
+    data = replay.to_bytes()
+    decoded = Replay.from_bytes(data)
+
+    assert decoded.events == replay.events
+    assert (decoded.random_seed, decoded.seeded, decoded.ticks, decoded.score) == (5, True, replay.ticks, replay.score)
+    assert len(data) < 40 + 3 * len(replay.events)
+
+def test_playback_reproduces_the_recorded_game():
+    engine = Engine(9, 'history')
+    recorder = ReplayRecorder(engine.app)
+    for step in range(1500):
+        engine.step('hard_drop' if step % 11 == 0 else ('left', 'right', 'noop')[step % 3])
+    replay = Replay.from_bytes(recorder.finish().to_bytes())
+
+    app = ReplayPlayer(replay).run()
+
+    assert replay.randomizer == 'history'
+    assert app.playfield.landed == engine.app.playfield.landed
+    assert app.game_state['score'] == engine.app.game_state['score']
+    assert app.timing['ticks'] == replay.ticks
+
+def test_playback_uses_the_recorded_board_size():
+    engine = Engine(10, columns=16, rows=12)
+    recorder = ReplayRecorder(engine.app)
+    for step in range(600):
+        engine.step('hard_drop' if step % 9 == 0 else ('left', 'noop', 'right')[step % 3])
+    replay = Replay.from_bytes(recorder.finish().to_bytes())
+
+    app = ReplayPlayer(replay).run()
+
+    assert (replay.columns, replay.rows) == (16, 12)
+    assert app.playfield.landed == engine.app.playfield.landed
+
+def test_seek_matches_playing_from_the_start():
+    replay = record_game()
+    player = ReplayPlayer(replay, keyframe_interval=100)
+    player.run()
+
+    for tick in (replay.ticks * 3 // 4, replay.ticks // 4, replay.ticks, 0):
+        sought = player.seek(tick)
+        fresh = ReplayPlayer(replay).run(tick)
+        assert sought.timing['ticks'] == tick
+        assert sought.playfield.landed == fresh.playfield.landed
+        assert sought.tetromino_manager['x'] == fresh.tetromino_manager['x']
@@ -0,0 +1,168 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import os
+import time
+from typing import List, NamedTuple
+
+DEFAULT_MODE = 'marathon'
+
+class ScoreEntry(NamedTuple):
+    """
+    A finished game on a leaderboard.
+
+    Attributes:
+        score (int): The final score.
+        level (int): The level reached.
+        seed (int): The seed the game was played with, None for unseeded games.
+        mode (str): The game mode.
+        timestamp (float): When the game finished, in seconds since the epoch.
+    """
+    score: int
+    level: int
+    seed: int
+    mode: str
+    timestamp: float
+
+class ScoreStore:
+    """
+    Base class for score stores. Stores keep one leaderboard per mode and seed.
+    """
+    def submit(self, score: int, level: int = 1, seed: int = None, mode: str = DEFAULT_MODE):
+        """
+        Records a finished game.
+
+        Args:
+            score (int): The final score.
+            level (int): The level reached.
+            seed (int): The seed the game was played with.
+            mode (str): The game mode.
+        """
+        raise NotImplementedError
+
+    def leaderboard(self, mode: str = DEFAULT_MODE, seed: int = None, limit: int = 10) -> List[ScoreEntry]:
+        """
+        Lists the best games for a mode and seed.
+
+        Args:
+            mode (str): The game mode.
+            seed (int): The seed, None for unseeded games.
+            limit (int): The maximum number of entries to return.
+
+        Returns:
+            List[ScoreEntry]: The best games, highest score first.
+        """
+        raise NotImplementedError
+
+    def high_score(self, mode: str = DEFAULT_MODE, seed: int = None) -> int:
+        """
+        Looks up the best score for a mode and seed.
+
+        Args:
+            mode (str): The game mode.
+            seed (int): The seed, None for unseeded games.
+
+        Returns:
+            int: The best score, 0 if no game has been recorded.
+        """
+        entries = self.leaderboard(mode, seed, 1)
+        return entries[0].score if entries else 0
+
+    def flush(self):
+        """
+        Writes any buffered games to durable storage.
+        """
+
+    def close(self):
+        """
+        Flushes buffered games and releases the store.
+        """
+        self.flush()
+
+class MemoryScoreStore(ScoreStore):
+    """
+    Score store that keeps everything in memory and never touches disk.
+
+    Attributes:
+        entries (List[ScoreEntry]): Every recorded game.
+    """
+    def __init__(self):
+        self.entries: List[ScoreEntry] = []
+
+    def submit(self, score: int, level: int = 1, seed: int = None, mode: str = DEFAULT_MODE):
+        self.entries.append(ScoreEntry(score, level, seed, mode, time.time()))
+
+    def leaderboard(self, mode: str = DEFAULT_MODE, seed: int = None, limit: int = 10) -> List[ScoreEntry]:
+        entries = [entry for entry in self.entries if entry.mode == mode and entry.seed == seed]
+        entries.sort(key=lambda entry: entry.score, reverse=True)
+        return entries[:limit]
+
+class SQLiteScoreStore(ScoreStore):
+    """
+    Score store backed by a local SQLite database. Nothing is opened until the store is first
+    used, and submitted games are buffered and written in a single transaction once
+    `batch_size` of them are pending or the store is flushed.
+
+    Attributes:
+        path (str): The database file.
+        batch_size (int): The number of pending games that triggers a write.
+        pending (List[ScoreEntry]): Games submitted but not yet written.
+    """
+    def __init__(self, path: str = None, batch_size: int = 64):
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".tetrs_scores.db")
+        self.path = path
+        self.batch_size = batch_size
+        self.pending: List[ScoreEntry] = []
+        self.connection = None
+
+    def connect(self):
+        """
+        Opens the database and creates the scores table if needed.
+
+        Returns:
+            sqlite3.Connection: The open connection.
+        """
+        if self.connection is None:
+            import sqlite3
+            self.connection = sqlite3.connect(self.path)
+            with self.connection:
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS scores ("
+                    "score INTEGER NOT NULL, level INTEGER NOT NULL, seed INTEGER, "
+                    "mode TEXT NOT NULL, timestamp REAL NOT NULL)"
+                )
+                self.connection.execute(
+                    "CREATE INDEX IF NOT EXISTS scores_by_board ON scores (mode, seed, score DESC)"
+                )
+        return self.connection
+
+    def submit(self, score: int, level: int = 1, seed: int = None, mode: str = DEFAULT_MODE):
+        self.pending.append(ScoreEntry(score, level, seed, mode, time.time()))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def leaderboard(self, mode: str = DEFAULT_MODE, seed: int = None, limit: int = 10) -> List[ScoreEntry]:
+        self.flush()
+        rows = self.connect().execute(
+            "SELECT score, level, seed, mode, timestamp FROM scores "
+            "WHERE mode = ? AND seed IS ? ORDER BY score DESC LIMIT ?",
+            (mode, seed, limit)
+        )
+        return [ScoreEntry(*row) for row in rows]
+
+    def flush(self):
+        if not self.pending:
+            return
+        connection = self.connect()
+        with connection:
+            connection.executemany("INSERT INTO scores VALUES (?, ?, ?, ?, ?)", self.pending)
+        self.pending.clear()
+
+    def close(self):
+        self.flush()
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
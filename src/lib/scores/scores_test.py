@@ -0,0 +1,54 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import os
+from .scores import MemoryScoreStore, SQLiteScoreStore
+from ..app.app import App
+from ..tetromino.tetromino import TETROMINO_SHAPES
+
+def test_memory_store_keeps_a_leaderboard_per_mode_and_seed():
+    store = MemoryScoreStore()
+    store.submit(300, seed=1)
+    store.submit(900, seed=1)
+    store.submit(5000, seed=2)
+    store.submit(7000, mode='sprint', seed=1)
+
+    assert [entry.score for entry in store.leaderboard(seed=1)] == [900, 300]
+    assert store.high_score(seed=2) == 5000
+    assert store.high_score() == 0
+
+def test_sqlite_store_is_lazy_and_batches_writes(tmp_path):
+    path = str(tmp_path / "scores.db")
+    store = SQLiteScoreStore(path, batch_size=3)
+    store.submit(100)
+    store.submit(200)
+
+    assert not os.path.exists(path)
+
+    store.submit(300)
+
+    assert os.path.exists(path)
+    assert store.pending == []
+
+    store.submit(50, seed=7)
+    store.close()
+
+    reopened = SQLiteScoreStore(path)
+    assert [entry.score for entry in reopened.leaderboard()] == [300, 200, 100]
+    assert reopened.high_score(seed=7) == 50
+    reopened.close()
+
+def test_app_records_its_score_once_when_the_game_ends():
+    store = MemoryScoreStore()
+    store.submit(1200, seed=3)
+    app = App(TETROMINO_SHAPES, seed=3, score_store=store)
+    app.check_for_highscore()
+    app.game_state['score'] = 400
+
+    app.quit()
+    app.quit()
+
+    assert app.game_state['high_score'] == 1200
+    assert [entry.score for entry in store.leaderboard(seed=3)] == [1200, 400]
@@ -0,0 +1,275 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import os
+import struct
+import sys
+import time
+from functools import lru_cache
+from itertools import islice
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Set, Tuple
+from ..app.app import App
+from ..engine.engine import shape_index
+from ..event.event import Observer
+
+MAGIC = b'TSHM'
+VERSION = 1
+
+# magic, version, playable columns, rows in the buffer, hidden rows, then padding so the
+# sequence counter is 8-byte aligned
+HEADER = struct.Struct('<4sHHHH4x')
+
+# Sequence counter, odd while the writer is part way through an update
+SEQUENCE = struct.Struct('<Q')
+SEQUENCE_OFFSET = HEADER.size
+
+# Queued tetrominoes published, the rest of the queue is left out
+QUEUE_SLOTS = 8
+
+# tick, score, lines, pieces, level, flags, tetromino, rotation, x, y, swap tetromino,
+# queue length, queue
+STATE = struct.Struct(f'<QqqqiBbbhhbB{QUEUE_SLOTS}b')
+STATE_OFFSET = SEQUENCE_OFFSET + SEQUENCE.size
+
+# The cells start at the next 8-byte boundary, one byte per cell, row by row
+CELLS_OFFSET = (STATE_OFFSET + STATE.size + 7) & ~7
+
+# Cell values
+EMPTY, LANDED, FALLING = range(3)
+
+FLAG_RUNNING = 1
+FLAG_PAUSED = 2
+
+# Names of the blocks created by writers in this process
+created: Set[str] = set()
+
+@lru_cache(maxsize=4096)
+def cell_bytes(landed: int, falling: int, columns: int) -> bytes:
+    """
+    Encodes one row as a byte per cell. Rows are cached by content, like rendered rows.
+
+    Args:
+        landed (int): Bitmask of landed cells, bit 0 being the first playable column.
+        falling (int): Bitmask of falling cells, in the same columns.
+        columns (int): The number of playable columns.
+
+    Returns:
+        bytes: `LANDED`, `FALLING` or `EMPTY` for every column.
+    """
+    return bytes(
+        LANDED if landed >> x & 1 else FALLING if falling >> x & 1 else EMPTY for x in range(columns)
+    )
+
+def tracker_name(name: str) -> str:
+    """
+    The name the resource tracker knows a block by. POSIX shared memory names start with a
+    slash, which `SharedMemory.name` leaves out.
+
+    Args:
+        name (str): The block's name, as in `SharedMemory.name`.
+
+    Returns:
+        str: The name registered with the resource tracker.
+    """
+    return '/' + name if os.name == 'posix' else name
+
+def block_size(columns: int, height: int) -> int:
+    """
+    The size of the shared memory block for a board.
+
+    Args:
+        columns (int): The number of playable columns.
+        height (int): The number of rows, hidden rows included.
+
+    Returns:
+        int: The size in bytes.
+    """
+    return CELLS_OFFSET + columns * height
+
+class SharedBoardWriter(Observer):
+    """
+    Publishes a game into a shared memory block, so renderers, bots and analytics in other
+    processes can read it without pickling anything.
+
+    The block has a fixed layout: `HEADER` with the board size, the `SEQUENCE` counter,
+    `STATE` with the score, the falling tetromino's pose and the queue, and finally one byte
+    per cell of every row, hidden rows included. Tetrominoes are indices into
+    `TETROMINO_SHAPES`, -1 when there is none.
+
+    The sequence counter works as a seqlock. It is made odd before an update and even again
+    once it is complete, so readers retry whenever the counter was odd or changed while they
+    copied. Only the rows whose landed or falling cells changed since the previous update
+    are rewritten, so publishing costs a few rows per tick.
+
+    Attributes:
+        shared (shared_memory.SharedMemory): The block, unlinked by `close`.
+        name (str): The name readers attach to.
+        columns (int): The number of playable columns.
+        height (int): The number of rows, hidden rows included.
+        sequence (int): The last sequence number written.
+        previous_rows (List[Tuple[int, int]]): The landed and falling bits of every row as last written.
+    """
+    def __init__(self, app: App, name: str = None):
+        playfield = app.playfield
+        self.columns = playfield.columns
+        self.height = playfield.height
+        self.shared = shared_memory.SharedMemory(name=name, create=True, size=block_size(self.columns, self.height))
+        self.name = self.shared.name
+        created.add(self.name)
+        self.sequence = 0
+        self.previous_rows: List[Tuple[int, int]] = [None] * self.height
+        HEADER.pack_into(self.shared.buf, 0, MAGIC, VERSION, self.columns, self.height, playfield.hidden_rows)
+        self.publish(app)
+
+    def publish(self, app: App):
+        buffer = self.shared.buf
+        self.sequence += 1
+        SEQUENCE.pack_into(buffer, SEQUENCE_OFFSET, self.sequence)
+
+        manager = app.tetromino_manager
+        game_state = app.game_state
+        queue = [shape_index(tetromino) for tetromino in islice(manager['tetromino_queue'], QUEUE_SLOTS)]
+        STATE.pack_into(
+            buffer, STATE_OFFSET, app.timing['ticks'], game_state['score'], game_state['lines'],
+            game_state['pieces'], game_state['level'],
+            (FLAG_RUNNING if game_state['running'] else 0) | (FLAG_PAUSED if game_state['paused'] else 0),
+            shape_index(manager['current_tetromino']), manager['current_rotation'], manager['x'], manager['y'],
+            shape_index(manager['swap_tetromino']), len(queue), *queue, *[-1] * (QUEUE_SLOTS - len(queue))
+        )
+
+        playfield = app.playfield
+        left_wall = playfield.left_wall
+        columns = self.columns
+        landed = playfield.landed
+        falling_rows = app.falling_rows()
+        previous_rows = self.previous_rows
+        for y in range(self.height):
+            row = (landed[y], falling_rows.get(y, 0))
+            if row != previous_rows[y]:
+                previous_rows[y] = row
+                start = CELLS_OFFSET + y * columns
+                buffer[start:start + columns] = cell_bytes(row[0] >> left_wall, row[1] >> left_wall, columns)
+
+        self.sequence += 1
+        SEQUENCE.pack_into(buffer, SEQUENCE_OFFSET, self.sequence)
+
+    async def stop(self):
+        self.close()
+
+    def close(self):
+        """
+        Closes and unlinks the block. Readers still attached keep their mapping.
+        """
+        if self.shared is not None:
+            self.shared.close()
+            self.shared.unlink()
+            created.discard(self.name)
+            self.shared = None
+
+class SharedBoardReader:
+    """
+    Reads a game published by `SharedBoardWriter` in another process.
+
+    `read` returns a consistent copy of everything. `cells` and `array` are zero-copy views
+    of the live cells instead, which can change while they are being looked at.
+
+    Attributes:
+        shared (shared_memory.SharedMemory): The attached block.
+        columns (int): The number of playable columns.
+        height (int): The number of rows, hidden rows included.
+        hidden_rows (int): The number of rows above the visible board.
+    """
+    def __init__(self, name: str):
+        if sys.version_info >= (3, 13):
+            self.shared = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self.shared = shared_memory.SharedMemory(name=name)
+            # Only the writer owns the block, so stop this process unlinking it on exit
+            if self.shared.name not in created:
+                resource_tracker.unregister(tracker_name(self.shared.name), 'shared_memory')
+        magic, version, self.columns, self.height, self.hidden_rows = HEADER.unpack_from(self.shared.buf)
+        if magic != MAGIC:
+            raise ValueError("Not a shared board")
+        if version != VERSION:
+            raise ValueError(f"Unsupported shared board version: {version}")
+
+    def sequence(self) -> int:
+        """
+        The current sequence number, which changes every time the writer publishes.
+
+        Returns:
+            int: The sequence number, odd while an update is in progress.
+        """
+        return SEQUENCE.unpack_from(self.shared.buf, SEQUENCE_OFFSET)[0]
+
+    def read(self, timeout: float = 1.0) -> dict:
+        """
+        Copies the published game, retrying until the copy was not torn by an update.
+
+        Args:
+            timeout (float): Seconds to keep retrying for.
+
+        Returns:
+            dict: The sequence number, tick, score, lines, pieces, level, running and paused
+            flags, the falling tetromino's pose, swap and queue, and the cells as bytes.
+        """
+        buffer = self.shared.buf
+        size = self.columns * self.height
+        deadline = time.monotonic() + timeout
+        while True:
+            before = self.sequence()
+            if not before & 1:
+                state = STATE.unpack_from(buffer, STATE_OFFSET)
+                cells = bytes(buffer[CELLS_OFFSET:CELLS_OFFSET + size])
+                if self.sequence() == before:
+                    break
+            if time.monotonic() > deadline:
+                raise TimeoutError("The shared board kept changing while being read")
+
+        (ticks, score, lines, pieces, level, flags, tetromino, rotation, x, y, swap,
+         queue_length) = state[:12]
+        return {
+            'sequence': before,
+            'tick': ticks,
+            'score': score,
+            'lines': lines,
+            'pieces': pieces,
+            'level': level,
+            'running': bool(flags & FLAG_RUNNING),
+            'paused': bool(flags & FLAG_PAUSED),
+            'piece': (tetromino, rotation, x, y),
+            'swap': swap,
+            'queue': state[12:12 + queue_length],
+            'cells': cells,
+        }
+
+    def cells(self) -> memoryview:
+        """
+        A zero-copy view of the live cells.
+
+        Returns:
+            memoryview: The cells, indexed `[row, column]`.
+        """
+        size = self.columns * self.height
+        return self.shared.buf[CELLS_OFFSET:CELLS_OFFSET + size].cast('B', (self.height, self.columns))
+
+    def array(self):
+        """
+        A zero-copy NumPy view of the live cells. NumPy is only imported here.
+
+        Returns:
+            numpy.ndarray: The cells as a `(height, columns)` array of uint8.
+        """
+        import numpy
+        return numpy.ndarray((self.height, self.columns), numpy.uint8, self.shared.buf, CELLS_OFFSET)
+
+    def close(self):
+        """
+        Detaches from the block. Views returned by `cells` and `array` must be released first.
+        """
+        if self.shared is not None:
+            self.shared.close()
+            self.shared = None
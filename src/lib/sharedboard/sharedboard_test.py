@@ -0,0 +1,79 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import pytest
+from .sharedboard import FALLING, LANDED, QUEUE_SLOTS, SharedBoardReader, SharedBoardWriter
+from ..engine.engine import Engine
+
+def play(engine: Engine, steps: int):
+    for step in range(steps):
+        engine.step(('left', 'noop', 'hard_drop', 'right', 'noop', 'hard_drop')[step % 6])
+
+def test_readers_see_the_published_game():
+    engine = Engine(3)
+    writer = SharedBoardWriter(engine.app)
+    reader = SharedBoardReader(writer.name)
+    try:
+        play(engine, 120)
+        writer.publish(engine.app)
+        state = reader.read()
+        app = engine.app
+        playfield = app.playfield
+
+        assert (reader.columns, reader.height, reader.hidden_rows) == (10, 26, 4)
+        assert state['sequence'] == writer.sequence and state['sequence'] % 2 == 0
+        assert (state['tick'], state['score'], state['pieces']) == (
+            app.timing['ticks'], app.game_state['score'], app.game_state['pieces']
+        )
+        assert state['piece'][1:] == (
+            app.tetromino_manager['current_rotation'], app.tetromino_manager['x'], app.tetromino_manager['y']
+        )
+        assert len(state['queue']) == min(QUEUE_SLOTS, len(app.tetromino_manager['tetromino_queue']))
+
+        falling_rows = app.falling_rows()
+        for y in range(playfield.height):
+            for x in range(playfield.columns):
+                cell = state['cells'][y * playfield.columns + x]
+                column = playfield.left_wall + x
+                assert (cell == LANDED) == playfield.is_landed(column, y)
+                assert (cell == FALLING) == bool(falling_rows.get(y, 0) >> column & 1 and cell != LANDED)
+    finally:
+        reader.close()
+        writer.close()
+
+def test_cell_views_follow_the_game_without_copying():
+    engine = Engine(4)
+    writer = SharedBoardWriter(engine.app)
+    reader = SharedBoardReader(writer.name)
+    try:
+        cells = reader.cells()
+        before = cells.tobytes()
+        engine.step('hard_drop')
+        writer.publish(engine.app)
+
+        assert cells.tobytes() != before
+        assert cells.tobytes() == reader.read()['cells']
+        assert cells[25, 3] in (0, LANDED)
+        cells.release()
+    finally:
+        reader.close()
+        writer.close()
+
+def test_numpy_view():
+    numpy = pytest.importorskip('numpy')
+    engine = Engine(5)
+    writer = SharedBoardWriter(engine.app)
+    reader = SharedBoardReader(writer.name)
+    try:
+        array = reader.array()
+        engine.step('hard_drop')
+        writer.publish(engine.app)
+
+        assert array.shape == (26, 10)
+        assert numpy.count_nonzero(array == LANDED) == 4
+        del array
+    finally:
+        reader.close()
+        writer.close()
@@ -0,0 +1,248 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import struct
+from typing import NamedTuple, Optional, Tuple
+from ..playfield.playfield import COLUMNS, HIDDEN_ROWS
+from ..randomizer.randomizer import DEFAULT_RANDOMIZER
+
+MAGIC = b'TSNP'
+VERSION = 4
+
+# magic, version, flags, rotation, x, y, score, high score, level, ticks, tick count,
+# tick count target, default tick count target, seed, random seed
+HEADER = struct.Struct('<4sHBbhhqqiqiiiqQ')
+
+# lines cleared, pieces placed; added in version 2
+COUNTERS = struct.Struct('<qq')
+
+# playable columns, hidden rows; added in version 4
+GEOMETRY = struct.Struct('<HH')
+
+FLAG_RUNNING = 1
+FLAG_PAUSED = 2
+FLAG_GRACE_PERIOD = 4
+FLAG_SEEDED = 8
+
+class Snapshot(NamedTuple):
+    """
+    Immutable copy of the full state of a game. Every field is an immutable value, so taking
+    a snapshot never has to copy it again and one snapshot can be restored any number of times.
+
+    Attributes:
+        landed (Tuple[int, ...]): The landed cells, one bitmask per row.
+        tetromino (str): The name of the falling tetromino.
+        rotation (int): The rotation of the falling tetromino.
+        x (int): The X position of the falling tetromino.
+        y (int): The Y position of the falling tetromino.
+        swap (str): The name of the swapped out tetromino, empty if there is none.
+        queue (Tuple[str, ...]): The names of the queued tetrominoes.
+        ticks (int): Total ticks run.
+        tick_count (int): Ticks since the last gravity step.
+        tick_count_target (int): Ticks between gravity steps this tick.
+        default_tick_count_target (int): Ticks between gravity steps at the current level.
+        grace_period (bool): Whether the tetromino is in its grace period before landing.
+        score (int): The score.
+        high_score (int): The high score.
+        level (int): The level.
+        lines (int): The number of lines cleared.
+        pieces (int): The number of tetrominoes placed.
+        running (bool): Whether the game is running.
+        paused (bool): Whether the game is paused.
+        mode (str): The game mode.
+        seed (Optional[int]): The seed the game was started with.
+        random_seed (int): The seed of the game's random number generator.
+        random_state (tuple): The state of the game's random number generator.
+        randomizer (str): The name of the piece randomizer.
+        randomizer_state (Tuple[int, ...]): The randomizer's own state, such as its history.
+        columns (int): The number of playable columns.
+        hidden_rows (int): The number of rows above the visible board, the rest of `landed` being visible.
+    """
+    landed: Tuple[int, ...]
+    tetromino: str
+    rotation: int
+    x: int
+    y: int
+    swap: str
+    queue: Tuple[str, ...]
+    ticks: int
+    tick_count: int
+    tick_count_target: int
+    default_tick_count_target: int
+    grace_period: bool
+    score: int
+    high_score: int
+    level: int
+    lines: int
+    pieces: int
+    running: bool
+    paused: bool
+    mode: str
+    seed: Optional[int]
+    random_seed: int
+    random_state: tuple
+    randomizer: str = DEFAULT_RANDOMIZER
+    randomizer_state: Tuple[int, ...] = ()
+    columns: int = COLUMNS
+    hidden_rows: int = HIDDEN_ROWS
+
+def write_string(value: str, output: bytearray):
+    """
+    Appends a short string prefixed with its length.
+
+    Args:
+        value (str): The string, at most 255 bytes once encoded.
+        output (bytearray): The buffer to append to.
+    """
+    encoded = value.encode()
+    output.append(len(encoded))
+    output += encoded
+
+def read_string(data: bytes, offset: int) -> Tuple[str, int]:
+    """
+    Reads a string written by `write_string`.
+
+    Args:
+        data (bytes): The buffer to read from.
+        offset (int): Where the string starts.
+
+    Returns:
+        Tuple[str, int]: The string and the offset just past it.
+    """
+    length = data[offset]
+    return data[offset + 1:offset + 1 + length].decode(), offset + 1 + length
+
+def dumps(snapshot: Snapshot) -> bytes:
+    """
+    Encodes a snapshot in the versioned binary save format.
+
+    Args:
+        snapshot (Snapshot): The snapshot to encode.
+
+    Returns:
+        bytes: The encoded snapshot.
+    """
+    flags = (
+        (FLAG_RUNNING if snapshot.running else 0) |
+        (FLAG_PAUSED if snapshot.paused else 0) |
+        (FLAG_GRACE_PERIOD if snapshot.grace_period else 0) |
+        (FLAG_SEEDED if snapshot.seed is not None else 0)
+    )
+    output = bytearray(HEADER.pack(
+        MAGIC, VERSION, flags, snapshot.rotation, snapshot.x, snapshot.y,
+        snapshot.score, snapshot.high_score, snapshot.level, snapshot.ticks, snapshot.tick_count,
+        snapshot.tick_count_target, snapshot.default_tick_count_target,
+        snapshot.seed if snapshot.seed is not None else 0, snapshot.random_seed
+    ))
+    output += COUNTERS.pack(snapshot.lines, snapshot.pieces)
+    write_string(snapshot.tetromino, output)
+    write_string(snapshot.swap, output)
+    write_string("".join(snapshot.queue), output)
+    write_string(snapshot.mode, output)
+
+    row_bytes = max(1, (max(snapshot.landed, default=0).bit_length() + 7) // 8)
+    output += struct.pack('<HH', len(snapshot.landed), row_bytes)
+    for row in snapshot.landed:
+        output += row.to_bytes(row_bytes, 'little')
+
+    version, internal_state, gauss_next = snapshot.random_state
+    output += struct.pack('<BH', version, len(internal_state))
+    output += struct.pack(f'<{len(internal_state)}I', *internal_state)
+    output += struct.pack('<?d', gauss_next is not None, gauss_next or 0.0)
+
+    write_string(snapshot.randomizer, output)
+    output.append(len(snapshot.randomizer_state))
+    output += bytes(snapshot.randomizer_state)
+    output += GEOMETRY.pack(snapshot.columns, snapshot.hidden_rows)
+    return bytes(output)
+
+def loads(data: bytes) -> Snapshot:
+    """
+    Decodes a snapshot from the versioned binary save format. Version 1 files, which predate
+    the line and piece counters, load with both counters at zero, files older than version 3
+    load with the default 7-bag randomizer and files older than version 4 with the standard
+    board.
+
+    Args:
+        data (bytes): The encoded snapshot.
+
+    Returns:
+        Snapshot: The decoded snapshot.
+    """
+    (magic, version, flags, rotation, x, y, score, high_score, level, ticks, tick_count,
+     tick_count_target, default_tick_count_target, seed, random_seed) = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a snapshot file")
+    if not 1 <= version <= VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+
+    offset = HEADER.size
+    lines, pieces = 0, 0
+    if version >= 2:
+        lines, pieces = COUNTERS.unpack_from(data, offset)
+        offset += COUNTERS.size
+    tetromino, offset = read_string(data, offset)
+    swap, offset = read_string(data, offset)
+    queue, offset = read_string(data, offset)
+    mode, offset = read_string(data, offset)
+
+    rows, row_bytes = struct.unpack_from('<HH', data, offset)
+    offset += 4
+    landed = []
+    for _ in range(rows):
+        landed.append(int.from_bytes(data[offset:offset + row_bytes], 'little'))
+        offset += row_bytes
+
+    random_version, state_length = struct.unpack_from('<BH', data, offset)
+    offset += 3
+    internal_state = struct.unpack_from(f'<{state_length}I', data, offset)
+    offset += 4 * state_length
+    has_gauss, gauss_next = struct.unpack_from('<?d', data, offset)
+    offset += 9
+
+    randomizer, randomizer_state = DEFAULT_RANDOMIZER, ()
+    if version >= 3:
+        randomizer, offset = read_string(data, offset)
+        randomizer_state = tuple(data[offset + 1:offset + 1 + data[offset]])
+        offset += 1 + data[offset]
+
+    columns, hidden_rows = COLUMNS, HIDDEN_ROWS
+    if version >= 4:
+        columns, hidden_rows = GEOMETRY.unpack_from(data, offset)
+
+    return Snapshot(
+        landed=tuple(landed), tetromino=tetromino, rotation=rotation, x=x, y=y, swap=swap,
+        queue=tuple(queue), ticks=ticks, tick_count=tick_count, tick_count_target=tick_count_target,
+        default_tick_count_target=default_tick_count_target, grace_period=bool(flags & FLAG_GRACE_PERIOD),
+        score=score, high_score=high_score, level=level, lines=lines, pieces=pieces, running=bool(flags & FLAG_RUNNING),
+        paused=bool(flags & FLAG_PAUSED), mode=mode, seed=seed if flags & FLAG_SEEDED else None,
+        random_seed=random_seed,
+        random_state=(random_version, internal_state, gauss_next if has_gauss else None),
+        randomizer=randomizer, randomizer_state=randomizer_state, columns=columns, hidden_rows=hidden_rows
+    )
+
+def save(snapshot: Snapshot, path: str):
+    """
+    Writes a snapshot to a file.
+
+    Args:
+        snapshot (Snapshot): The snapshot to save.
+        path (str): The file to write.
+    """
+    with open(path, 'wb') as file:
+        file.write(dumps(snapshot))
+
+def load(path: str) -> Snapshot:
+    """
+    Reads a snapshot from a file.
+
+    Args:
+        path (str): The file to read.
+
+    Returns:
+        Snapshot: The snapshot.
+    """
+    with open(path, 'rb') as file:
+        return loads(file.read())
@@ -0,0 +1,71 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+from .snapshot import COUNTERS, HEADER, dumps, load, loads, save
+from ..engine.engine import Engine
+
+# Pieces are soft dropped and swapped now and then, which keeps the games going for hundreds of steps
+ACTIONS = ('swap',) + ('left', 'soft_drop', 'soft_drop', 'right', 'rotate_cw', 'soft_drop', 'noop') * 10
+
+def play(engine: Engine, steps: int):
+    for step in range(steps):
+        engine.step(ACTIONS[step % len(ACTIONS)])
+
+def test_restoring_a_snapshot_replays_the_same_future():
+    engine = Engine(11)
+    play(engine, 150)
+    snapshot = engine.app.snapshot()
+    play(engine, 200)
+    expected = engine.app.snapshot()
+
+    engine.app.restore(snapshot)
+    play(engine, 200)
+
+    assert engine.app.snapshot() == expected
+
+def test_clones_are_independent():
+    engine = Engine(12)
+    play(engine, 100)
+    clone = engine.app.clone()
+    before = engine.app.snapshot()
+
+    clone.perform('hard_drop')
+    clone.tick()
+
+    assert engine.app.snapshot() == before
+    assert clone.snapshot() != before
+
+def test_binary_format_round_trips(tmp_path):
+    engine = Engine(13)
+    play(engine, 300)
+    engine.app.game_state['paused'] = True
+    snapshot = engine.app.snapshot()
+
+    assert loads(dumps(snapshot)) == snapshot
+
+    path = str(tmp_path / "game.tsnp")
+    save(snapshot, path)
+    assert load(path) == snapshot
+
+def test_version_1_snapshots_load_without_counters():
+    engine = Engine(14)
+    play(engine, 300)
+    snapshot = engine.app.snapshot()
+    data = bytearray(dumps(snapshot))
+    data[4:6] = (1).to_bytes(2, 'little')
+    del data[HEADER.size:HEADER.size + COUNTERS.size]
+
+    assert loads(bytes(data)) == snapshot._replace(lines=0, pieces=0)
+
+def test_restoring_a_snapshot_restores_the_board_size():
+    wide = Engine(15, columns=40, rows=30)
+    play(wide, 100)
+    snapshot = wide.app.snapshot()
+    engine = Engine(15)
+
+    engine.app.restore(loads(dumps(snapshot)))
+
+    assert engine.app.playfield.columns == 40 and engine.app.playfield.rows == 30
+    assert engine.app.snapshot() == snapshot
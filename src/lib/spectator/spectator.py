@@ -0,0 +1,284 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import List, Set
+from ..app.app import App, row_string
+from ..event.event import Observer
+from ..playfield.playfield import MARGIN
+
+DEFAULT_PORT = 7474
+
+# Write buffer size past which a spectator counts as lagging, in bytes
+MAX_BUFFER = 64 * 1024
+
+# Ticks a spectator may stay lagging before it is disconnected
+DROP_AFTER = 1000
+
+def game_state(app: App) -> dict:
+    """
+    Captures what spectators see of a game.
+
+    Args:
+        app (App): The game.
+
+    Returns:
+        dict: The board size, the landed rows, the falling tetromino, its pose and the score.
+    """
+    manager = app.tetromino_manager
+    return {
+        'tick': app.timing['ticks'],
+        'columns': app.playfield.columns,
+        'hidden_rows': app.playfield.hidden_rows,
+        'rows': list(app.playfield.landed),
+        'falling': {str(y): mask for y, mask in app.falling_rows().items()},
+        'piece': [manager['current_tetromino'].name, manager['current_rotation'], manager['x'], manager['y']],
+        'score': app.game_state['score'],
+        'level': app.game_state['level'],
+        'lines': app.game_state['lines'],
+        'running': app.game_state['running'],
+    }
+
+def delta(previous: dict, current: dict) -> dict:
+    """
+    Computes what changed between two captured states.
+
+    Args:
+        previous (dict): The state spectators already have.
+        current (dict): The new state.
+
+    Returns:
+        dict: The changed fields, with only the changed rows keyed by their index. Just the
+        tick when nothing changed.
+    """
+    changes = {'tick': current['tick']}
+    rows = {
+        str(y): row for y, (row, previous_row) in enumerate(zip(current['rows'], previous['rows']))
+        if row != previous_row
+    }
+    if rows:
+        changes['rows'] = rows
+    for key in ('falling', 'piece', 'score', 'level', 'lines', 'running'):
+        if current[key] != previous[key]:
+            changes[key] = current[key]
+    return changes
+
+def apply(state: dict, message: dict) -> dict:
+    """
+    Updates a spectator's copy of the game with a message from the server.
+
+    Args:
+        state (dict): The copy built so far, empty before the first message.
+        message (dict): A decoded 'full' or 'delta' message.
+
+    Returns:
+        dict: The updated copy.
+    """
+    if message['type'] == 'full':
+        return {key: value for key, value in message.items() if key != 'type'}
+    state = dict(state)
+    for key, value in message.items():
+        if key == 'rows':
+            rows = list(state['rows'])
+            for y, row in value.items():
+                rows[int(y)] = row
+            state['rows'] = rows
+        elif key != 'type':
+            state[key] = value
+    return state
+
+def encode(kind: str, fields: dict) -> bytes:
+    """
+    Encodes one newline-delimited JSON message.
+
+    Args:
+        kind (str): 'full' or 'delta'.
+        fields (dict): The message body.
+
+    Returns:
+        bytes: The encoded line.
+    """
+    return json.dumps(dict(fields, type=kind), separators=(',', ':')).encode() + b'\n'
+
+class Spectator:
+    """
+    A connected spectator.
+
+    Attributes:
+        writer (asyncio.StreamWriter): The connection.
+        lagging_since (int): The tick the spectator fell behind at, None while it keeps up.
+    """
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.lagging_since = None
+
+    def buffered(self) -> int:
+        """
+        The number of bytes written but not yet sent.
+        """
+        return self.writer.transport.get_write_buffer_size()
+
+class SpectatorServer(Observer):
+    """
+    Broadcasts a running game to local spectators over TCP or a Unix socket, as newline
+    delimited JSON. Spectators get a 'full' message with the whole game when they connect,
+    then a 'delta' message after every tick with the changed rows, piece pose and score.
+
+    Every message is encoded once and the same bytes are written to every spectator, and
+    writes never wait on the network. A spectator whose unsent data grows past `max_buffer`
+    stops receiving deltas. Once it has caught up it gets a single 'full' message standing
+    in for everything it missed, and it is disconnected if it stays behind for
+    `drop_after` ticks.
+
+    Attributes:
+        host (str): The address to listen on for TCP.
+        port (int): The TCP port, 0 to pick a free one. Set to the bound port once started.
+        path (str): The Unix socket to listen on instead of TCP, if any.
+        max_buffer (int): Unsent bytes past which a spectator counts as lagging.
+        drop_after (int): Ticks a spectator may lag before it is disconnected.
+        spectators (Set[Spectator]): The connected spectators.
+        state (dict): The last state published.
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, path: str = None,
+                 max_buffer: int = MAX_BUFFER, drop_after: int = DROP_AFTER):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_buffer = max_buffer
+        self.drop_after = drop_after
+        self.spectators: Set[Spectator] = set()
+        self.state: dict = None
+        self.server = None
+
+    async def start(self):
+        if self.path is not None:
+            self.server = await asyncio.start_unix_server(self.connect, self.path)
+        else:
+            self.server = await asyncio.start_server(self.connect, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        for spectator in list(self.spectators):
+            self.disconnect(spectator)
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serves one spectator until it disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): The incoming side of the connection, only read for EOF.
+            writer (asyncio.StreamWriter): The outgoing side of the connection.
+        """
+        spectator = Spectator(writer)
+        self.spectators.add(spectator)
+        if self.state is not None:
+            writer.write(encode('full', self.state))
+        try:
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.disconnect(spectator)
+
+    def disconnect(self, spectator: Spectator):
+        """
+        Closes a spectator's connection.
+
+        Args:
+            spectator (Spectator): The spectator to drop.
+        """
+        if spectator in self.spectators:
+            self.spectators.discard(spectator)
+            spectator.writer.close()
+
+    def publish(self, app: App):
+        current = game_state(app)
+        previous = self.state
+        self.state = current
+        if not self.spectators:
+            return
+
+        message = encode('delta', delta(previous, current)) if previous is not None else None
+        full = None
+        for spectator in list(self.spectators):
+            if spectator.buffered() > self.max_buffer:
+                if spectator.lagging_since is None:
+                    spectator.lagging_since = current['tick']
+                elif current['tick'] - spectator.lagging_since > self.drop_after:
+                    self.disconnect(spectator)
+                continue
+            if spectator.lagging_since is not None or previous is None:
+                if full is None:
+                    full = encode('full', current)
+                spectator.writer.write(full)
+                spectator.lagging_since = None
+            else:
+                spectator.writer.write(message)
+
+async def watch(host: str = '127.0.0.1', port: int = 0, path: str = None, stream=None):
+    """
+    Connects to a spectator server and draws the game in the terminal until it ends.
+
+    Args:
+        host (str): The server address for TCP.
+        port (int): The server port for TCP.
+        path (str): The server's Unix socket, instead of TCP.
+        stream (TextIO): Where to draw. Defaults to stdout.
+    """
+    stream = stream if stream is not None else sys.stdout
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    state = {}
+    try:
+        while line := await reader.readline():
+            state = apply(state, json.loads(line))
+            falling = {int(y): mask for y, mask in state['falling'].items()}
+            rows = state['rows']
+            stream.write(
+                "\x1b[H" + f"Score: {state['score']}  Level: {state['level']}  Lines: {state['lines']}\n" +
+                "".join(
+                    row_string(rows[y] >> MARGIN, falling.get(y, 0) >> MARGIN, 0, state['columns'] + MARGIN)
+                    for y in range(state['hidden_rows'], len(rows))
+                )
+            )
+            stream.flush()
+            if not state['running']:
+                break
+    finally:
+        writer.close()
+
+def main(argv: List[str] = None) -> int:
+    """
+    Watches a running game from the command line.
+
+    Args:
+        argv (List[str]): Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The exit code.
+    """
+    parser = argparse.ArgumentParser(description="Watch a running game.")
+    parser.add_argument('--host', default='127.0.0.1', help="server address (default 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"server port (default {DEFAULT_PORT})")
+    parser.add_argument('--path', help="server Unix socket, instead of TCP")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(watch(args.host, args.port, args.path))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
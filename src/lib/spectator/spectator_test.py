@@ -0,0 +1,80 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import asyncio
+import json
+from .spectator import Spectator, SpectatorServer, apply, game_state
+from ..engine.engine import Engine
+
+class FakeTransport:
+    def __init__(self):
+        self.buffered = 0
+
+    def get_write_buffer_size(self) -> int:
+        return self.buffered
+
+class FakeWriter:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.messages = []
+        self.closed = False
+
+    def write(self, data: bytes):
+        self.messages.append(json.loads(data))
+
+    def close(self):
+        self.closed = True
+
+def play(engine: Engine, server: SpectatorServer, steps: int):
+    for step in range(steps):
+        engine.step(('left', 'soft_drop', 'soft_drop', 'right', 'rotate_cw')[step % 5])
+        server.publish(engine.app)
+
+def test_spectators_rebuild_the_game_from_deltas():
+    async def run():
+        engine = Engine(2)
+        server = SpectatorServer()
+        await server.start()
+        try:
+            play(engine, server, 10)
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            first = json.loads(await reader.readline())
+            play(engine, server, 200)
+
+            state = apply({}, first)
+            while state['tick'] < engine.app.timing['ticks']:
+                state = apply(state, json.loads(await reader.readline()))
+            writer.close()
+            return first, state, game_state(engine.app)
+        finally:
+            await server.stop()
+
+    first, state, expected = asyncio.run(run())
+
+    assert first['type'] == 'full'
+    assert state == expected
+
+def test_lagging_spectators_are_coalesced_then_dropped():
+    engine = Engine(3)
+    server = SpectatorServer(max_buffer=100, drop_after=50)
+    fast, slow = Spectator(FakeWriter()), Spectator(FakeWriter())
+    server.spectators.update((fast, slow))
+    play(engine, server, 5)
+
+    slow.writer.transport.buffered = 1000
+    play(engine, server, 20)
+    slow.writer.transport.buffered = 0
+    sent = len(slow.writer.messages)
+    play(engine, server, 1)
+
+    assert len(slow.writer.messages) == sent + 1
+    assert slow.writer.messages[-1]['type'] == 'full'
+    assert fast.writer.messages[0]['type'] == 'full'
+    assert all(message['type'] == 'delta' for message in fast.writer.messages[1:])
+
+    slow.writer.transport.buffered = 1000
+    play(engine, server, 60)
+
+    assert slow.writer.closed and slow not in server.spectators
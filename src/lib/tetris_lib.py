@@ -3,20 +3,92 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
-from .app.app import App
-from .event.event import Event
-from .handler.handler import Handler
-from .renderer.renderer import Renderer
-from .tetromino.tetromino import Tetromino, TETROMINO_SHAPES
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .bot.bot import Bot
+
+# Public names mapped to the module defining them. They are imported on first access, so
+# importing this module does not pull in every subsystem.
+EXPORTS = {
+    'App': '.app.app',
+    'Bot': '.bot.bot',
+    'Event': '.event.event',
+    'Handler': '.handler.handler',
+    'PygameRenderer': '.renderer.pygame_renderer',
+    'Renderer': '.renderer.renderer',
+    'TerminalRenderer': '.renderer.terminal_renderer',
+    'Tetromino': '.tetromino.tetromino',
+}
+
+def __getattr__(name: str):
+    if name not in EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(EXPORTS[name], __package__), name)
+    globals()[name] = value
+    return value
 
 
 class TetrisLib:
-    def __init__(self):
-        self.app = App(TETROMINO_SHAPES)
-        self.handler = Handler()
-        self.renderer = Renderer(self.app)
-        self.event = Event(self.app, self.renderer, 0.01)
+    """
+    Assembles an interactive game. Only the subsystems the chosen options need are imported.
+    """
+    def __init__(self, profile: bool = False, replay_path: str = None, bot: 'Bot' = None, window: bool = False,
+                 spectator_port: int = None, seed: int = None, randomizer: str = None, columns: int = None,
+                 rows: int = None, shared_board: str = None):
+        from .app.app import App
+        from .clock.clock import Clock
+        from .event.event import Event
+        from .handler.handler import Handler
+        from .playfield.playfield import COLUMNS, ROWS
+        from .randomizer.randomizer import make_randomizer
+        from .scores.scores import SQLiteScoreStore
+        from .tetromino.tetromino import TETROMINO_SHAPES
+
+        self.score_store = SQLiteScoreStore()
+        self.app = App(TETROMINO_SHAPES, seed=seed, score_store=self.score_store,
+                       randomizer=make_randomizer(randomizer) if randomizer else None,
+                       columns=columns or COLUMNS, rows=rows or ROWS)
+        self.app.check_for_highscore()
+        self.replay_path = replay_path
+        self.recorder = None
+        if replay_path:
+            from .replay.replay import ReplayRecorder
+            self.recorder = ReplayRecorder(self.app)
+        self.clock = Clock()
+        self.handler = Handler(self.clock)
+        if bot is not None:
+            from .bot.bot import BotPlayer
+            self.handler.add_source(BotPlayer(self.app, bot))
+        if window:
+            from .renderer.pygame_renderer import PygameInput, PygameRenderer
+            self.renderer = PygameRenderer(self.app)
+            self.handler.add_source(PygameInput(self.renderer))
+        else:
+            from .renderer.terminal_renderer import TerminalRenderer
+            self.renderer = TerminalRenderer(self.app)
+        self.profiler = None
+        if profile:
+            from .profiler.profiler import Profiler
+            self.profiler = Profiler()
+        self.event = Event(self.app, self.renderer, 0.01, frame_rate=60, clock=self.clock, handler=self.handler,
+                           profiler=self.profiler)
+        if spectator_port is not None:
+            from .spectator.spectator import SpectatorServer
+            self.event.add_observer(SpectatorServer(port=spectator_port))
+        if shared_board is not None:
+            from .sharedboard.sharedboard import SharedBoardWriter
+            self.event.add_observer(SharedBoardWriter(self.app, shared_board))
         self.tetromino = TETROMINO_SHAPES
 
+    def close(self):
+        """
+        Writes out any scores still buffered in the score store, and the replay if one is being recorded.
+        """
+        self.score_store.close()
+        if self.recorder is not None:
+            self.recorder.finish().save(self.replay_path)
+
 
-__all__ = ['App', 'Event', 'Handler', 'Renderer', 'Tetromino']
+__all__ = ['App', 'Bot', 'Event', 'Handler', 'PygameRenderer', 'Renderer', 'TerminalRenderer', 'Tetromino']
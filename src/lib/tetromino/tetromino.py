@@ -3,10 +3,140 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+from typing import Dict, List, NamedTuple, Tuple
+
+# SRS wall kicks as `(dx, dy)` offsets tried in order, keyed by `(from, to)` rotation. Rotation 0
+# is the spawn orientation and each clockwise turn adds one. Offsets are in playfield
+# coordinates, so a negative `dy` kicks the tetromino up.
+JLSTZ_KICKS = {
+    (0, 1): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (1, 0): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (1, 2): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (2, 1): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (2, 3): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (3, 2): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (3, 0): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (0, 3): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+}
+
+I_KICKS = {
+    (0, 1): ((0, 0), (-2, 0), (1, 0), (-2, 1), (1, -2)),
+    (1, 0): ((0, 0), (2, 0), (-1, 0), (2, -1), (-1, 2)),
+    (1, 2): ((0, 0), (-1, 0), (2, 0), (-1, -2), (2, 1)),
+    (2, 1): ((0, 0), (1, 0), (-2, 0), (1, 2), (-2, -1)),
+    (2, 3): ((0, 0), (2, 0), (-1, 0), (2, -1), (-1, 2)),
+    (3, 2): ((0, 0), (-2, 0), (1, 0), (-2, 1), (1, -2)),
+    (3, 0): ((0, 0), (1, 0), (-2, 0), (1, 2), (-2, -1)),
+    (0, 3): ((0, 0), (-1, 0), (2, 0), (-1, -2), (2, 1)),
+}
+
+# SRS has no half turns; these are the kicks commonly used alongside it
+HALF_TURN_KICKS = {
+    (0, 2): ((0, 0), (0, -1), (1, -1), (-1, -1), (1, 0), (-1, 0)),
+    (2, 0): ((0, 0), (0, 1), (-1, 1), (1, 1), (-1, 0), (1, 0)),
+    (1, 3): ((0, 0), (1, 0), (1, -2), (1, -1), (0, -2), (0, -1)),
+    (3, 1): ((0, 0), (-1, 0), (-1, -2), (-1, -1), (0, -2), (0, -1)),
+}
+
+class CompiledRotation(NamedTuple):
+    """
+    Precomputed lookup tables for a single rotation of a tetromino.
+
+    Attributes:
+        cells (Tuple[Tuple[int, int], ...]): The `(dx, dy)` offsets of every occupied cell.
+        row_masks (Tuple[Tuple[int, int], ...]): One `(dy, mask)` pair per occupied row, with bit `dx` set for every occupied cell.
+        bounds (Tuple[int, int, int, int]): The `(min_x, min_y, max_x, max_y)` bounding box of the occupied cells.
+        bottom (Tuple[Tuple[int, int], ...]): One `(dx, dy)` pair per occupied column, giving the lowest occupied cell.
+    """
+    cells: Tuple[Tuple[int, int], ...]
+    row_masks: Tuple[Tuple[int, int], ...]
+    bounds: Tuple[int, int, int, int]
+    bottom: Tuple[Tuple[int, int], ...]
+
+def compile_rotation(grid: List[List[bool]]) -> CompiledRotation:
+    """
+    Compiles a rotation grid into its lookup tables.
+
+    Args:
+        grid (List[List[bool]]): The 2D grid of the rotation.
+
+    Returns:
+        CompiledRotation: The lookup tables for the rotation.
+    """
+    cells = tuple((x, y) for y, row in enumerate(grid) for x, cell in enumerate(row) if cell)
+    row_masks = {}
+    bottom = {}
+    for x, y in cells:
+        row_masks[y] = row_masks.get(y, 0) | 1 << x
+        bottom[x] = max(bottom.get(x, y), y)
+
+    if cells:
+        bounds = (
+            min(x for x, _ in cells), min(y for _, y in cells),
+            max(x for x, _ in cells), max(y for _, y in cells)
+        )
+    else:
+        bounds = (0, 0, -1, -1)
+
+    return CompiledRotation(cells, tuple(sorted(row_masks.items())), bounds, tuple(sorted(bottom.items())))
+
+def compile_kicks(name: str, compiled: Tuple[CompiledRotation, ...]
+                  ) -> Dict[Tuple[int, int], Tuple[Tuple[int, int, Tuple[Tuple[int, int], ...]], ...]]:
+    """
+    Builds the wall kick candidates of every rotation of a tetromino, pairing each offset with
+    the row masks of the target rotation so a rotation attempt is only collision checks.
+    Shapes without kicks, such as the O, only try rotating in place.
+
+    Args:
+        name (str): The letter naming the shape, which picks the SRS kick table.
+        compiled (Tuple[CompiledRotation, ...]): The compiled rotations.
+
+    Returns:
+        Dict[Tuple[int, int], Tuple[Tuple[int, int, Tuple[Tuple[int, int], ...]], ...]]: The `(dx, dy, row_masks)`
+        candidates to try in order, keyed by `(from, to)` rotation.
+    """
+    if len(compiled) != 4:
+        return {}
+    if name == 'I':
+        kicks = {**I_KICKS, **HALF_TURN_KICKS}
+    elif name in ('J', 'L', 'S', 'T', 'Z'):
+        kicks = {**JLSTZ_KICKS, **HALF_TURN_KICKS}
+    else:
+        kicks = {}
+    return {
+        (start, end): tuple(
+            (dx, dy, compiled[end].row_masks) for dx, dy in kicks.get((start, end), ((0, 0),))
+        )
+        for start in range(4) for end in range(4) if start != end
+    }
+
 class Tetromino:
-    def __init__(self, rotations):
+    """
+    Represents a tetromino and its possible rotations.
+
+    Attributes:
+        rotations (List[List[List[bool]]]): List of 2D grids representing the different rotations of the tetromino.
+        compiled (Tuple[CompiledRotation, ...]): Lookup tables for each rotation, built once on construction.
+        kicks (Dict[Tuple[int, int], Tuple[Tuple[int, int, Tuple[Tuple[int, int], ...]], ...]]): The wall kicks of
+            every `(from, to)` rotation as `(dx, dy, row_masks)` candidates, built once on construction.
+        name (str): The letter naming the shape, empty for the placeholder tetromino.
+    """
+    def __init__(self, rotations: List[List[List[bool]]] = None, name: str = ''):
+        if rotations is None:
+            rotations = [[
+                [False, False, False, False],
+                [False, False, False, False],
+                [False, False, False, False],
+                [False, False, False, False],
+            ] for _ in range(4)]
         self.rotations = rotations
-        
+        self.compiled = tuple(compile_rotation(grid) for grid in rotations)
+        self.kicks = compile_kicks(name, self.compiled)
+        self.name = name
+
+    def __repr__(self):
+        return f"Tetromino(name={self.name!r}, rotations={self.rotations})"
+
     def __test__(self):
         for i in range(0, 3134):
             print(i)
@@ -38,7 +168,7 @@ TETROMINO_SHAPES = [
             [False, True,  False, False],
             [False, True,  False, False],
         ],
-    ]),
+    ], 'I'),
     Tetromino([
         [
             [True,  False, False, False],
@@ -64,7 +194,7 @@ TETROMINO_SHAPES = [
             [True,  True,  False, False],
             [False, False, False, False],
         ],
-    ]),
+    ], 'J'),
     Tetromino([
         [
             [False, False, True,  False],
@@ -90,7 +220,7 @@ TETROMINO_SHAPES = [
             [False, True,  False, False],
             [False, False, False, False],
         ],
-    ]),
+    ], 'L'),
     Tetromino([
         [
             [False, True,  True,  False],
@@ -116,7 +246,7 @@ TETROMINO_SHAPES = [
             [False, False, False, False],
             [False, False, False, False],
         ],
-    ]),
+    ], 'O'),
     Tetromino([
         [
             [False, True,  True,  False],
@@ -142,7 +272,7 @@ TETROMINO_SHAPES = [
             [False, True,  False, False],
             [False, False, False, False],
         ],
-    ]),
+    ], 'S'),
     Tetromino([
         [
             [False, True,  False, False],
@@ -168,7 +298,7 @@ TETROMINO_SHAPES = [
             [False, True,  False, False],
             [False, False, False, False],
         ],
-    ]),
+    ], 'T'),
     Tetromino([
         [
             [True,  True,  False, False],
@@ -194,5 +324,8 @@ TETROMINO_SHAPES = [
             [True,  False, False, False],
             [False, False, False, False],
         ],
-    ]),
-]
\ No newline at end of file
+    ], 'Z'),
+]
+
+# The shape used for each name
+TETROMINO_BY_NAME = {tetromino.name: tetromino for tetromino in TETROMINO_SHAPES}
@@ -38,3 +38,20 @@ def test_tetromino_test_method():
     # Check that the lines contain the expected numbers
     for i in range(3134):
         assert output_lines[i] == str(i)
+
+def test_rotations_are_compiled_into_tables():
+    t_piece = TETROMINO_SHAPES[5].compiled[0]
+
+    assert t_piece.cells == ((1, 0), (0, 1), (1, 1), (2, 1))
+    assert t_piece.row_masks == ((0, 0b010), (1, 0b111))
+    assert t_piece.bounds == (0, 0, 2, 1)
+    assert t_piece.bottom == ((0, 1), (1, 1), (2, 1))
+
+def test_every_shape_compiles_four_cells_per_rotation():
+    for shape in TETROMINO_SHAPES:
+        assert len(shape.compiled) == 4
+        for rotation in shape.compiled:
+            assert len(rotation.cells) == 4
+
+def test_empty_tetromino_has_no_cells():
+    assert all(rotation.cells == () for rotation in Tetromino().compiled)
@@ -0,0 +1,316 @@
+# Copyright (c) 2024 Emma Keogh
+#
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import argparse
+import csv
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Iterable, List, NamedTuple, TextIO, Tuple
+from ..app.app import App
+from ..bot.bot import ROTATION_ACTIONS, Bot
+from ..engine.engine import Engine
+from ..playfield.playfield import COLUMNS, ROWS
+from ..randomizer.randomizer import DEFAULT_RANDOMIZER, RANDOMIZERS
+
+# Per-game values that are aggregated in the summary
+METRICS = ('score', 'level', 'lines', 'pieces', 'ticks')
+
+class GameResult(NamedTuple):
+    """
+    The outcome of one simulated game.
+
+    Attributes:
+        seed (int): The seed the game was played with.
+        score (int): The final score.
+        level (int): The level reached.
+        lines (int): The number of lines cleared.
+        pieces (int): The number of tetrominoes placed.
+        ticks (int): The number of ticks the game lasted.
+        seconds (float): The wall-clock time spent simulating the game.
+    """
+    seed: int
+    score: int
+    level: int
+    lines: int
+    pieces: int
+    ticks: int
+    seconds: float
+
+class Policy:
+    """
+    Base class for tournament players. A policy is sent to every worker process, so it must
+    be picklable, and is reset with the seed of each game it plays.
+    """
+    def reset(self, seed: int):
+        """
+        Called before every game.
+
+        Args:
+            seed (int): The seed of the game about to be played.
+        """
+
+    def plan(self, app: App) -> List[str]:
+        """
+        Decides how to place the falling tetromino.
+
+        Args:
+            app (App): The game.
+
+        Returns:
+            List[str]: The actions to perform, usually ending with a hard drop.
+        """
+        raise NotImplementedError
+
+class RandomPolicy(Policy):
+    """
+    Drops every tetromino with a random rotation in a random column. Useful as a baseline
+    and for measuring the raw speed of the engine.
+    """
+    def __init__(self):
+        self.random = random.Random()
+
+    def reset(self, seed: int):
+        self.random.seed(seed)
+
+    def plan(self, app: App) -> List[str]:
+        shift = self.random.randint(-5, 5)
+        direction = 'left' if shift < 0 else 'right'
+        return list(self.random.choice(ROTATION_ACTIONS)) + [direction] * abs(shift) + ['hard_drop']
+
+class BotPolicy(Policy):
+    """
+    Plays with a placement-search `Bot`.
+
+    Attributes:
+        bot (Bot): The bot picking placements. Its lookahead runs in process, as the
+            tournament already uses every core.
+    """
+    def __init__(self, bot: Bot = None):
+        self.bot = bot if bot is not None else Bot()
+
+    def plan(self, app: App) -> List[str]:
+        return self.bot.plan(app)
+
+POLICIES = {
+    'bot': BotPolicy,
+    'random': RandomPolicy,
+}
+
+def play_game(seed: int, policy: Policy, max_pieces: int = None, max_ticks: int = None,
+              randomizer: str = DEFAULT_RANDOMIZER, columns: int = COLUMNS, rows: int = ROWS) -> GameResult:
+    """
+    Plays one headless game. After each plan the game is ticked until the tetromino lands
+    and the rows it touched have been checked on the next gravity step, so line clears are
+    scored before the next tetromino is planned.
+
+    Args:
+        seed (int): The seed of the game.
+        policy (Policy): The player.
+        max_pieces (int): Stop after this many tetrominoes, None for no limit.
+        max_ticks (int): Stop after this many ticks, None for no limit.
+        randomizer (str): The piece randomizer, one of `RANDOMIZERS`.
+        columns (int): The number of playable columns.
+        rows (int): The number of visible rows.
+
+    Returns:
+        GameResult: The outcome of the game.
+    """
+    start = time.perf_counter()
+    engine = Engine(seed, randomizer, columns, rows)
+    app = engine.app
+    policy.reset(seed)
+
+    def capped() -> bool:
+        return (engine.done or
+                (max_pieces is not None and app.game_state['pieces'] >= max_pieces) or
+                (max_ticks is not None and app.timing['ticks'] >= max_ticks))
+
+    while not capped():
+        pieces = app.game_state['pieces']
+        for action in policy.plan(app):
+            engine.step(action)
+            if capped():
+                break
+        while (app.game_state['pieces'] == pieces or app.playfield.pending) and not capped():
+            engine.step('noop')
+
+    return GameResult(seed, app.game_state['score'], app.game_state['level'], app.game_state['lines'],
+                      app.game_state['pieces'], app.timing['ticks'], time.perf_counter() - start)
+
+class ResultWriter:
+    """
+    Streams game results to a file as they finish, one CSV row or JSON line per game.
+
+    Attributes:
+        stream (TextIO): The stream rows are written to.
+        format (str): 'csv' or 'jsonl'.
+    """
+    def __init__(self, stream: TextIO, format: str = 'jsonl'):
+        if format not in ('csv', 'jsonl'):
+            raise ValueError(f"Unknown result format: {format}")
+        self.stream = stream
+        self.format = format
+        self.csv_writer = None
+        if format == 'csv':
+            self.csv_writer = csv.writer(stream)
+            self.csv_writer.writerow(GameResult._fields)
+
+    def write(self, result: GameResult):
+        """
+        Writes one game and flushes it, so partial tournaments leave usable output.
+
+        Args:
+            result (GameResult): The game to write.
+        """
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(result)
+        else:
+            self.stream.write(json.dumps(result._asdict()) + "\n")
+        self.stream.flush()
+
+def summarize(results: List[GameResult], elapsed: float) -> dict:
+    """
+    Aggregates the results of a tournament.
+
+    Args:
+        results (List[GameResult]): Every finished game.
+        elapsed (float): The wall-clock time of the tournament in seconds.
+
+    Returns:
+        dict: Statistics of every metric and the throughput in games and ticks per second.
+    """
+    summary = {
+        'games': len(results),
+        'seconds': elapsed,
+        'games_per_second': len(results) / elapsed if elapsed > 0 else 0.0,
+        'ticks_per_second': sum(result.ticks for result in results) / elapsed if elapsed > 0 else 0.0,
+    }
+    for metric in METRICS:
+        values = [getattr(result, metric) for result in results]
+        if not values:
+            continue
+        summary[metric] = {
+            'mean': statistics.fmean(values),
+            'stdev': statistics.stdev(values) if len(values) > 1 else 0.0,
+            'min': min(values),
+            'median': statistics.median(values),
+            'max': max(values),
+        }
+    return summary
+
+# Set in each worker process by `init_worker`, so the policy is pickled once per worker
+# rather than once per game.
+worker_settings: Tuple[Policy, int, int, str, int, int] = None
+
+def init_worker(policy: Policy, max_pieces: int, max_ticks: int, randomizer: str, columns: int, rows: int):
+    """
+    Stores the tournament settings in a worker process.
+    """
+    global worker_settings
+    worker_settings = (policy, max_pieces, max_ticks, randomizer, columns, rows)
+
+def play_worker_game(seed: int) -> GameResult:
+    """
+    Plays one game in a worker process with the settings stored by `init_worker`.
+    """
+    return play_game(seed, *worker_settings)
+
+def run_tournament(seeds: Iterable[int], policy: Policy, workers: int = None, max_pieces: int = None,
+                   max_ticks: int = None, writer: ResultWriter = None,
+                   randomizer: str = DEFAULT_RANDOMIZER, columns: int = COLUMNS,
+                   rows: int = ROWS) -> Tuple[List[GameResult], dict]:
+    """
+    Plays one game per seed across a pool of worker processes. Results are written as soon
+    as each game finishes, in whatever order they finish.
+
+    Args:
+        seeds (Iterable[int]): The seeds of the games to play.
+        policy (Policy): The player.
+        workers (int): Worker processes, defaulting to one per core. 1 plays in process.
+        max_pieces (int): Stop each game after this many tetrominoes, None for no limit.
+        max_ticks (int): Stop each game after this many ticks, None for no limit.
+        writer (ResultWriter): Where to stream per-game results, if anywhere.
+        randomizer (str): The piece randomizer, one of `RANDOMIZERS`.
+        columns (int): The number of playable columns.
+        rows (int): The number of visible rows.
+
+    Returns:
+        Tuple[List[GameResult], dict]: The results ordered by seed, and their summary.
+    """
+    seeds = list(seeds)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(seeds)))
+
+    results = []
+    start = time.perf_counter()
+    if workers == 1:
+        games = (play_game(seed, policy, max_pieces, max_ticks, randomizer, columns, rows) for seed in seeds)
+        pool = None
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(workers, init_worker, (policy, max_pieces, max_ticks, randomizer, columns, rows))
+        games = pool.imap_unordered(play_worker_game, seeds, max(1, len(seeds) // (workers * 16)))
+    try:
+        for result in games:
+            results.append(result)
+            if writer is not None:
+                writer.write(result)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    elapsed = time.perf_counter() - start
+    results.sort(key=lambda result: result.seed)
+    return results, summarize(results, elapsed)
+
+def main(argv: List[str] = None) -> int:
+    """
+    Runs a tournament from the command line and prints its summary as JSON.
+
+    Args:
+        argv (List[str]): Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The exit code.
+    """
+    parser = argparse.ArgumentParser(description="Play many seeded headless games.")
+    parser.add_argument('--games', type=int, default=100, help="number of games (default 100)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game (default 0)")
+    parser.add_argument('--workers', type=int, help="worker processes (default one per core)")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='bot', help="player (default bot)")
+    parser.add_argument('--randomizer', choices=list(RANDOMIZERS), default=DEFAULT_RANDOMIZER,
+                        help=f"piece randomizer (default {DEFAULT_RANDOMIZER})")
+    parser.add_argument('--columns', type=int, default=COLUMNS, help=f"board width (default {COLUMNS})")
+    parser.add_argument('--rows', type=int, default=ROWS, help=f"board height (default {ROWS})")
+    parser.add_argument('--depth', type=int, default=1, help="bot lookahead depth (default 1)")
+    parser.add_argument('--max-pieces', type=int, default=500, help="tetrominoes per game, 0 for no limit (default 500)")
+    parser.add_argument('--max-ticks', type=int, help="ticks per game")
+    parser.add_argument('--output', help="stream per-game results to this .csv or .jsonl file")
+    args = parser.parse_args(argv)
+
+    policy = BotPolicy(Bot(depth=args.depth)) if args.policy == 'bot' else POLICIES[args.policy]()
+    seeds = range(args.seed, args.seed + args.games)
+    max_pieces = args.max_pieces or None
+
+    if args.output:
+        with open(args.output, 'w', newline='') as file:
+            writer = ResultWriter(file, 'csv' if args.output.endswith('.csv') else 'jsonl')
+            _, summary = run_tournament(seeds, policy, args.workers, max_pieces, args.max_ticks, writer,
+                                        args.randomizer, args.columns, args.rows)
+    else:
+        _, summary = run_tournament(seeds, policy, args.workers, max_pieces, args.max_ticks,
+                                    randomizer=args.randomizer, columns=args.columns, rows=args.rows)
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import io
+from .tournament import BotPolicy, Policy, RandomPolicy, ResultWriter, play_game, run_tournament
+
+def test_games_are_reproducible_per_seed():
+    first = play_game(7, RandomPolicy())
+    second = play_game(7, RandomPolicy())
+
+    assert first[:-1] == second[:-1]
+    assert first.pieces > 0
+
+class CheckedPolicy(Policy):
+    def __init__(self):
+        self.bot = BotPolicy()
+        self.full_rows_seen = 0
+        self.plans = 0
+
+    def plan(self, app):
+        self.plans += 1
+        self.full_rows_seen += len(app.playfield.full_rows())
+        return self.bot.plan(app)
+
+def test_lines_are_cleared_before_the_next_plan():
+    policy = CheckedPolicy()
+
+    result = play_game(3, policy, max_pieces=100)
+
+    assert result.lines > 0
+    assert policy.plans >= 100
+    assert policy.full_rows_seen == 0
+
+def test_caps_end_the_game():
+    result = play_game(1, BotPolicy(), max_pieces=20)
+
+    assert result.pieces == 20
+    assert result.lines > 0
+    assert play_game(1, BotPolicy(), max_ticks=50).ticks == 50
+
+def test_worker_pool_matches_in_process_play():
+    stream = io.StringIO()
+
+    pooled, summary = run_tournament(range(6), RandomPolicy(), workers=2, writer=ResultWriter(stream, 'csv'))
+    serial, _ = run_tournament(range(6), RandomPolicy(), workers=1)
+
+    assert [result[:-1] for result in pooled] == [result[:-1] for result in serial]
+    assert summary['games'] == 6
+    assert summary['games_per_second'] > 0
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "seed,score,level,lines,pieces,ticks,seconds"
+    assert len(lines) == 7
@@ -0,0 +1,30 @@
+# Copyright (c) 2024 grace
+# 
+# This software is released under the MIT License.
+# https://opensource.org/licenses/MIT
+
+import os
+from types import SimpleNamespace
+from .__main__ import DEFAULT_BOT_TIME_BUDGET, main
+
+def test_play_gives_the_bot_workers_and_a_time_budget(monkeypatch):
+    monkeypatch.syspath_prepend(os.path.dirname(__file__))
+    import lib.tetris_lib
+    bots = []
+
+    class FakeTetrisLib:
+        def __init__(self, bot=None, **options):
+            bots.append(bot)
+            self.event = SimpleNamespace(run=lambda: None)
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(lib.tetris_lib, 'TetrisLib', FakeTetrisLib)
+
+    assert main(['play', '--bot', '--depth', '2']) == 0
+    assert main(['play', '--bot', '--workers', '3', '--time-budget', '0.05']) == 0
+
+    assert bots[0].time_budget == DEFAULT_BOT_TIME_BUDGET
+    assert bots[0].depth == 2 and bots[0].workers >= 1
+    assert (bots[1].workers, bots[1].time_budget) == (3, 0.05)